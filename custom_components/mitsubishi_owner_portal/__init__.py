@@ -1,51 +1,83 @@
 """The Mitsubishi Owner Portal integration."""
 from __future__ import annotations
 
+import asyncio
 import datetime
 import logging
 import time
-from asyncio import TimeoutError
 from typing import Any
 
 import homeassistant.helpers.config_validation as cv
 import voluptuous as vol
-from aiohttp import ClientConnectorError, ClientSSLError, ContentTypeError
-from homeassistant.components.persistent_notification import async_create
-from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import (
-    CONF_PASSWORD,
-    CONF_SCAN_INTERVAL,
-    CONF_TOKEN,
-    CONF_USERNAME,
+from homeassistant.config_entries import SOURCE_IMPORT, ConfigEntry
+from homeassistant.const import CONF_PASSWORD, CONF_SCAN_INTERVAL, CONF_USERNAME
+from homeassistant.core import (
+    CALLBACK_TYPE,
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
 )
-from homeassistant.core import HomeAssistant
-from homeassistant.helpers import aiohttp_client, issue_registry as ir
-from homeassistant.helpers.entity import DeviceInfo
-from homeassistant.helpers.update_coordinator import (
-    CoordinatorEntity,
-    DataUpdateCoordinator,
-    UpdateFailed,
+from homeassistant.helpers.event import async_call_later
+
+from .account import MitsubishiOwnerPortalAccount
+from .charging import DEFAULT_BATTERY_CAPACITY, DEFAULT_CHARGE_TARGET
+from .const import (
+    ATTR_FIELD,
+    ATTR_FORCE_REMOTE,
+    ATTR_HOURS,
+    ATTR_VIN,
+    CONF_ACCOUNTS,
+    CONF_API_BASE,
+    CONF_BATTERY_CAPACITY,
+    CONF_CAPTURE,
+    CONF_CHARGE_TARGET,
+    CONF_CONNECT,
+    CONF_ENDPOINTS,
+    CONF_HISTORY_SIZE,
+    CONF_MAX_CONCURRENT,
+    CONF_MAX_RESPONSE_SIZE,
+    CONF_READ,
+    CONF_REFRESH_COOLDOWN,
+    CONF_REFRESH_DEADLINE,
+    CONF_REQUEST_INTERVAL,
+    CONF_SAMPLE,
+    CONF_TIMEOUTS,
+    CONF_TRACE,
+    CONF_TRACKER_DISTANCE,
+    CONF_TRIP_HISTORY,
+    CONF_VERIFY_SSL,
+    CONF_VINS,
+    DATA_HANDOFF,
+    DATA_RELOAD,
+    DEFAULT_API_BASE,
+    DEFAULT_REFRESH_COOLDOWN,
+    DEFAULT_REFRESH_DEADLINE,
+    DEFAULT_TIMEOUTS,
+    DEFAULT_TRACKER_DISTANCE,
+    DOMAIN,
+    HANDOFF_TIMEOUT,
+    RELOAD_TIMEOUT,
+    SCAN_INTERVAL,
+    SERVICE_GET_HISTORY,
+    SERVICE_REFRESH,
+    SUPPORTED_DOMAINS,
 )
-
-from .const import DOMAIN
+from .coordinator import VehiclesCoordinator
+from .decoding import DEFAULT_MAX_RESPONSE_SIZE
+from .entity import Vehicle
+from .fleet import DEFAULT_MAX_CONCURRENT, DEFAULT_REQUEST_INTERVAL, FleetContext, FleetScheduler
+from .history import DEFAULT_HISTORY_SIZE, HISTORY_FIELDS, HistoryStore
+from .issues import async_remove_ssl_issues
+from .odometer import OdometerStatisticsImporter
+from .remote import RemoteOperationQueue
+from .tokens import async_remove_shared_tokens
+from .transfer import TransferStore
+from .trips import DEFAULT_TRIP_HISTORY, TripStore
 
 _LOGGER = logging.getLogger(__name__)
 
-SCAN_INTERVAL = datetime.timedelta(minutes=1)
-
-CONF_ACCOUNTS = 'accounts'
-CONF_API_BASE = 'api_base'
-CONF_USER_ID = 'uid'
-CONF_REFRESH_TOKEN = 'refresh_token'
-CONF_TOKEN_TIME = 'token_time'
-CONF_REFRESH_TOKEN_TIME = 'refresh_token_time'
-CONF_VERIFY_SSL = 'verify_ssl'
-
-DEFAULT_API_BASE = 'https://connect.mitsubishi-motors.co.jp/'
-
-SUPPORTED_DOMAINS = [
-    'sensor',
-]
 
 ACCOUNT_SCHEMA = vol.Schema(
     {
@@ -54,6 +86,30 @@ ACCOUNT_SCHEMA = vol.Schema(
         vol.Optional(CONF_PASSWORD): cv.string,
         vol.Optional(CONF_SCAN_INTERVAL, default=SCAN_INTERVAL): cv.time_period,
         vol.Optional(CONF_VERIFY_SSL, default=True): cv.boolean,
+        vol.Optional(CONF_HISTORY_SIZE, default=DEFAULT_HISTORY_SIZE): cv.positive_int,
+        vol.Optional(CONF_BATTERY_CAPACITY, default=DEFAULT_BATTERY_CAPACITY): vol.Coerce(float),
+        vol.Optional(CONF_CHARGE_TARGET, default=DEFAULT_CHARGE_TARGET): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=100)
+        ),
+        vol.Optional(CONF_TRIP_HISTORY, default=DEFAULT_TRIP_HISTORY): cv.positive_int,
+        vol.Optional(CONF_TRACKER_DISTANCE, default=DEFAULT_TRACKER_DISTANCE): cv.positive_float,
+        vol.Optional(CONF_REFRESH_COOLDOWN, default=DEFAULT_REFRESH_COOLDOWN): vol.All(
+            vol.Coerce(float), vol.Range(min=0)
+        ),
+        vol.Optional(CONF_MAX_RESPONSE_SIZE, default=DEFAULT_MAX_RESPONSE_SIZE): cv.positive_int,
+        vol.Optional(CONF_REFRESH_DEADLINE, default=DEFAULT_REFRESH_DEADLINE): cv.positive_float,
+        vol.Optional(CONF_TIMEOUTS, default={}): {
+            vol.In(DEFAULT_TIMEOUTS): {
+                vol.Optional(CONF_CONNECT): cv.positive_float,
+                vol.Optional(CONF_READ): cv.positive_float,
+            },
+        },
+        vol.Optional(CONF_TRACE, default={}): {
+            vol.Optional(CONF_SAMPLE, default=1): cv.positive_int,
+            vol.Optional(CONF_VINS, default=[]): vol.All(cv.ensure_list, [cv.string]),
+            vol.Optional(CONF_ENDPOINTS, default=[]): vol.All(cv.ensure_list, [cv.string]),
+            vol.Optional(CONF_CAPTURE, default=0): cv.positive_int,
+        },
     },
     extra=vol.ALLOW_EXTRA,
 )
@@ -63,30 +119,288 @@ CONFIG_SCHEMA = vol.Schema(
         DOMAIN: ACCOUNT_SCHEMA.extend(
             {
                 vol.Optional(CONF_ACCOUNTS): vol.All(cv.ensure_list, [ACCOUNT_SCHEMA]),
+                vol.Optional(CONF_MAX_CONCURRENT, default=DEFAULT_MAX_CONCURRENT): cv.positive_int,
+                vol.Optional(CONF_REQUEST_INTERVAL, default=DEFAULT_REQUEST_INTERVAL): vol.All(
+                    vol.Coerce(float), vol.Range(min=0)
+                ),
             },
         ),
     },
     extra=vol.ALLOW_EXTRA,
 )
 
+REFRESH_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_VIN, default=[]): vol.All(cv.ensure_list, [cv.string]),
+        vol.Optional(ATTR_FORCE_REMOTE, default=False): cv.boolean,
+    }
+)
+
+GET_HISTORY_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_VIN, default=[]): vol.All(cv.ensure_list, [cv.string]),
+        vol.Required(ATTR_FIELD): vol.In(HISTORY_FIELDS),
+        vol.Optional(ATTR_HOURS): cv.positive_float,
+    }
+)
+
 
 async def async_setup(hass: HomeAssistant, hass_config: dict[str, Any]) -> bool:
     """Set up the Mitsubishi Owner Portal component."""
+
+    def _coordinators(call: ServiceCall) -> list[VehiclesCoordinator]:
+        """Return the requested vehicles, all of them when no VIN is given."""
+        vins = set(call.data[ATTR_VIN])
+        return [
+            v["coordinator"]
+            for entry_data in hass.data.get(DOMAIN, {}).values()
+            if isinstance(entry_data, dict)
+            for v in entry_data.get("vhs", [])
+            if not vins or v["coordinator"].vin in vins
+        ]
+
+    async def _async_handle_refresh(call: ServiceCall) -> None:
+        """Refresh the requested vehicles."""
+        await asyncio.gather(*(
+            coordinator.async_forced_refresh(call.data[ATTR_FORCE_REMOTE])
+            for coordinator in _coordinators(call)
+        ))
+
+    async def _async_handle_get_history(call: ServiceCall) -> ServiceResponse:
+        """Return aggregates of a field over the recorded history of the requested vehicles."""
+        hours = call.data.get(ATTR_HOURS)
+        seconds = hours * 3600 if hours is not None else None
+        vehicles: dict[str, Any] = {}
+        for coordinator in _coordinators(call):
+            history = coordinator.history
+            vehicles[coordinator.vin] = history.aggregate(call.data[ATTR_FIELD], seconds) if history else {"count": 0}
+        return {"vehicles": vehicles}
+
+    hass.services.async_register(DOMAIN, SERVICE_REFRESH, _async_handle_refresh, schema=REFRESH_SCHEMA)
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_HISTORY,
+        _async_handle_get_history,
+        schema=GET_HISTORY_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+
+    domain_config = hass_config.get(DOMAIN) or {}
+    if domain_config.get(CONF_ACCOUNTS):
+        # Manage all YAML accounts in a single fleet entry
+        hass.async_create_task(
+            hass.config_entries.flow.async_init(
+                DOMAIN,
+                context={"source": SOURCE_IMPORT},
+                data={
+                    CONF_ACCOUNTS: [_serializable(acc) for acc in domain_config[CONF_ACCOUNTS]],
+                    CONF_SCAN_INTERVAL: _serializable(domain_config)[CONF_SCAN_INTERVAL],
+                    CONF_MAX_CONCURRENT: domain_config[CONF_MAX_CONCURRENT],
+                    CONF_REQUEST_INTERVAL: domain_config[CONF_REQUEST_INTERVAL],
+                },
+            )
+        )
     return True
 
 
+def _serializable(config: dict[str, Any]) -> dict[str, Any]:
+    """Return account config that can be stored in a config entry."""
+    config = dict(config)
+    if isinstance(config.get(CONF_SCAN_INTERVAL), datetime.timedelta):
+        config[CONF_SCAN_INTERVAL] = config[CONF_SCAN_INTERVAL].total_seconds()
+    return config
+
+
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
-    """Set up Mitsubishi Owner Portal from a config entry."""
+    """Set up Mitsubishi Owner Portal from a config entry.
+
+    When the entry was just unloaded, as on a reload, the new instance takes
+    over the accounts with their tokens and sessions, the vehicle list and
+    the last snapshot of every coordinator, so it sends no requests to the
+    portal. Should the setup fail, that state is closed instead.
+    """
+    previous = _async_pop_reload(hass, entry)
+    try:
+        if CONF_ACCOUNTS in entry.data:
+            return await _async_setup_fleet_entry(hass, entry, previous)
+        return await _async_setup_account_entry(hass, entry, previous)
+    except Exception:
+        if previous is not None:
+            await _async_close_sessions(previous)
+        raise
+
+
+async def _async_setup_account_entry(
+    hass: HomeAssistant, entry: ConfigEntry, previous: dict[str, Any] | None
+) -> bool:
+    """Set up an entry managing a single account."""
     config_data = hass.data.setdefault(DOMAIN, {})
-    account = MitsubishiOwnerPortalAccount(hass, entry.data.get("account"), entry=entry)
-    vehicles_data = await account.async_get_vehicles()
-    vhs = []
+    account = _async_pop_handoff(hass, entry)
+    if previous is not None:
+        if account is None:
+            account = previous["account"]
+            account.async_update_config(entry.data.get("account") or {})
+        else:
+            # A reconfigure flow already logged in with the new credentials
+            await previous["account"].http.close()
+        vehicles_data = entry.data.get("vehicles") or [v["vh"].data for v in previous["vhs"]]
+    elif account is None:
+        account = MitsubishiOwnerPortalAccount(hass, entry.data.get("account"), entry=entry)
+        vehicles_data = None
+    else:
+        # The flow that created this account just logged in and listed the vehicles
+        vehicles_data = entry.data.get("vehicles")
+    snapshots = _snapshots(previous)
+    history = HistoryStore(hass, entry.entry_id, account.history_size)
+    await history.async_load()
+    trips = TripStore(hass, entry.entry_id, account.trip_history)
+    await trips.async_load()
+    transfer = TransferStore(hass, entry.entry_id)
+    await transfer.async_load({account.username: account.transfer})
+    odometer = OdometerStatisticsImporter(hass)
+    remote = RemoteOperationQueue(hass, entry.entry_id)
+    await remote.async_load()
+    if not vehicles_data:
+        vehicles_data = await account.async_get_vehicles()
+    vhs: list[dict[str, Any]] = []
     for vehicle in vehicles_data:
         vh = Vehicle(vehicle)
-        coordinator = VehiclesCoordinator(vh.vin, account)
-        await coordinator.async_config_entry_first_refresh()
+        if vh.vin is None:
+            # Nothing to fetch for a vehicle listed without a VIN
+            continue
+        coordinator = VehiclesCoordinator(vh.vin, account, history, trips, odometer, remote=remote)
+        if vh.vin in snapshots:
+            coordinator.async_restore(snapshots[vh.vin])
+        else:
+            await coordinator.async_config_entry_first_refresh()
         vhs.append({"vh": vh, "coordinator": coordinator})
-    config_data.update({entry.entry_id: {"account": account, "vhs": vhs}})
+    remote.async_resume({v["vh"].vin: v["coordinator"] for v in vhs})
+    config_data.update({entry.entry_id: {
+        "account": account,
+        "accounts": [account],
+        "vhs": vhs,
+        "history": history,
+        "trips": trips,
+        "transfer": transfer,
+        "odometer": odometer,
+        "remote": remote,
+    }})
+    await hass.config_entries.async_forward_entry_setups(entry, SUPPORTED_DOMAINS)
+    return True
+
+
+@callback
+def async_handoff_account(hass: HomeAssistant, account: MitsubishiOwnerPortalAccount) -> None:
+    """Offer a logged-in account from a config flow to the entry setup that follows."""
+    handoff = hass.data.setdefault(DATA_HANDOFF, {})
+    previous = handoff.pop(account.username, None)
+    if previous is not None:
+        hass.async_create_task(previous[0].http.close())
+    handoff[account.username] = (account, time.monotonic())
+
+
+@callback
+def _async_pop_handoff(hass: HomeAssistant, entry: ConfigEntry) -> MitsubishiOwnerPortalAccount | None:
+    """Take over the account handed off for an entry, with its tokens and session."""
+    config = entry.data.get("account") or {}
+    account, handed_off = hass.data.get(DATA_HANDOFF, {}).pop(config.get(CONF_USERNAME), (None, 0))
+    if account is None:
+        return None
+    if time.monotonic() - handed_off > HANDOFF_TIMEOUT or account.password != config.get(CONF_PASSWORD):
+        hass.async_create_task(account.http.close())
+        return None
+    account.attach_entry(entry)
+    _LOGGER.debug('Reusing session and tokens of %s from the config flow', account.username)
+    return account
+
+
+async def _async_setup_fleet_entry(
+    hass: HomeAssistant, entry: ConfigEntry, previous: dict[str, Any] | None
+) -> bool:
+    """Set up an entry managing several accounts with shared resources."""
+    config_data = hass.data.setdefault(DOMAIN, {})
+    snapshots = _snapshots(previous)
+    # Accounts whose vehicles are listed again even after a reload
+    relist: set[str | None] = set()
+    if previous is not None:
+        fleet = previous["fleet"]
+        accounts = previous["accounts"]
+        for account, acc in zip(accounts, entry.data[CONF_ACCOUNTS]):
+            if account.password != acc.get(CONF_PASSWORD):
+                relist.add(account.username)
+            account.async_update_config(dict(acc))
+    else:
+        fleet = FleetContext(
+            hass,
+            entry.data.get(CONF_MAX_CONCURRENT, DEFAULT_MAX_CONCURRENT),
+            entry.data.get(CONF_REQUEST_INTERVAL, DEFAULT_REQUEST_INTERVAL),
+        )
+        accounts = [
+            MitsubishiOwnerPortalAccount(hass, dict(acc), entry=entry, fleet=fleet, index=idx)
+            for idx, acc in enumerate(entry.data[CONF_ACCOUNTS])
+        ]
+    history = HistoryStore(hass, entry.entry_id, accounts[0].history_size)
+    await history.async_load()
+    trips = TripStore(hass, entry.entry_id, accounts[0].trip_history)
+    await trips.async_load()
+    transfer = TransferStore(hass, entry.entry_id)
+    await transfer.async_load({account.username: account.transfer for account in accounts})
+    odometer = OdometerStatisticsImporter(hass)
+    remote = RemoteOperationQueue(hass, entry.entry_id)
+    await remote.async_load()
+
+    async def _async_setup_account(account: MitsubishiOwnerPortalAccount) -> list[dict[str, Any]]:
+        # A failing account must not take the other accounts down with it
+        try:
+            vehicles_data = []
+            if previous is not None and account.username not in relist:
+                vehicles_data = [v["vh"].data for v in previous["vhs"] if v["coordinator"].account is account]
+            if not vehicles_data:
+                # Not listed before, e.g. the account failed to log in
+                vehicles_data = await account.async_get_vehicles()
+        except Exception:  # pylint: disable=broad-except
+            _LOGGER.exception('Setting up account %s failed', account.username)
+            return []
+        vhs: list[dict[str, Any]] = []
+        for vehicle in vehicles_data:
+            vh = Vehicle(vehicle)
+            if vh.vin is None:
+                continue
+            coordinator = VehiclesCoordinator(
+                vh.vin, account, history, trips, odometer, scheduled=False, remote=remote
+            )
+            if vh.vin in snapshots:
+                coordinator.async_restore(snapshots[vh.vin])
+            else:
+                await coordinator.async_refresh()
+            vhs.append({"vh": vh, "coordinator": coordinator})
+        return vhs
+
+    results = await asyncio.gather(*(_async_setup_account(account) for account in accounts))
+    vhs = [vh for account_vhs in results for vh in account_vhs]
+    remote.async_resume({v["vh"].vin: v["coordinator"] for v in vhs})
+
+    interval = entry.data.get(CONF_SCAN_INTERVAL)
+    scheduler = FleetScheduler(
+        hass,
+        datetime.timedelta(seconds=interval) if interval else SCAN_INTERVAL,
+        [v["coordinator"] for v in vhs],
+        fleet.metrics,
+    )
+    scheduler.async_start()
+    entry.async_on_unload(scheduler.async_stop)
+
+    config_data.update({entry.entry_id: {
+        "accounts": accounts,
+        "fleet": fleet,
+        "scheduler": scheduler,
+        "vhs": vhs,
+        "history": history,
+        "trips": trips,
+        "transfer": transfer,
+        "odometer": odometer,
+        "remote": remote,
+    }})
     await hass.config_entries.async_forward_entry_setups(entry, SUPPORTED_DOMAINS)
     return True
 
@@ -100,626 +414,127 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         config_data = hass.data.get(DOMAIN, {})
         if entry.entry_id in config_data:
             entry_data = config_data.pop(entry.entry_id)
-            # Close HTTP session if it exists
-            if "account" in entry_data and hasattr(entry_data["account"], "http"):
-                await entry_data["account"].http.close()
+            if "history" in entry_data:
+                await entry_data["history"].async_save()
+            if "trips" in entry_data:
+                await entry_data["trips"].async_save()
+            if "transfer" in entry_data:
+                await entry_data["transfer"].async_shutdown()
+            if "odometer" in entry_data:
+                await entry_data["odometer"].async_shutdown()
+            if "remote" in entry_data:
+                await entry_data["remote"].async_shutdown()
+            if entry.disabled_by:
+                await _async_close_sessions(entry_data)
+            else:
+                # Handed to the setup that follows on a reload
+                _async_stash_reload(hass, entry, entry_data)
             _LOGGER.info("Successfully unloaded Mitsubishi Owner Portal entry: %s", entry.entry_id)
 
     return unload_ok
 
 
-async def async_reload_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
-    """Reload config entry."""
-    await async_unload_entry(hass, entry)
-    await async_setup_entry(hass, entry)
-
-
-class MitsubishiOwnerPortalAccount:
-    """Mitsubishi Owner Portal account handler."""
-
-    def __init__(
-        self,
-        hass: HomeAssistant,
-        config: dict[str, Any],
-        entry: ConfigEntry | None = None,
-    ) -> None:
-        """Initialize the account."""
-        self._config = config
-        self.hass = hass
-        self.entry = entry
-
-        # Determine if SSL verification should be enabled
-        verify_ssl = self.get_config(CONF_VERIFY_SSL, True)
-
-        if not verify_ssl:
-            _LOGGER.warning(
-                "SSL verification is disabled. This is insecure and should only be used for testing."
-            )
-
-        self.http = aiohttp_client.async_create_clientsession(
-            hass,
-            verify_ssl=verify_ssl,
-            auto_cleanup=False,
-        )
-
-    def get_config(self, key: str, default: Any = None) -> Any:
-        """Get configuration value."""
-        return self._config.get(key, default)
-
-    @property
-    def username(self) -> str | None:
-        """Get username."""
-        return self.get_config(CONF_USERNAME)
-
-    @property
-    def password(self) -> str | None:
-        """Get password."""
-        return self.get_config(CONF_PASSWORD)
-
-    @property
-    def uid(self) -> str:
-        """Get user ID."""
-        return self.get_config(CONF_USER_ID) or ''
-
-    @property
-    def token(self) -> str:
-        """Get access token."""
-        return self.get_config(CONF_TOKEN) or ''
-
-    @property
-    def token_time(self) -> float:
-        """Get token timestamp."""
-        return self.get_config(CONF_TOKEN_TIME) or 0
-
-    @property
-    def refresh_token(self) -> str:
-        """Get refresh token."""
-        return self.get_config(CONF_REFRESH_TOKEN) or ''
-
-    @property
-    def refresh_token_time(self) -> float:
-        """Get refresh token timestamp."""
-        return self.get_config(CONF_REFRESH_TOKEN_TIME) or 0
-
-    @property
-    def update_interval(self) -> datetime.timedelta:
-        """Get update interval."""
-        return self.get_config(CONF_SCAN_INTERVAL) or SCAN_INTERVAL
-
-    def api_url(self, api: str = '') -> str:
-        """Build API URL."""
-        if api[:6] == 'https:' or api[:5] == 'http:':
-            return api
-        bas = self.get_config(CONF_API_BASE) or DEFAULT_API_BASE
-        return f"{bas.rstrip('/')}/{api.lstrip('/')}"
-
-    async def request(
-        self, api: str, pms: dict[str, Any] | None = None, method: str = 'GET', **kwargs: Any
-    ) -> dict[str, Any]:
-        """Make API request."""
-        method = method.upper()
-        url = self.api_url(api)
-        kws = {
-            'timeout': 30,
-            'headers': {
-                'Authorization': f'Bearer {self.token}',
-                'Content-Type': 'application/json;charset=UTF-8',
-                'Accept': 'application/json, text/plain, */*'
-            },
-        }
-        kws.update(kwargs)
-        if method in ['GET']:
-            kws['params'] = pms
-        elif method in ['POST_GET']:
-            method = 'POST'
-            kws['params'] = pms
-        else:
-            kws['json'] = pms
-        req = None
-
-        _LOGGER.debug('Making %s request to %s (verify_ssl=%s)', method, url, self.get_config(CONF_VERIFY_SSL, True))
+async def async_apply_options(hass: HomeAssistant, entry: ConfigEntry) -> bool:
+    """Apply updated account options to a running entry without reloading it.
 
-        try:
-            req = await self.http.request(method, url, **kws)
-            _LOGGER.debug('Request to %s succeeded (status=%s)', url, req.status)
-            return await req.json(content_type=None) or {}
-        except ClientSSLError as exc:
-            # SSL Certificate error - create repair issue
-            _LOGGER.error('SSL certificate error connecting to %s: %s', url, exc)
-            self._create_ssl_error_issue(url, str(exc))
-            raise UpdateFailed(f"SSL certificate error: {exc}") from exc
-        except ClientConnectorError as exc:
-            # Mask sensitive data in logs
-            safe_pms = {**pms} if pms else {}
-            if 'password' in safe_pms:
-                safe_pms['password'] = '***'
-            if 'refresh_token' in safe_pms:
-                safe_pms['refresh_token'] = safe_pms['refresh_token'][:10] + '...'
-
-            _LOGGER.error(
-                'Connection error to Mitsubishi API: method=%s, url=%s, error=%s',
-                method,
-                url,
-                type(exc).__name__,
-            )
-            _LOGGER.debug('Request params (safe): %s', safe_pms)
-
-            # Check if it's a certificate error
-            if 'CERTIFICATE' in str(exc).upper() or 'SSL' in str(exc).upper():
-                self._create_ssl_error_issue(url, str(exc))
-
-            if req:
-                _LOGGER.debug('Response status: %s', req.status)
-
-        except (ContentTypeError, TimeoutError) as exc:
-            _LOGGER.error(
-                'Request to Mitsubishi API failed: method=%s, url=%s, error=%s',
-                method,
-                url,
-                type(exc).__name__,
-            )
-
-        return {}
-
-    def _create_ssl_error_issue(self, url: str, error: str) -> None:
-        """Create a repair issue for SSL certificate errors."""
-        if not self.entry:
-            return
-
-        ir.async_create_issue(
-            self.hass,
-            DOMAIN,
-            f"ssl_certificate_error_{self.entry.entry_id}",
-            is_fixable=False,
-            severity=ir.IssueSeverity.ERROR,
-            translation_key="ssl_certificate_error",
-            translation_placeholders={
-                "url": url,
-                "error": error,
-            },
-        )
-
-        # Also create a persistent notification for immediate visibility
-        async_create(
-            self.hass,
-            f"SSL certificate error when connecting to Mitsubishi Owner Portal.\n\n"
-            f"URL: {url}\n"
-            f"Error: {error}\n\n"
-            f"This usually means:\n"
-            f"1. The server's SSL certificate has expired\n"
-            f"2. Your system's CA certificates need updating\n"
-            f"3. There's a network issue\n\n"
-            f"Please check the [repair issues](/config/repairs) for more details.",
-            title="Mitsubishi Owner Portal SSL Error",
-            notification_id=f"mitsubishi_ssl_error_{self.entry.entry_id}",
-        )
-
-    async def async_login(self) -> bool:
-        """Log in to Mitsubishi Owner Portal."""
-        pms = {
-            'grant_type': 'password',
-            'username': self.username,
-            'password': self.password,
-        }
-        rsp = await self.request(f'auth/v1/token', pms, 'POST')
-        account_dn = rsp.get('accountDN')
-        access_token = rsp.get('access_token')
-        if not account_dn:
-            _LOGGER.error('Mitsubishi owner portal login %s failed: %s', self.username, rsp)
-            return False
-
-        # Update in-memory config
-        current_time = time.time()
-        self._config.update({
-            CONF_TOKEN: access_token,
-            CONF_TOKEN_TIME: current_time,
-            CONF_REFRESH_TOKEN: rsp.get('refresh_token'),
-            CONF_REFRESH_TOKEN_TIME: current_time,
-            CONF_USER_ID: account_dn,
-        })
-
-        # Persist to config entry
-        if self.entry:
-            self.hass.config_entries.async_update_entry(
-                self.entry,
-                data={
-                    **self.entry.data,
-                    "account": self._config.copy(),
-                },
-            )
-            _LOGGER.info("Login successful, credentials saved to config entry")
-        else:
-            _LOGGER.info("Login successful (no config entry to save)")
-
-        return True
-
-    async def async_check_token(self) -> None:
-        """Check and refresh token if needed."""
-        current_time = time.time()
-        token_age = current_time - self.token_time if self.token_time else 0
-        refresh_token_age = current_time - self.refresh_token_time if self.refresh_token_time else 0
-
-        _LOGGER.debug(
-            "Token check: token_age=%ds, refresh_age=%ds, uid=%s",
-            int(token_age),
-            int(refresh_token_age),
-            self.uid or "None",
-        )
-
-        if None in [self.uid, self.token, self.token_time, self.refresh_token, self.refresh_token_time]:
-            _LOGGER.info("Missing credentials, performing login")
-            await self.async_login()
-        elif refresh_token_age > 2590000:  # ~30 days
-            _LOGGER.info("Refresh token expired (age: %d days), performing re-login", int(refresh_token_age / 86400))
-            await self.async_login()
-        elif token_age > 1500:  # 25 minutes
-            _LOGGER.debug("Access token expired (age: %d minutes), refreshing", int(token_age / 60))
-            await self.async_refresh_token()
-
-    async def async_refresh_token(self) -> bool:
-        """Refresh access token."""
-        pms = {
-            'grant_type': 'refresh_token',
-            'refresh_token': self.refresh_token,
-        }
-        rsp = await self.request(f'auth/v1/token', pms, 'POST')
-        access_token = rsp.get('access_token')
-        if not access_token:
-            _LOGGER.warning('Mitsubishi owner portal refresh token failed: %s', rsp)
-            return await self.async_login()
-
-        # Update in-memory config
-        self._config.update({
-            CONF_TOKEN: access_token,
-            CONF_TOKEN_TIME: time.time(),
-            CONF_REFRESH_TOKEN: rsp.get('refresh_token'),
-        })
-
-        # Persist to config entry
-        if self.entry:
-            self.hass.config_entries.async_update_entry(
-                self.entry,
-                data={
-                    **self.entry.data,
-                    "account": self._config.copy(),
-                },
-            )
-            _LOGGER.debug("Access token refreshed and saved to config entry")
-
-        return True
-
-    async def async_get_vehicles(self) -> list[dict[str, Any]]:
-        """Get list of vehicles."""
-        await self.async_check_token()
-        api = f'user/v1/users/{self.uid}/vehicles'
-        rsp = await self.request(api)
-        msg = rsp.get('message', '')
-        if msg == 'Unauthorized':
-            if await self.async_login():
-                api = f'user/v1/users/{self.uid}/vehicles'
-                rsp = await self.request(api)
-        vhs = rsp.get('vehicles', [])
-        if not vhs:
-            _LOGGER.warning('Got vehicles for %s failed: %s', self.username, rsp)
-        return vhs
-
-
-class VehiclesCoordinator(DataUpdateCoordinator):
-    """Vehicle data update coordinator."""
-
-    def __init__(self, vin: str, account: MitsubishiOwnerPortalAccount) -> None:
-        """Initialize the coordinator."""
-        super().__init__(
-            account.hass,
-            _LOGGER,
-            name=f'{DOMAIN}-{account.uid}-{vin}',
-            update_interval=account.update_interval,
-        )
-        self.account = account
-        self.vin = vin
-        self._subs = {}
-
-    async def _async_update_data(self) -> dict[str, Any]:
-        """Fetch data from API endpoint."""
-        return await self.update_vehicle_detail()
-
-    async def update_vehicle_detail(self) -> dict[str, Any]:
-        """Update vehicle detail."""
-        # if not await self.async_remote_operation():
-        #     return {}
-        await self.account.async_check_token()
-        api = f'avi/v1/vehicles/{self.vin}/vehiclestate'
-        try:
-            rsp = await self.account.request(api)
-            _LOGGER.debug('Vehicle state API response structure: %s', list(rsp.keys()) if isinstance(rsp, dict) else type(rsp))
-        except (TypeError, ValueError) as exc:
-            rsp = {}
-            _LOGGER.error('Got vehicle detail for %s failed: %s', self.vin, exc)
-
-        if not rsp.get('state', {}):
-            _LOGGER.warning('Got vehicle detail for %s failed. Response keys: %s', self.vin, list(rsp.keys()) if isinstance(rsp, dict) else rsp)
-            if await self.account.async_login():
-                try:
-                    rsp = await self.account.request(api)
-                except (TypeError, ValueError):
-                    rsp = {}
-
-        # Parse vehiclestate API response structure
-        state = rsp.get('state', {})
-        if not state:
-            _LOGGER.error('Invalid API response: missing state. Response keys: %s', list(rsp.keys()) if isinstance(rsp, dict) else type(rsp))
-            return {}
-
-        charging_control = state.get('chargingControl', {})
-        if not charging_control:
-            _LOGGER.error('Invalid API response: missing chargingControl in state')
-            return {}
-
-        _LOGGER.debug('chargingControl keys: %s', list(charging_control.keys()))
-
-        # Helper function to convert timestamp to datetime object
-        def parse_timestamp(ts_value):
-            """Convert timestamp to datetime object with timezone for TIMESTAMP sensors."""
-            if ts_value and str(ts_value).isnumeric():
-                timestamp = float(ts_value)
-                # Check if timestamp is in milliseconds (13 digits) and convert to seconds
-                if timestamp > 10000000000:  # Timestamps after year 2286 are likely in milliseconds
-                    timestamp = timestamp / 1000
-                # Return timezone-aware datetime in UTC
-                return datetime.datetime.fromtimestamp(timestamp, tz=datetime.timezone.utc)
-            return None
-
-        # Helper function to safely convert numeric values
-        def safe_number(value, default=None):
-            """Convert value to number, return None if invalid."""
-            if value is None or value == 'unknown' or value == '':
-                return default
-            try:
-                # Try to convert to int first, then float
-                return int(value) if isinstance(value, str) and value.isdigit() else float(value) if value else default
-            except (ValueError, TypeError):
-                return default
-
-        # Helper function to get value from charging_control
-        def get_control_value(field_name):
-            """Get value from chargingControl structure."""
-            return charging_control.get(field_name)
-
-        # Extract location data
-        ext_loc_map = state.get('extLocMap', {})
-        location_lat = safe_number(ext_loc_map.get('lat'))
-        location_lon = safe_number(ext_loc_map.get('lon'))
-        location_ts = parse_timestamp(ext_loc_map.get('ts'))
-
-        # Extract odometer data (get the most recent reading from odo array)
-        odo_list = state.get('odo', [])
-        latest_odo = None
-        latest_odo_ts = None
-        if odo_list and isinstance(odo_list, list):
-            latest_odo_entry = odo_list[-1] if odo_list else {}
-            if isinstance(latest_odo_entry, dict) and latest_odo_entry:
-                # Get the first (and only) key-value pair
-                for ts_key, odo_value in latest_odo_entry.items():
-                    latest_odo = safe_number(odo_value)
-                    # Odometer timestamp is a string date, parse it and add timezone
-                    try:
-                        latest_odo_ts = datetime.datetime.strptime(ts_key, "%Y-%m-%d %H:%M:%S").replace(tzinfo=datetime.timezone.utc)
-                    except (ValueError, TypeError):
-                        latest_odo_ts = None
-                    break
-
-        # Extract cruising range data
-        # Try cruisingRangeCombined first, fallback to availRange
-        cruising_range_combined = safe_number(charging_control.get('cruisingRangeCombined'))
-        if cruising_range_combined is None:
-            # Fallback: try to get availRange from diagnostic data
-            avail_range = safe_number(charging_control.get('availRange'))
-            if avail_range is None and isinstance(charging_control.get('availRange'), dict):
-                avail_range = safe_number(charging_control.get('availRange', {}).get('value'))
-            cruising_range_combined = avail_range
-            _LOGGER.debug('Using availRange as combined range: %s', cruising_range_combined)
-
-        # Extract first cruising range (gasoline)
-        cruising_range_first_list = charging_control.get('cruisingRangeFirst', [])
-        cruising_range_gasoline = None
-        if cruising_range_first_list and isinstance(cruising_range_first_list, list):
-            # API returns array with separate dicts: [{"range": "1991"}, {"engineType": "4"}]
-            # Extract range from first dict that has it, verify engineType if present
-            range_value = None
-            engine_type = None
-            for item in cruising_range_first_list:
-                if isinstance(item, dict):
-                    if 'range' in item:
-                        range_value = item.get('range')
-                    if 'engineType' in item:
-                        engine_type = item.get('engineType')
-            # Use range if found and engineType is correct (or not specified)
-            if range_value and (engine_type == '4' or engine_type is None):
-                cruising_range_gasoline = safe_number(range_value)
-
-        # Try alternative structure for gasoline range
-        if cruising_range_gasoline is None and isinstance(charging_control.get('cruisingRangeFirst'), dict):
-            cruising_range_data = charging_control.get('cruisingRangeFirst', {}).get('cruisingRange', [])
-            for item in cruising_range_data:
-                if isinstance(item, dict):
-                    # Try range_2 structure
-                    range_data = item.get('range_2', item.get('range', {}))
-                    if isinstance(range_data, dict):
-                        cruising_range_gasoline = safe_number(range_data.get('value'))
-                        if cruising_range_gasoline:
-                            break
-
-        # Extract second cruising range (electric)
-        cruising_range_second_list = charging_control.get('cruisingRangeSecond', [])
-        cruising_range_electric = None
-        if cruising_range_second_list and isinstance(cruising_range_second_list, list):
-            # API returns array with separate dicts: [{"range": "46"}, {"engineType": "5"}]
-            # Extract range from first dict that has it, verify engineType if present
-            range_value = None
-            engine_type = None
-            for item in cruising_range_second_list:
-                if isinstance(item, dict):
-                    if 'range' in item:
-                        range_value = item.get('range')
-                    if 'engineType' in item:
-                        engine_type = item.get('engineType')
-            # Use range if found and engineType is correct (or not specified)
-            if range_value and (engine_type == '5' or engine_type is None):
-                cruising_range_electric = safe_number(range_value)
-
-        # Try alternative structure for electric range
-        if cruising_range_electric is None and isinstance(charging_control.get('cruisingRangeSecond'), dict):
-            cruising_range_data = charging_control.get('cruisingRangeSecond', {}).get('cruisingRange', [])
-            for item in cruising_range_data:
-                if isinstance(item, dict):
-                    # Try range_3 structure
-                    range_data = item.get('range_3', item.get('range', {}))
-                    if isinstance(range_data, dict):
-                        cruising_range_electric = safe_number(range_data.get('value'))
-                        if cruising_range_electric:
-                            break
-
-        # Debug logging for range values
-        _LOGGER.debug('Cruising range values: combined=%s, gasoline=%s, electric=%s',
-                     cruising_range_combined, cruising_range_gasoline, cruising_range_electric)
-        if cruising_range_electric is None:
-            _LOGGER.warning('Electric range is None. cruisingRangeSecond structure: %s',
-                          charging_control.get('cruisingRangeSecond'))
-
-        # Calculate gasoline range from combined if available and gasoline range seems unrealistic
-        # (PHEV gasoline range shouldn't exceed combined range significantly)
-        if cruising_range_combined and cruising_range_electric:
-            calculated_gasoline = cruising_range_combined - cruising_range_electric
-            # If parsed gasoline range is much larger than combined (unrealistic), use calculated
-            if cruising_range_gasoline is None or cruising_range_gasoline > cruising_range_combined * 2:
-                _LOGGER.debug('Gasoline range (%s) seems unrealistic, calculating from combined (%s) - electric (%s) = %s',
-                            cruising_range_gasoline, cruising_range_combined, cruising_range_electric, calculated_gasoline)
-                cruising_range_gasoline = calculated_gasoline if calculated_gasoline > 0 else None
-
-        return {
-            # Charging information
-            "Battery": safe_number(get_control_value('hvBatteryLife')),
-            "Charging_Status": get_control_value('hvChargingStatus') or 'unknown',
-            "Charging_Mode": get_control_value('hvChargingMode') or 'unknown',
-            "Charging_Plug_Status": get_control_value('hvChargingPlugStatus') or 'unknown',
-            "Charging_Ready": get_control_value('hvChargingReady') or 'unknown',
-            "Time_To_Full_Charge": safe_number(get_control_value('hvTimeToFullCharge')),
-            "Event_Timestamp": parse_timestamp(get_control_value('eventTimestamp')),
-
-            # Range information
-            "Cruising_Range_Combined": cruising_range_combined,
-            "Cruising_Range_Gasoline": cruising_range_gasoline,
-            "Cruising_Range_Electric": cruising_range_electric,
-
-            # Vehicle state
-            "Ignition_State": state.get('ignitionState') or 'unknown',
-            "Ignition_State_Timestamp": parse_timestamp(state.get('ignitionStateTs')),
-            "Odometer": latest_odo,
-            "Odometer_Timestamp": latest_odo_ts,
-
-            # Location information
-            "Location_Latitude": location_lat,
-            "Location_Longitude": location_lon,
-            "Location_Timestamp": location_ts,
-
-            # Security and status
-            "Theft_Alarm": state.get('theftAlarm') or 'unknown',
-            "Theft_Alarm_Type": state.get('theftAlarmType') or 'unknown',
-            "Privacy_Mode": state.get('privacy') or 'unknown',
-            "Temperature": safe_number(state.get('temp')),
-            "Accessible": state.get('accessible') or 'unknown',
-
-            # Other states
-            "Door_Status": state.get('ods') or 'unknown',
-            "Diagnostic": state.get('diagnostic') or 'unknown',
-        }
-
-    async def async_remote_operation(self):
-        pms = {
-            'forced': 'true',
-            'operation': 'vehicleStatus',
-            'userAgent': 'owner-portal',
-            'vin': self.vin
-        }
-        attempts = 0
-        eid = None
-        while attempts < 3:
-            attempts += 1
-            rsp = await self.account.request(f'avi/v3/remoteOperation', pms, 'POST')
-            msg = rsp.get('message', '')
-            if msg == 'Unauthorized':
-                await self.account.async_login()
-                rsp = await self.account.request(f'avi/v3/remoteOperation', pms, 'POST')
-
-            eid = rsp.get('eventId')
-            status = rsp.get('status')
-            if status == 'Started':
-                break
-            time.sleep(5)
-
-        if not eid:
-            _LOGGER.error('Request remote api failed')
-            return False
-
-        time.sleep(3)
-        attempts = 0
-        while attempts < 5:
-            attempts += 1
-            rsp = await self.account.request(f'avi/v1/remoteOperation/vehicles/{self.vin}/events/{eid}')
-            status = rsp.get('status')
-            if status == 'Successful':
-                return True
-            time.sleep(5)
-        _LOGGER.error('Get remote api response failed')
+    The account keeps its tokens and, unless SSL verification changed, its
+    session; coordinators are rescheduled in place and nothing is fetched.
+    Returns False when the entry is not running or its vehicles changed, in
+    which case it has to be reloaded instead.
+    """
+    entry_data = hass.data.get(DOMAIN, {}).get(entry.entry_id)
+    if not entry_data or "account" not in entry_data:
+        return False
+    vins = {vehicle.get("vin") for vehicle in entry.data.get("vehicles") or []}
+    if vins and vins != {v["vh"].vin for v in entry_data["vhs"]}:
         return False
+    account: MitsubishiOwnerPortalAccount = entry_data["account"]
+    account.async_update_config(entry.data.get("account") or {})
+    entry_data["history"].async_set_capacity(account.history_size)
+    entry_data["trips"].async_set_capacity(account.trip_history)
+    for v in entry_data["vhs"]:
+        v["coordinator"].async_apply_options()
+    _LOGGER.debug('Applied new options to %s without reloading', account.username)
+    return True
 
 
-class Vehicle:
-    """Vehicle data model."""
-
-    def __init__(self, dat: dict[str, Any]) -> None:
-        """Initialize vehicle."""
-        self.data: dict[str, Any] = dat
-
-    @property
-    def vin(self) -> str | None:
-        """Get VIN."""
-        return self.data.get('vin')
-
-    @property
-    def vehicle_model(self) -> str:
-        """Get vehicle model."""
-        return self.data.get('model', '')
-
-    @property
-    def vehicle_model_name(self) -> str:
-        """Get vehicle model name."""
-        return self.data.get('modelDescription', '')
-
-
-class MitsubishiOwnerPortalEntity(CoordinatorEntity[VehiclesCoordinator]):
-    """Base entity for Mitsubishi Owner Portal."""
-
-    def __init__(self, vehicle: Vehicle, coordinator: VehiclesCoordinator) -> None:
-        """Initialize the entity."""
-        super().__init__(coordinator)
-        self.vehicle = vehicle
-        # Don't set _attr_name in base class - let entity types handle their own naming
-        # Device name is set via device_info property
-        self._attr_unique_id = vehicle.vin
-
-    @property
-    def device_info(self) -> DeviceInfo:
-        """Return information about the device."""
-        # Generate unique device name by including last 4 digits of VIN
-        # This helps distinguish multiple vehicles of the same model
-        vin = str(self.vehicle.vin or "")
-        vin_suffix = vin[-4:] if len(vin) >= 4 else vin
-        device_name = f"{self.vehicle.vehicle_model_name} ({vin_suffix})" if vin_suffix else self.vehicle.vehicle_model_name
-
-        return DeviceInfo(
-            identifiers={(DOMAIN, str(self.vehicle.vin))},
-            manufacturer="Mitsubishi",
-            model=self.vehicle.vehicle_model,
-            name=device_name,
-        )
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove persisted data of a config entry."""
+    await HistoryStore(hass, entry.entry_id).async_remove()
+    await TripStore(hass, entry.entry_id).async_remove()
+    await TransferStore(hass, entry.entry_id).async_remove()
+    await RemoteOperationQueue(hass, entry.entry_id).async_remove()
+    await _async_drop_reload(hass, entry.entry_id)
+    async_remove_ssl_issues(hass, entry.entry_id)
+    # Forget the tokens of users no other loaded entry logs in as
+    in_use = {
+        account.username
+        for entry_data in hass.data.get(DOMAIN, {}).values()
+        for account in entry_data.get("accounts", [])
+    }
+    accounts = entry.data.get(CONF_ACCOUNTS) or [entry.data.get("account") or {}]
+    for acc in accounts:
+        if acc.get(CONF_USERNAME) not in in_use:
+            async_remove_shared_tokens(hass, acc.get(CONF_USERNAME))
+
+
+async def _async_close_sessions(entry_data: dict[str, Any]) -> None:
+    """Close the HTTP sessions of an unloaded entry."""
+    if "fleet" in entry_data:
+        # Its accounts only use the pooled sessions
+        await entry_data["fleet"].async_close()
+        return
+    for account in entry_data.get("accounts", []):
+        await account.http.close()
+
+
+@callback
+def _async_stash_reload(hass: HomeAssistant, entry: ConfigEntry, entry_data: dict[str, Any]) -> None:
+    """Keep the state of an unloaded entry for a setup that follows, closing it if none does."""
+    reloads: dict[str, tuple[dict[str, Any], CALLBACK_TYPE]] = hass.data.setdefault(DATA_RELOAD, {})
+
+    @callback
+    def _expire(_now: datetime.datetime) -> None:
+        if reloads.get(entry.entry_id, (None,))[0] is entry_data:
+            del reloads[entry.entry_id]
+            hass.async_create_task(_async_close_sessions(entry_data))
+
+    if entry.entry_id in reloads:
+        stale, cancel = reloads.pop(entry.entry_id)
+        cancel()
+        hass.async_create_task(_async_close_sessions(stale))
+    reloads[entry.entry_id] = (entry_data, async_call_later(hass, RELOAD_TIMEOUT, _expire))
+
+
+async def _async_drop_reload(hass: HomeAssistant, entry_id: str) -> None:
+    """Close the state an entry left for a setup that will not come."""
+    stashed = hass.data.get(DATA_RELOAD, {}).pop(entry_id, None)
+    if stashed is not None:
+        stashed[1]()
+        await _async_close_sessions(stashed[0])
+
+
+@callback
+def _async_pop_reload(hass: HomeAssistant, entry: ConfigEntry) -> dict[str, Any] | None:
+    """Take over the state an entry unloaded for a reload, if it still fits the config."""
+    stashed = hass.data.get(DATA_RELOAD, {}).pop(entry.entry_id, None)
+    if stashed is None:
+        return None
+    previous, cancel = stashed
+    cancel()
+    if CONF_ACCOUNTS in entry.data:
+        usernames = [acc.get(CONF_USERNAME) for acc in entry.data[CONF_ACCOUNTS]]
+    else:
+        usernames = [(entry.data.get("account") or {}).get(CONF_USERNAME)]
+    fits = ("fleet" in previous) == (CONF_ACCOUNTS in entry.data)
+    if not fits or usernames != [account.username for account in previous["accounts"]]:
+        hass.async_create_task(_async_close_sessions(previous))
+        return None
+    return previous
+
+
+def _snapshots(previous: dict[str, Any] | None) -> dict[str, VehiclesCoordinator]:
+    """Return the coordinators of the previous instance of an entry by VIN."""
+    if previous is None:
+        return {}
+    return {v["coordinator"].vin: v["coordinator"] for v in previous["vhs"] if v["coordinator"].data}
@@ -0,0 +1,582 @@
+"""Mitsubishi Owner Portal account client."""
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import datetime
+import logging
+import time
+from asyncio import TimeoutError
+from typing import Any
+
+from aiohttp import ClientConnectorError, ClientSSLError, ClientTimeout, ContentTypeError
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_PASSWORD, CONF_SCAN_INTERVAL, CONF_TOKEN, CONF_USERNAME
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import aiohttp_client
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.update_coordinator import UpdateFailed
+
+from .charging import DEFAULT_BATTERY_CAPACITY, DEFAULT_CHARGE_TARGET
+from .const import (
+    CONF_ACCOUNTS,
+    CONF_API_BASE,
+    CONF_BATTERY_CAPACITY,
+    CONF_CHARGE_TARGET,
+    CONF_CONNECT,
+    CONF_HISTORY_SIZE,
+    CONF_MAX_RESPONSE_SIZE,
+    CONF_READ,
+    CONF_REFRESH_COOLDOWN,
+    CONF_REFRESH_DEADLINE,
+    CONF_REFRESH_TOKEN,
+    CONF_REFRESH_TOKEN_TIME,
+    CONF_TIMEOUTS,
+    CONF_TOKEN_TIME,
+    CONF_TRACE,
+    CONF_TRACKER_DISTANCE,
+    CONF_TRIP_HISTORY,
+    CONF_USER_ID,
+    CONF_VERIFY_SSL,
+    DEFAULT_API_BASE,
+    DEFAULT_REFRESH_COOLDOWN,
+    DEFAULT_REFRESH_DEADLINE,
+    DEFAULT_TIMEOUTS,
+    DEFAULT_TRACKER_DISTANCE,
+    REQUEST_TIMEOUT,
+    SCAN_INTERVAL,
+    SESSION_CLOSE_DELAY,
+    TOKEN_KEYS,
+)
+from .decoding import (
+    ACCEPT_ENCODING,
+    DEFAULT_MAX_RESPONSE_SIZE,
+    ResponseDecodeError,
+    async_read_json,
+    endpoint_class,
+    endpoint_name,
+    endpoint_vin,
+)
+from .deadline import deadline_exceeded, time_left
+from .fleet import FleetContext, RequestMetrics
+from .history import DEFAULT_HISTORY_SIZE
+from .issues import async_get_ssl_issues
+from .tokens import REFRESH_TOKEN_LIFETIME, async_get_shared_tokens
+from .transfer import MonthlyTransfer
+from .tracing import Tracer
+from .trips import DEFAULT_TRIP_HISTORY
+
+_LOGGER = logging.getLogger(__name__)
+
+# Endpoints answering conditional GETs, whose last response is kept for a 304
+CONDITIONAL_ENDPOINTS = ('user/v1/users/*/vehicles', 'avi/v1/vehicles/*/vehiclestate')
+
+# (ETag, Last-Modified, response) of the last answer to a conditional GET
+Validated = tuple[str | None, str | None, dict[str, Any]]
+
+
+class MitsubishiOwnerPortalAccount:
+    """Mitsubishi Owner Portal account handler."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        config: dict[str, Any],
+        entry: ConfigEntry | None = None,
+        fleet: FleetContext | None = None,
+        index: int | None = None,
+    ) -> None:
+        """Initialize the account.
+
+        With a ``fleet`` the account is one of several in ``entry`` at position
+        ``index``; it then uses the fleet's pooled session, rate limiter and
+        metrics, while its tokens stay its own.
+        """
+        self._config = config
+        self.hass = hass
+        self.entry = entry
+        self.fleet = fleet
+        self.index = index
+        self.metrics = fleet.metrics if fleet else RequestMetrics()
+        self._inflight: dict[tuple[str, tuple[tuple[str, str], ...], str], asyncio.Future[dict[str, Any]]] = {}
+        # Last answer per conditional GET, keyed by URL and query
+        self._validated: dict[tuple[str, tuple[tuple[str, str], ...]], Validated] = {}
+        self.transfer = MonthlyTransfer()
+        self.tracer = Tracer(_LOGGER, self.get_config(CONF_TRACE))
+        self.shared_tokens = async_get_shared_tokens(hass, self.username, self.api_url())
+        self._share_tokens()
+
+        # Determine if SSL verification should be enabled
+        verify_ssl = self.get_config(CONF_VERIFY_SSL, True)
+
+        if not verify_ssl:
+            _LOGGER.warning(
+                "SSL verification is disabled. This is insecure and should only be used for testing."
+            )
+
+        if fleet:
+            self.http = fleet.session(verify_ssl)
+        else:
+            self.http = aiohttp_client.async_create_clientsession(
+                hass,
+                verify_ssl=verify_ssl,
+                auto_cleanup=False,
+                auto_decompress=False,
+            )
+
+    def get_config(self, key: str, default: Any = None) -> Any:
+        """Get configuration value."""
+        return self._config.get(key, default)
+
+    @property
+    def config(self) -> dict[str, Any]:
+        """Get a copy of the account config, including the current tokens."""
+        return self._config.copy()
+
+    @callback
+    def async_update_config(self, config: dict[str, Any]) -> None:
+        """Take over changed options.
+
+        The tokens currently in use are kept unless the password changed, in
+        which case those of the new config (from a fresh login) win. A change
+        of SSL verification swaps in a new session; the old one is closed once
+        requests still running on it have had time to finish.
+        """
+        verify_ssl = self.get_config(CONF_VERIFY_SSL, True)
+        tokens = {}
+        if config.get(CONF_PASSWORD) == self.password:
+            tokens = {key: self._config[key] for key in TOKEN_KEYS if key in self._config}
+        self._config = {**config, **tokens}
+        self.tracer.configure(self.get_config(CONF_TRACE) or {})
+        self.shared_tokens = async_get_shared_tokens(self.hass, self.username, self.api_url())
+        self._share_tokens()
+        if self.fleet or self.get_config(CONF_VERIFY_SSL, True) == verify_ssl:
+            return
+        old_http = self.http
+        self.http = aiohttp_client.async_create_clientsession(
+            self.hass,
+            verify_ssl=self.get_config(CONF_VERIFY_SSL, True),
+            auto_cleanup=False,
+            auto_decompress=False,
+        )
+
+        @callback
+        def _close_old_session(_now: datetime.datetime) -> None:
+            self.hass.async_create_task(old_http.close())
+
+        async_call_later(self.hass, SESSION_CLOSE_DELAY, _close_old_session)
+
+    def attach_entry(self, entry: ConfigEntry) -> None:
+        """Bind an account created by a config flow to its config entry."""
+        self.entry = entry
+        self._config = dict(entry.data.get("account") or self._config)
+        self._share_tokens()
+
+    @property
+    def username(self) -> str | None:
+        """Get username."""
+        return self.get_config(CONF_USERNAME)
+
+    @property
+    def password(self) -> str | None:
+        """Get password."""
+        return self.get_config(CONF_PASSWORD)
+
+    @property
+    def uid(self) -> str:
+        """Get user ID."""
+        return self.get_config(CONF_USER_ID) or ''
+
+    @property
+    def token(self) -> str:
+        """Get access token."""
+        return self.get_config(CONF_TOKEN) or ''
+
+    @property
+    def token_time(self) -> float:
+        """Get token timestamp."""
+        return self.get_config(CONF_TOKEN_TIME) or 0
+
+    @property
+    def refresh_token(self) -> str:
+        """Get refresh token."""
+        return self.get_config(CONF_REFRESH_TOKEN) or ''
+
+    @property
+    def refresh_token_time(self) -> float:
+        """Get refresh token timestamp."""
+        return self.get_config(CONF_REFRESH_TOKEN_TIME) or 0
+
+    @property
+    def history_size(self) -> int:
+        """Get number of samples kept per vehicle."""
+        return self.get_config(CONF_HISTORY_SIZE) or DEFAULT_HISTORY_SIZE
+
+    @property
+    def battery_capacity(self) -> float:
+        """Get usable traction battery capacity in kWh."""
+        return self.get_config(CONF_BATTERY_CAPACITY) or DEFAULT_BATTERY_CAPACITY
+
+    @property
+    def charge_target(self) -> int:
+        """Get battery level used for the time-to-target estimate."""
+        return self.get_config(CONF_CHARGE_TARGET) or DEFAULT_CHARGE_TARGET
+
+    @property
+    def trip_history(self) -> int:
+        """Get number of finished trips kept per vehicle."""
+        return self.get_config(CONF_TRIP_HISTORY) or DEFAULT_TRIP_HISTORY
+
+    @property
+    def tracker_min_distance(self) -> float:
+        """Get distance in meters the vehicle must move before the tracker updates."""
+        value = self.get_config(CONF_TRACKER_DISTANCE)
+        return DEFAULT_TRACKER_DISTANCE if value is None else value
+
+    @property
+    def refresh_cooldown(self) -> float:
+        """Get minimum seconds between forced refreshes of a vehicle."""
+        value = self.get_config(CONF_REFRESH_COOLDOWN)
+        return DEFAULT_REFRESH_COOLDOWN if value is None else value
+
+    @property
+    def max_response_size(self) -> int:
+        """Get largest response body in bytes that is decoded."""
+        return self.get_config(CONF_MAX_RESPONSE_SIZE) or DEFAULT_MAX_RESPONSE_SIZE
+
+    @property
+    def refresh_deadline(self) -> float:
+        """Get seconds all requests of one vehicle refresh may take together."""
+        return self.get_config(CONF_REFRESH_DEADLINE) or DEFAULT_REFRESH_DEADLINE
+
+    def timeout(self, endpoint: str) -> ClientTimeout:
+        """Get the timeout of a request, bounded by the current refresh deadline."""
+        timeouts = {
+            **DEFAULT_TIMEOUTS[endpoint_class(endpoint)],
+            **(self.get_config(CONF_TIMEOUTS) or {}).get(endpoint_class(endpoint), {}),
+        }
+        left = time_left()
+        return ClientTimeout(
+            total=REQUEST_TIMEOUT if left is None else min(left, REQUEST_TIMEOUT),
+            sock_connect=timeouts[CONF_CONNECT],
+            sock_read=timeouts[CONF_READ],
+        )
+
+    @property
+    def update_interval(self) -> datetime.timedelta:
+        """Get update interval."""
+        interval = self.get_config(CONF_SCAN_INTERVAL)
+        if isinstance(interval, (int, float)):
+            interval = datetime.timedelta(seconds=interval)
+        return interval or SCAN_INTERVAL
+
+    def api_url(self, api: str = '') -> str:
+        """Build API URL."""
+        if api[:6] == 'https:' or api[:5] == 'http:':
+            return api
+        bas = self.get_config(CONF_API_BASE) or DEFAULT_API_BASE
+        return f"{bas.rstrip('/')}/{api.lstrip('/')}"
+
+    async def request(
+        self, api: str, pms: dict[str, Any] | None = None, method: str = 'GET', **kwargs: Any
+    ) -> dict[str, Any]:
+        """Make API request.
+
+        Identical GET requests issued while one is in flight share its
+        response instead of hitting the portal again. The shared response
+        must be treated as read-only.
+        """
+        if method.upper() != 'GET' or kwargs:
+            return await self._request(api, pms, method, **kwargs)
+        key = (
+            self.api_url(api),
+            tuple(sorted((str(k), str(v)) for k, v in (pms or {}).items())),
+            self.token,
+        )
+        task = self._inflight.get(key)
+        if task is None:
+            task = self._inflight[key] = asyncio.ensure_future(self._request(api, pms, method))
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        else:
+            self.metrics.increment('requests_deduplicated', self.username)
+            _LOGGER.debug('Joining in-flight request to %s', key[0])
+        return await asyncio.shield(task)
+
+    async def _request(
+        self, api: str, pms: dict[str, Any] | None = None, method: str = 'GET', **kwargs: Any
+    ) -> dict[str, Any]:
+        """Send a request to the portal."""
+        method = method.upper()
+        url = self.api_url(api)
+        headers = {
+            'Authorization': f'Bearer {self.token}',
+            'Content-Type': 'application/json;charset=UTF-8',
+            'Accept': 'application/json, text/plain, */*',
+            'Accept-Encoding': ACCEPT_ENCODING,
+        }
+        endpoint = endpoint_name(url)
+        vin = endpoint_vin(url) or (pms or {}).get('vin')
+        if deadline_exceeded():
+            self.metrics.increment('deadline_exceeded', self.username, endpoint=endpoint, vin=vin)
+            _LOGGER.debug('Not sending %s request to %s, refresh deadline exceeded', method, url)
+            return {}
+        kws = {
+            'timeout': self.timeout(endpoint),
+            'headers': headers,
+        }
+        kws.update(kwargs)
+        if method in ['GET']:
+            kws['params'] = pms
+        elif method in ['POST_GET']:
+            method = 'POST'
+            kws['params'] = pms
+        else:
+            kws['json'] = pms
+        req = None
+
+        _LOGGER.debug('Making %s request to %s (verify_ssl=%s)', method, url, self.get_config(CONF_VERIFY_SSL, True))
+
+        conditional = method == 'GET' and endpoint in CONDITIONAL_ENDPOINTS
+        validated = None
+        if conditional:
+            cache_key = (url, tuple(sorted((str(k), str(v)) for k, v in (pms or {}).items())))
+            validated = self._validated.get(cache_key)
+            if validated is not None:
+                etag, last_modified, _ = validated
+                if etag:
+                    headers['If-None-Match'] = etag
+                if last_modified:
+                    headers['If-Modified-Since'] = last_modified
+        self.metrics.increment('requests', self.username, endpoint=endpoint, vin=vin)
+        limiter = self.fleet.limiter if self.fleet else contextlib.nullcontext()
+        try:
+            async with limiter:
+                req = await self.http.request(method, url, **kws)
+                _LOGGER.debug('Request to %s succeeded (status=%s)', url, req.status)
+                if req.status == 304 and validated is not None:
+                    req.release()
+                    self.metrics.increment('not_modified', self.username, endpoint=endpoint, vin=vin)
+                    self.transfer.async_add(0, 0)
+                    self._clear_ssl_error_issue()
+                    return validated[2]
+                body = await async_read_json(req, self.max_response_size)
+        except ResponseDecodeError as exc:
+            self.metrics.increment('responses_rejected', self.username, endpoint=endpoint, vin=vin)
+            _LOGGER.error(
+                'Discarded response from Mitsubishi API: method=%s, url=%s, status=%s, error=%s',
+                method,
+                url,
+                req.status if req else None,
+                exc,
+            )
+        except ClientSSLError as exc:
+            # SSL Certificate error - create repair issue
+            _LOGGER.error('SSL certificate error connecting to %s: %s', url, exc)
+            self._create_ssl_error_issue(url, str(exc))
+            raise UpdateFailed(f"SSL certificate error: {exc}") from exc
+        except ClientConnectorError as exc:
+            # Mask sensitive data in logs
+            safe_pms = {**pms} if pms else {}
+            if 'password' in safe_pms:
+                safe_pms['password'] = '***'
+            if 'refresh_token' in safe_pms:
+                safe_pms['refresh_token'] = safe_pms['refresh_token'][:10] + '...'
+
+            _LOGGER.error(
+                'Connection error to Mitsubishi API: method=%s, url=%s, error=%s',
+                method,
+                url,
+                type(exc).__name__,
+            )
+            _LOGGER.debug('Request params (safe): %s', safe_pms)
+
+            # Check if it's a certificate error
+            if 'CERTIFICATE' in str(exc).upper() or 'SSL' in str(exc).upper():
+                self._create_ssl_error_issue(url, str(exc))
+
+            if req:
+                _LOGGER.debug('Response status: %s', req.status)
+
+        except (ContentTypeError, TimeoutError) as exc:
+            _LOGGER.error(
+                'Request to Mitsubishi API failed: method=%s, url=%s, error=%s',
+                method,
+                url,
+                type(exc).__name__,
+            )
+        else:
+            for name, amount in (('bytes_transferred', body.transferred), ('bytes_received', body.size)):
+                self.metrics.increment(name, self.username, amount, endpoint, vin)
+            self.transfer.async_add(body.transferred, body.size)
+            self._clear_ssl_error_issue()
+            rsp = body.data or {}
+            if self.tracer.sampled(endpoint, vin):
+                self.tracer.trace(method, endpoint, vin, req.status, rsp)
+            if conditional:
+                etag = req.headers.get('ETag')
+                last_modified = req.headers.get('Last-Modified')
+                if req.status == 200 and rsp and (etag or last_modified):
+                    self._validated[cache_key] = (etag, last_modified, rsp)
+                else:
+                    self._validated.pop(cache_key, None)
+            return rsp
+
+        return {}
+
+    def _create_ssl_error_issue(self, url: str, error: str) -> None:
+        """Raise the repair issue for SSL certificate errors, once per entry."""
+        if not self.entry:
+            return
+        if not async_get_ssl_issues(self.hass, self.entry.entry_id).async_failure(url, error):
+            self.metrics.increment('ssl_errors_suppressed', self.username)
+
+    def _clear_ssl_error_issue(self) -> None:
+        """Clear the repair issue once the portal answers again."""
+        if self.entry:
+            async_get_ssl_issues(self.hass, self.entry.entry_id).async_success()
+
+    def _save_config(self) -> bool:
+        """Persist the account config to the config entry."""
+        if not self.entry:
+            return False
+        if self.index is None:
+            data = {**self.entry.data, "account": self._config.copy()}
+        else:
+            accounts = list(self.entry.data.get(CONF_ACCOUNTS, []))
+            accounts[self.index] = self._config.copy()
+            data = {**self.entry.data, CONF_ACCOUNTS: accounts}
+        self.hass.config_entries.async_update_entry(self.entry, data=data)
+        return True
+
+    def _share_tokens(self) -> None:
+        """Offer our tokens to other accounts of the user if they are the newest."""
+        if self.token and self.token_time > self.shared_tokens.token_time:
+            self.shared_tokens.publish(self.password, {key: self._config.get(key) for key in TOKEN_KEYS})
+
+    def _adopt_tokens(self) -> bool:
+        """Take over the tokens another account of the user obtained."""
+        self._config.update(self.shared_tokens.tokens)
+        self.metrics.increment('tokens_adopted', self.username)
+        _LOGGER.debug('Using the tokens of %s obtained by another instance', self.username)
+        self._save_config()
+        return True
+
+    async def async_login(self) -> bool:
+        """Log in to Mitsubishi Owner Portal.
+
+        Accounts of the same user log in one at a time. One that waited while
+        another logged in with the same password, or whose token was replaced
+        meanwhile, takes over the new tokens instead of logging in again.
+        """
+        stale = self.token
+        async with self.shared_tokens.lock:
+            if self.shared_tokens.usable(self.password) and self.shared_tokens.tokens.get(CONF_TOKEN) != stale:
+                return self._adopt_tokens()
+            return await self._async_login()
+
+    async def _async_login(self) -> bool:
+        """Log in to the portal; the caller holds the shared token lock."""
+        pms = {
+            'grant_type': 'password',
+            'username': self.username,
+            'password': self.password,
+        }
+        rsp = await self.request(f'auth/v1/token', pms, 'POST')
+        account_dn = rsp.get('accountDN')
+        access_token = rsp.get('access_token')
+        if not account_dn:
+            _LOGGER.error('Mitsubishi owner portal login %s failed: %s', self.username, rsp)
+            return False
+
+        # Update in-memory config
+        current_time = time.time()
+        self._config.update({
+            CONF_TOKEN: access_token,
+            CONF_TOKEN_TIME: current_time,
+            CONF_REFRESH_TOKEN: rsp.get('refresh_token'),
+            CONF_REFRESH_TOKEN_TIME: current_time,
+            CONF_USER_ID: account_dn,
+        })
+        self._share_tokens()
+
+        # Persist to config entry
+        if self._save_config():
+            _LOGGER.info("Login successful, credentials saved to config entry")
+        else:
+            _LOGGER.info("Login successful (no config entry to save)")
+
+        return True
+
+    async def async_check_token(self) -> None:
+        """Check and refresh token if needed."""
+        if self.shared_tokens.usable(self.password) and self.shared_tokens.token_time > self.token_time:
+            self._adopt_tokens()
+        current_time = time.time()
+        token_age = current_time - self.token_time if self.token_time else 0
+        refresh_token_age = current_time - self.refresh_token_time if self.refresh_token_time else 0
+
+        _LOGGER.debug(
+            "Token check: token_age=%ds, refresh_age=%ds, uid=%s",
+            int(token_age),
+            int(refresh_token_age),
+            self.uid or "None",
+        )
+
+        if None in [self.uid, self.token, self.token_time, self.refresh_token, self.refresh_token_time]:
+            _LOGGER.info("Missing credentials, performing login")
+            await self.async_login()
+        elif refresh_token_age > REFRESH_TOKEN_LIFETIME:
+            _LOGGER.info("Refresh token expired (age: %d days), performing re-login", int(refresh_token_age / 86400))
+            await self.async_login()
+        elif token_age > 1500:  # 25 minutes
+            _LOGGER.debug("Access token expired (age: %d minutes), refreshing", int(token_age / 60))
+            await self.async_refresh_token()
+
+    async def async_refresh_token(self) -> bool:
+        """Refresh access token, unless another account of the user just did."""
+        stale = self.token_time
+        async with self.shared_tokens.lock:
+            if self.shared_tokens.usable(self.password) and self.shared_tokens.token_time > stale:
+                return self._adopt_tokens()
+            return await self._async_refresh_token()
+
+    async def _async_refresh_token(self) -> bool:
+        """Refresh the access token; the caller holds the shared token lock."""
+        pms = {
+            'grant_type': 'refresh_token',
+            'refresh_token': self.refresh_token,
+        }
+        rsp = await self.request(f'auth/v1/token', pms, 'POST')
+        access_token = rsp.get('access_token')
+        if not access_token:
+            _LOGGER.warning('Mitsubishi owner portal refresh token failed: %s', rsp)
+            return await self._async_login()
+
+        # Update in-memory config
+        self._config.update({
+            CONF_TOKEN: access_token,
+            CONF_TOKEN_TIME: time.time(),
+            CONF_REFRESH_TOKEN: rsp.get('refresh_token'),
+        })
+        self._share_tokens()
+
+        # Persist to config entry
+        if self._save_config():
+            _LOGGER.debug("Access token refreshed and saved to config entry")
+
+        return True
+
+    async def async_get_vehicles(self) -> list[dict[str, Any]]:
+        """Get list of vehicles."""
+        await self.async_check_token()
+        api = f'user/v1/users/{self.uid}/vehicles'
+        rsp = await self.request(api)
+        msg = rsp.get('message', '')
+        if msg == 'Unauthorized':
+            if await self.async_login():
+                api = f'user/v1/users/{self.uid}/vehicles'
+                rsp = await self.request(api)
+        vhs = rsp.get('vehicles', [])
+        if not vhs:
+            _LOGGER.warning('Got vehicles for %s failed: %s', self.username, rsp)
+        return vhs
@@ -0,0 +1,139 @@
+"""Fleet totals per owner portal account, maintained incrementally."""
+from __future__ import annotations
+
+import heapq
+from collections import Counter
+from collections.abc import Callable
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+from homeassistant.core import callback
+
+from .states import CHARGING, PLUGGED_IN
+
+if TYPE_CHECKING:
+    from .coordinator import VehiclesCoordinator
+
+
+def _number(value: Any) -> float | None:
+    """Return a numeric value, None when missing."""
+    return value if isinstance(value, (int, float)) and not isinstance(value, bool) else None
+
+
+class Contribution(NamedTuple):
+    """What one vehicle adds to the totals of its account."""
+
+    battery: float | None
+    charging: bool
+    plugged: bool
+    electric_range: float | None
+    odometer: float | None
+
+    @classmethod
+    def from_data(cls, data: dict[str, Any]) -> Contribution:
+        """Extract the contribution of a coordinator snapshot."""
+        return cls(
+            _number(data.get("Battery")),
+            CHARGING(data.get("Charging_Status")) is True,
+            PLUGGED_IN(data.get("Charging_Plug_Status")) is True,
+            _number(data.get("Cruising_Range_Electric")),
+            _number(data.get("Odometer")),
+        )
+
+
+class FleetAggregate:
+    """Totals over the vehicles of one account.
+
+    Each coordinator update replaces the vehicle's previous contribution,
+    subtracting it and adding the new one, so an update costs the same no
+    matter how many vehicles the account has. The minimum electric range
+    is kept in a heap whose outdated entries are dropped lazily.
+    """
+
+    def __init__(self) -> None:
+        """Initialize empty totals."""
+        self._contributions: dict[str, Contribution] = {}
+        self._battery_sum = 0.0
+        self._battery_count = 0
+        self._odometer_sum = 0.0
+        self.charging = 0
+        self.plugged_in = 0
+        self._ranges: list[float] = []
+        self._range_counts: Counter[float] = Counter()
+        self._listeners: list[Callable[[], None]] = []
+
+    @property
+    def vehicles(self) -> int:
+        """Return the number of vehicles with data."""
+        return len(self._contributions)
+
+    @property
+    def average_battery(self) -> float | None:
+        """Return the average battery level."""
+        if not self._battery_count:
+            return None
+        return round(self._battery_sum / self._battery_count, 1)
+
+    @property
+    def min_electric_range(self) -> float | None:
+        """Return the lowest electric range."""
+        while self._ranges and self._ranges[0] not in self._range_counts:
+            heapq.heappop(self._ranges)
+        return self._ranges[0] if self._ranges else None
+
+    @property
+    def total_odometer(self) -> float | None:
+        """Return the summed odometer."""
+        return round(self._odometer_sum, 1) if self._contributions else None
+
+    def _apply(self, contribution: Contribution, sign: int) -> None:
+        """Add (sign 1) or subtract (sign -1) a contribution."""
+        if contribution.battery is not None:
+            self._battery_sum += sign * contribution.battery
+            self._battery_count += sign
+        if contribution.odometer is not None:
+            self._odometer_sum += sign * contribution.odometer
+        self.charging += sign * contribution.charging
+        self.plugged_in += sign * contribution.plugged
+        value = contribution.electric_range
+        if value is None:
+            return
+        if sign > 0:
+            if value not in self._range_counts:
+                heapq.heappush(self._ranges, value)
+            self._range_counts[value] += 1
+            return
+        self._range_counts[value] -= 1
+        if not self._range_counts[value]:
+            del self._range_counts[value]
+            if len(self._ranges) > 2 * len(self._range_counts) + 8:
+                # Too many outdated entries, rebuild from the live values
+                self._ranges = list(self._range_counts)
+                heapq.heapify(self._ranges)
+
+    @callback
+    def async_update(self, vin: str, data: dict[str, Any] | None) -> None:
+        """Replace the contribution of a vehicle and notify listeners if totals changed."""
+        contribution = Contribution.from_data(data) if data else None
+        previous = self._contributions.get(vin)
+        if contribution == previous:
+            return
+        if previous is not None:
+            self._apply(previous, -1)
+            del self._contributions[vin]
+        if contribution is not None:
+            self._apply(contribution, 1)
+            self._contributions[vin] = contribution
+        for listener in self._listeners:
+            listener()
+
+    @callback
+    def async_add_listener(self, listener: Callable[[], None]) -> Callable[[], None]:
+        """Call ``listener`` whenever the totals change."""
+        self._listeners.append(listener)
+        return lambda: self._listeners.remove(listener)
+
+    @callback
+    def async_track(self, coordinator: VehiclesCoordinator) -> Callable[[], None]:
+        """Fold in every update of a coordinator, starting with its current data."""
+        self.async_update(coordinator.vin, coordinator.data)
+        return coordinator.async_add_listener(lambda: self.async_update(coordinator.vin, coordinator.data))
@@ -0,0 +1,107 @@
+"""Support for binary sensor."""
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+
+from homeassistant.components.binary_sensor import (
+    BinarySensorDeviceClass,
+    BinarySensorEntity,
+    BinarySensorEntityDescription,
+)
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import callback
+
+from .const import DOMAIN
+from .coordinator import VehiclesCoordinator
+from .entity import MitsubishiOwnerPortalEntity, Vehicle
+from .states import CHARGING, DOOR_OPEN, IGNITION_ON, PLUGGED_IN, THEFT_ALARM, StateMap
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True, kw_only=True)
+class MitsubishiOwnerPortalBinarySensorEntityDescription(BinarySensorEntityDescription):
+    """Binary sensor derived from an enum value of the coordinator data."""
+
+    states: StateMap
+
+
+# Keys are coordinator data keys
+VEHICLE_BINARY_SENSORS: tuple[MitsubishiOwnerPortalBinarySensorEntityDescription, ...] = (
+    MitsubishiOwnerPortalBinarySensorEntityDescription(
+        key="Charging_Status",
+        translation_key="charging",
+        device_class=BinarySensorDeviceClass.BATTERY_CHARGING,
+        states=CHARGING,
+    ),
+    MitsubishiOwnerPortalBinarySensorEntityDescription(
+        key="Charging_Plug_Status",
+        translation_key="plugged_in",
+        device_class=BinarySensorDeviceClass.PLUG,
+        states=PLUGGED_IN,
+    ),
+    MitsubishiOwnerPortalBinarySensorEntityDescription(
+        key="Ignition_State",
+        translation_key="ignition_on",
+        device_class=BinarySensorDeviceClass.RUNNING,
+        icon="mdi:key",
+        states=IGNITION_ON,
+    ),
+    MitsubishiOwnerPortalBinarySensorEntityDescription(
+        key="Door_Status",
+        translation_key="door_open",
+        device_class=BinarySensorDeviceClass.DOOR,
+        states=DOOR_OPEN,
+    ),
+    MitsubishiOwnerPortalBinarySensorEntityDescription(
+        key="Theft_Alarm",
+        translation_key="theft_alarm_active",
+        device_class=BinarySensorDeviceClass.SAFETY,
+        icon="mdi:shield-car",
+        states=THEFT_ALARM,
+    ),
+)
+
+
+async def async_setup_entry(hass, config_entry: ConfigEntry, async_add_entities):
+    entry_data = hass.data[DOMAIN][config_entry.entry_id]
+    async_add_entities([
+        MitsubishiOwnerPortalBinarySensorEntity(v["vh"], v["coordinator"], desc)
+        for v in entry_data.get("vhs", [])
+        for desc in VEHICLE_BINARY_SENSORS
+    ])
+
+
+class MitsubishiOwnerPortalBinarySensorEntity(MitsubishiOwnerPortalEntity, BinarySensorEntity):
+    """On/off view of a portal enum value, written only when it flips."""
+
+    _attr_has_entity_name = True
+    entity_description: MitsubishiOwnerPortalBinarySensorEntityDescription
+
+    def __init__(
+            self,
+            vehicle: Vehicle,
+            coordinator: VehiclesCoordinator,
+            description: MitsubishiOwnerPortalBinarySensorEntityDescription,
+    ) -> None:
+        """Initialize the binary sensor."""
+        super().__init__(vehicle, coordinator)
+        self.entity_description = description
+        self._attr_unique_id = f"{vehicle.vin}_{description.translation_key}"
+        self._attr_is_on = self._current()
+        self._written = (self.available, self._attr_is_on)
+
+    def _current(self) -> bool | None:
+        """Look up the coordinator value in the compiled state map."""
+        data = self.coordinator.data or {}
+        return self.entity_description.states(data.get(self.entity_description.key))
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write state only when the value or availability changed."""
+        self._attr_is_on = self._current()
+        written = (self.available, self._attr_is_on)
+        if written != self._written:
+            self._written = written
+            self.async_write_ha_state()
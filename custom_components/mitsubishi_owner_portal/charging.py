@@ -0,0 +1,113 @@
+"""Incremental charging session estimates for Mitsubishi Owner Portal."""
+from __future__ import annotations
+
+import datetime
+from typing import Any
+
+DEFAULT_BATTERY_CAPACITY = 20.0
+DEFAULT_CHARGE_TARGET = 100
+
+# Weight of the newest sample in the exponential moving averages
+RATE_SMOOTHING = 0.3
+ETA_SMOOTHING = 0.5
+
+# Portal estimate is preferred when ours deviates from it by more than this ratio
+ETA_CROSS_CHECK_RATIO = 0.5
+
+
+class ChargingSessionTracker:
+    """Charging rate, energy added and time-to-target for one vehicle.
+
+    Every poll is folded in with O(1) work from the previous sample only, so
+    no history has to be scanned. A session starts whenever the charging or
+    plug status changes.
+    """
+
+    def __init__(
+        self,
+        capacity_kwh: float = DEFAULT_BATTERY_CAPACITY,
+        target: float = DEFAULT_CHARGE_TARGET,
+    ) -> None:
+        """Initialize the tracker."""
+        self.capacity_kwh = capacity_kwh
+        self.target = target
+        self._session: tuple[Any, Any] | None = None
+        self._start_battery: float | None = None
+        self._last_battery: float | None = None
+        self._last_ts: float | None = None
+        self._rate: float | None = None
+        self._eta: float | None = None
+
+    def reset(self, session: tuple[Any, Any] | None, battery: float | None, ts: float | None) -> None:
+        """Start a new session at the given sample."""
+        self._session = session
+        self._start_battery = battery
+        self._last_battery = battery
+        self._last_ts = ts
+        self._rate = None
+        self._eta = None
+
+    def update(self, data: dict[str, Any]) -> dict[str, Any]:
+        """Fold a coordinator snapshot in and return the derived values."""
+        battery = data.get("Battery")
+        event_ts = data.get("Event_Timestamp")
+        ts = event_ts.timestamp() if isinstance(event_ts, datetime.datetime) else None
+        session = (data.get("Charging_Status"), data.get("Charging_Plug_Status"))
+
+        if session != self._session or self._last_battery is None:
+            self.reset(session, battery, ts)
+        elif battery is not None and ts is not None and self._last_ts is not None and ts > self._last_ts:
+            rate = (battery - self._last_battery) * 3600 / (ts - self._last_ts)
+            if self._rate is None:
+                self._rate = rate
+            else:
+                self._rate += RATE_SMOOTHING * (rate - self._rate)
+            self._last_battery = battery
+            self._last_ts = ts
+            self._update_eta(battery, data.get("Time_To_Full_Charge"))
+
+        return {
+            "Charging_Rate": self.rate,
+            "Charging_Energy_Added": self.energy_added,
+            "Charging_Time_To_Target": self.time_to_target,
+        }
+
+    def _update_eta(self, battery: float, portal_minutes: float | None) -> None:
+        """Update the smoothed time-to-target estimate."""
+        rate = self.rate
+        if battery >= self.target:
+            self._eta = 0
+            return
+        if not rate:
+            self._eta = None
+            return
+        eta = (self.target - battery) / rate * 60
+        # Cross-check against the portal when it estimates the same target
+        if self.target >= 100 and portal_minutes:
+            if abs(eta - portal_minutes) > portal_minutes * ETA_CROSS_CHECK_RATIO:
+                eta = portal_minutes
+        if self._eta is None:
+            self._eta = eta
+        else:
+            self._eta += ETA_SMOOTHING * (eta - self._eta)
+
+    @property
+    def rate(self) -> float | None:
+        """Return the smoothed charging rate in %/h."""
+        if self._rate is None:
+            return None
+        return round(max(self._rate, 0), 1)
+
+    @property
+    def energy_added(self) -> float | None:
+        """Return the estimated energy added this session in kWh."""
+        if self._start_battery is None or self._last_battery is None:
+            return None
+        return round(max(self._last_battery - self._start_battery, 0) * self.capacity_kwh / 100, 2)
+
+    @property
+    def time_to_target(self) -> int | None:
+        """Return the smoothed time to reach the target level in minutes."""
+        if self._eta is None:
+            return None
+        return round(self._eta)
@@ -1,10 +1,33 @@
 import voluptuous as vol
 from homeassistant import config_entries
 from homeassistant.data_entry_flow import FlowResult
-from homeassistant.const import CONF_PASSWORD, CONF_USERNAME
-
-from . import MitsubishiOwnerPortalAccount, CONF_USER_ID, CONF_VERIFY_SSL
-from .const import DOMAIN
+from homeassistant.const import CONF_PASSWORD, CONF_SCAN_INTERVAL, CONF_USERNAME
+
+from . import async_apply_options, async_handoff_account
+from .account import MitsubishiOwnerPortalAccount
+from .charging import DEFAULT_BATTERY_CAPACITY, DEFAULT_CHARGE_TARGET
+from .const import (
+    CONF_ACCOUNTS,
+    CONF_BATTERY_CAPACITY,
+    CONF_CHARGE_TARGET,
+    CONF_HISTORY_SIZE,
+    CONF_REFRESH_COOLDOWN,
+    CONF_TRACKER_DISTANCE,
+    CONF_VERIFY_SSL,
+    DEFAULT_REFRESH_COOLDOWN,
+    DEFAULT_TRACKER_DISTANCE,
+    DOMAIN,
+    SCAN_INTERVAL,
+    TOKEN_KEYS,
+)
+from .history import DEFAULT_HISTORY_SIZE
+
+FLEET_UNIQUE_ID = 'fleet'
+
+
+def _account_data(config: dict, account: MitsubishiOwnerPortalAccount) -> dict:
+    """Return entry account data with the tokens of a logged-in account."""
+    return config | {key: account.get_config(key) for key in TOKEN_KEYS}
 
 
 class FlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
@@ -22,7 +45,8 @@ class FlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
             login_valid = await account.async_login()
             if login_valid:
                 vhs = await account.async_get_vehicles()
-                acc = user_input | {CONF_USER_ID: account.uid}
+                acc = _account_data(user_input, account)
+                async_handoff_account(self.hass, account)
                 return self.async_create_entry(
                     title=user_input.get(CONF_USERNAME),
                     data={"account": acc, "vehicles": vhs}
@@ -41,9 +65,31 @@ class FlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
             errors=errors
         )
 
+    async def async_step_import(self, import_data) -> FlowResult:
+        """Create or update the multi-account entry from YAML."""
+        await self.async_set_unique_id(FLEET_UNIQUE_ID)
+        existing = {
+            acc.get(CONF_USERNAME): acc
+            for entry in self._async_current_entries(include_ignore=False)
+            if entry.unique_id == FLEET_UNIQUE_ID
+            for acc in entry.data.get(CONF_ACCOUNTS, [])
+        }
+        accounts = []
+        for acc in import_data[CONF_ACCOUNTS]:
+            # Keep the tokens of accounts whose credentials did not change
+            old = existing.get(acc.get(CONF_USERNAME), {})
+            if old.get(CONF_PASSWORD) == acc.get(CONF_PASSWORD):
+                acc = {**{key: old[key] for key in TOKEN_KEYS if key in old}, **acc}
+            accounts.append(acc)
+        data = {**import_data, CONF_ACCOUNTS: accounts}
+        self._abort_if_unique_id_configured(updates=data)
+        return self.async_create_entry(title=f"Mitsubishi fleet ({len(accounts)} accounts)", data=data)
+
     async def async_step_reconfigure(self, user_input=None) -> FlowResult:
         """Handle reconfiguration of the integration."""
         entry = self.hass.config_entries.async_get_entry(self.context["entry_id"])
+        if CONF_ACCOUNTS in entry.data:
+            return self.async_abort(reason="fleet_managed_in_yaml")
 
         if user_input is not None:
             errors = {}
@@ -52,7 +98,8 @@ class FlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
 
             if login_valid:
                 vhs = await account.async_get_vehicles()
-                acc = user_input | {CONF_USER_ID: account.uid}
+                acc = _account_data(user_input, account)
+                async_handoff_account(self.hass, account)
                 return self.async_update_reload_and_abort(
                     entry,
                     data={"account": acc, "vehicles": vhs},
@@ -101,42 +148,39 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
     async def async_step_init(self, user_input=None) -> FlowResult:
         """Manage the options."""
         errors = {}
+        if CONF_ACCOUNTS in self.config_entry.data:
+            return self.async_abort(reason="fleet_managed_in_yaml")
 
         if user_input is not None:
+            current_account = self.config_entry.data.get("account", {})
+            new_account = current_account | {
+                key: value for key, value in user_input.items() if key != CONF_PASSWORD
+            }
+            vhs = self.config_entry.data.get("vehicles")
             # If password is provided, validate credentials
             if user_input.get(CONF_PASSWORD):
-                current_account = self.config_entry.data.get("account", {})
-                test_account = {
-                    CONF_USERNAME: current_account.get(CONF_USERNAME),
-                    CONF_PASSWORD: user_input[CONF_PASSWORD],
-                    CONF_VERIFY_SSL: user_input.get(CONF_VERIFY_SSL, True),
-                }
-                account = MitsubishiOwnerPortalAccount(self.hass, test_account)
+                new_account[CONF_PASSWORD] = user_input[CONF_PASSWORD]
+                # Without stored tokens, so the shared ones are used when the password is unchanged
+                account = MitsubishiOwnerPortalAccount(
+                    self.hass, {key: value for key, value in new_account.items() if key not in TOKEN_KEYS}
+                )
                 login_valid = await account.async_login()
-
                 if login_valid:
-                    # Update the config entry data with new password
                     vhs = await account.async_get_vehicles()
-                    acc = test_account | {CONF_USER_ID: account.uid}
-                    self.hass.config_entries.async_update_entry(
-                        self.config_entry,
-                        data={"account": acc, "vehicles": vhs}
-                    )
-                    # Reload the integration to apply new settings
-                    await self.hass.config_entries.async_reload(self.config_entry.entry_id)
-                    return self.async_create_entry(title="", data={})
+                    new_account = _account_data(new_account, account)
                 else:
                     errors["base"] = "auth_error"
-            else:
-                # Just update verify_ssl without password change
-                current_account = self.config_entry.data.get("account", {})
-                current_account[CONF_VERIFY_SSL] = user_input.get(CONF_VERIFY_SSL, True)
+                # The running entry keeps its own session
+                await account.http.close()
+
+            if not errors:
                 self.hass.config_entries.async_update_entry(
                     self.config_entry,
-                    data={"account": current_account, "vehicles": self.config_entry.data.get("vehicles")}
+                    data={"account": new_account, "vehicles": vhs}
                 )
-                # Reload the integration to apply new SSL settings
-                await self.hass.config_entries.async_reload(self.config_entry.entry_id)
+                # Apply the new settings in place, reloading only when that is not possible
+                if not await async_apply_options(self.hass, self.config_entry):
+                    await self.hass.config_entries.async_reload(self.config_entry.entry_id)
                 return self.async_create_entry(title="", data={})
 
         current_account = self.config_entry.data.get("account", {})
@@ -145,6 +189,30 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
             data_schema=vol.Schema({
                 vol.Optional(CONF_PASSWORD, description={"suggested_value": ""}): str,
                 vol.Optional(CONF_VERIFY_SSL, default=current_account.get(CONF_VERIFY_SSL, True)): bool,
+                vol.Optional(
+                    CONF_SCAN_INTERVAL,
+                    default=current_account.get(CONF_SCAN_INTERVAL, SCAN_INTERVAL.total_seconds()),
+                ): vol.All(vol.Coerce(int), vol.Range(min=30, max=86400)),
+                vol.Optional(
+                    CONF_HISTORY_SIZE,
+                    default=current_account.get(CONF_HISTORY_SIZE, DEFAULT_HISTORY_SIZE),
+                ): vol.All(vol.Coerce(int), vol.Range(min=10, max=100000)),
+                vol.Optional(
+                    CONF_BATTERY_CAPACITY,
+                    default=current_account.get(CONF_BATTERY_CAPACITY, DEFAULT_BATTERY_CAPACITY),
+                ): vol.All(vol.Coerce(float), vol.Range(min=1, max=200)),
+                vol.Optional(
+                    CONF_CHARGE_TARGET,
+                    default=current_account.get(CONF_CHARGE_TARGET, DEFAULT_CHARGE_TARGET),
+                ): vol.All(vol.Coerce(int), vol.Range(min=1, max=100)),
+                vol.Optional(
+                    CONF_TRACKER_DISTANCE,
+                    default=current_account.get(CONF_TRACKER_DISTANCE, DEFAULT_TRACKER_DISTANCE),
+                ): vol.All(vol.Coerce(float), vol.Range(min=0, max=10000)),
+                vol.Optional(
+                    CONF_REFRESH_COOLDOWN,
+                    default=current_account.get(CONF_REFRESH_COOLDOWN, DEFAULT_REFRESH_COOLDOWN),
+                ): vol.All(vol.Coerce(float), vol.Range(min=0, max=86400)),
             }),
             description_placeholders={
                 "username": current_account.get(CONF_USERNAME),
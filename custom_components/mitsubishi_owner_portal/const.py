@@ -1 +1,72 @@
+"""Constants for the Mitsubishi Owner Portal integration."""
+import datetime
+
+from homeassistant.const import CONF_TOKEN
+
 DOMAIN = 'mitsubishi_owner_portal'
+
+SCAN_INTERVAL = datetime.timedelta(minutes=1)
+
+CONF_ACCOUNTS = 'accounts'
+CONF_API_BASE = 'api_base'
+CONF_USER_ID = 'uid'
+CONF_REFRESH_TOKEN = 'refresh_token'
+CONF_TOKEN_TIME = 'token_time'
+CONF_REFRESH_TOKEN_TIME = 'refresh_token_time'
+CONF_VERIFY_SSL = 'verify_ssl'
+CONF_HISTORY_SIZE = 'history_size'
+CONF_BATTERY_CAPACITY = 'battery_capacity'
+CONF_CHARGE_TARGET = 'charge_target'
+CONF_TRIP_HISTORY = 'trip_history'
+CONF_TRACKER_DISTANCE = 'tracker_min_distance'
+CONF_MAX_CONCURRENT = 'max_concurrent_requests'
+CONF_MAX_RESPONSE_SIZE = 'max_response_size'
+CONF_REFRESH_DEADLINE = 'refresh_deadline'
+CONF_TIMEOUTS = 'timeouts'
+CONF_CONNECT = 'connect'
+CONF_READ = 'read'
+CONF_TRACE = 'trace'
+CONF_SAMPLE = 'sample'
+CONF_VINS = 'vins'
+CONF_ENDPOINTS = 'endpoints'
+CONF_CAPTURE = 'capture'
+CONF_REQUEST_INTERVAL = 'request_interval'
+CONF_REFRESH_COOLDOWN = 'refresh_cooldown'
+
+ATTR_VIN = 'vin'
+ATTR_FORCE_REMOTE = 'force_remote'
+ATTR_FIELD = 'field'
+ATTR_HOURS = 'hours'
+
+SERVICE_REFRESH = 'refresh'
+SERVICE_GET_HISTORY = 'get_history'
+
+DATA_HANDOFF = f'{DOMAIN}_handoff'
+DATA_RELOAD = f'{DOMAIN}_reload'
+HANDOFF_TIMEOUT = 300
+# Seconds the state of an unloaded entry waits for a setup to take it over
+RELOAD_TIMEOUT = 60
+# Account keys holding the login state, carried over when options change
+TOKEN_KEYS = (CONF_USER_ID, CONF_TOKEN, CONF_TOKEN_TIME, CONF_REFRESH_TOKEN, CONF_REFRESH_TOKEN_TIME)
+SESSION_CLOSE_DELAY = 30
+
+DEFAULT_API_BASE = 'https://connect.mitsubishi-motors.co.jp/'
+DEFAULT_TRACKER_DISTANCE = 50
+DEFAULT_REFRESH_COOLDOWN = 60
+DEFAULT_REFRESH_DEADLINE = 45
+
+# Total seconds for a request made outside of a refresh cycle
+REQUEST_TIMEOUT = 30
+# Connect and read timeouts in seconds per endpoint class
+DEFAULT_TIMEOUTS = {
+    'auth': {CONF_CONNECT: 10, CONF_READ: 20},
+    'data': {CONF_CONNECT: 10, CONF_READ: 30},
+    'remote': {CONF_CONNECT: 10, CONF_READ: 30},
+}
+
+SUPPORTED_DOMAINS = [
+    'sensor',
+    'binary_sensor',
+    'device_tracker',
+]
+
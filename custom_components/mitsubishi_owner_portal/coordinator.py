@@ -0,0 +1,263 @@
+"""Vehicle data update coordinator for Mitsubishi Owner Portal."""
+from __future__ import annotations
+
+import asyncio
+import datetime
+import logging
+import time
+from typing import Any
+
+from homeassistant.core import callback
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
+
+from .account import MitsubishiOwnerPortalAccount
+from .charging import ChargingSessionTracker
+from .const import DOMAIN
+from .deadline import deadline_exceeded, refresh_deadline
+from .fleet import AdaptiveInterval
+from .history import HistoryStore, VehicleHistory
+from .odometer import OdometerStatisticsImporter
+from .remote import RemoteOperationQueue
+from .tracing import WarningLimiter
+from .trips import TripDetector, TripStore
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class VehiclesCoordinator(DataUpdateCoordinator[dict[str, Any]]):
+    """Vehicle data update coordinator."""
+
+    # Declared here as well, Home Assistant does not ship type information
+    data: dict[str, Any]
+    last_update_success: bool
+
+    def __init__(
+        self,
+        vin: str,
+        account: MitsubishiOwnerPortalAccount,
+        history: HistoryStore | None = None,
+        trips: TripStore | None = None,
+        odometer: OdometerStatisticsImporter | None = None,
+        scheduled: bool = True,
+        *,
+        remote: RemoteOperationQueue,
+    ) -> None:
+        """Initialize the coordinator.
+
+        ``scheduled=False`` disables self-scheduling, for vehicles refreshed
+        by a FleetScheduler. Remote operations go through ``remote``, the
+        queue of the entry.
+        """
+        super().__init__(
+            account.hass,
+            _LOGGER,
+            name=f'{DOMAIN}-{account.uid}-{vin}',
+            update_interval=account.update_interval if scheduled else None,
+        )
+        self.account = account
+        self.vin = vin
+        self._subs = {}
+        self.history_store = history
+        self.trip_store = trips
+        self.odometer_import = odometer
+        self.remote_queue = remote
+        self.warnings = WarningLimiter(_LOGGER)
+        self.odometer_samples: list[Any] = []
+        # Last parsed vehiclestate, reused while the portal answers 304
+        self._parsed_state: dict[str, Any] | None = None
+        self._parsed: dict[str, Any] = {}
+        self._forced_refresh: asyncio.Task[None] | None = None
+        self._last_forced_refresh = 0.0
+        self._refresh_running: asyncio.Task[dict[str, Any]] | None = None
+        self.adaptive = AdaptiveInterval(account.update_interval)
+        self.charging = ChargingSessionTracker(account.battery_capacity, account.charge_target)
+
+    @callback
+    def async_apply_options(self) -> None:
+        """Pick up changed account options without refetching."""
+        self.charging.capacity_kwh = self.account.battery_capacity
+        self.charging.target = self.account.charge_target
+        if self.update_interval is None or self.adaptive.base == self.account.update_interval:
+            return
+        self.adaptive = AdaptiveInterval(self.account.update_interval)
+        self._set_interval(self.adaptive.interval)
+
+    @callback
+    def async_restore(self, previous: VehiclesCoordinator) -> None:
+        """Continue from the coordinator this one replaces when its entry reloads."""
+        self.data = previous.data
+        self.last_update_success = previous.last_update_success
+        self.odometer_samples = previous.odometer_samples
+        self._parsed_state = previous._parsed_state
+        self._parsed = previous._parsed
+        self.warnings = previous.warnings
+        self.charging = previous.charging
+        self.charging.capacity_kwh = self.account.battery_capacity
+        self.charging.target = self.account.charge_target
+
+    @callback
+    def _set_interval(self, interval: datetime.timedelta) -> None:
+        """Change the update interval and reschedule the next refresh."""
+        self.update_interval = interval
+        if self._listeners:
+            self._unschedule_refresh()
+            self._schedule_refresh()
+
+    @property
+    def history(self) -> VehicleHistory | None:
+        """Return the telemetry history of this vehicle."""
+        if self.history_store is None:
+            return None
+        return self.history_store.get(self.vin)
+
+    @property
+    def trips(self) -> TripDetector | None:
+        """Return the trip detector of this vehicle."""
+        if self.trip_store is None:
+            return None
+        return self.trip_store.get(self.vin)
+
+    async def async_forced_refresh(self, remote: bool = False) -> bool:
+        """Refresh now on request of the refresh service.
+
+        Concurrent requests share the refresh already in flight, and requests
+        within the cooldown after the last one are dropped. Returns whether
+        this call started a refresh.
+        """
+        if self._forced_refresh is not None:
+            self.account.metrics.increment('refresh_coalesced', self.account.username)
+            await asyncio.shield(self._forced_refresh)
+            return False
+        if time.monotonic() - self._last_forced_refresh < self.account.refresh_cooldown:
+            self.account.metrics.increment('refresh_cooldown', self.account.username)
+            _LOGGER.debug('Refresh of %s skipped, cooldown active', self.vin)
+            return False
+
+        self._last_forced_refresh = time.monotonic()
+        self._forced_refresh = self.hass.async_create_task(self._async_forced_refresh(remote))
+        try:
+            await asyncio.shield(self._forced_refresh)
+        finally:
+            self._forced_refresh = None
+        return True
+
+    async def _async_forced_refresh(self, remote: bool) -> None:
+        """Optionally wake the vehicle, then refresh."""
+        if remote and not await self.async_remote_operation():
+            _LOGGER.warning('Remote status update of %s failed, refreshing cached state', self.vin)
+        await self.async_refresh()
+
+    @callback
+    def _record_duration(self, seconds: float) -> None:
+        """Back the update interval off while refreshes are slow."""
+        if not self.adaptive.record(seconds):
+            return
+        raised = self.adaptive.interval > self.adaptive.base
+        self.account.metrics.increment(
+            'interval_raised' if raised else 'interval_restored', self.account.username, vin=self.vin
+        )
+        _LOGGER.info('Refresh of %s took %.1f s, updating every %s', self.vin, seconds, self.adaptive.interval)
+        self._set_interval(self.adaptive.interval)
+
+    async def _async_update_data(self) -> dict[str, Any]:
+        """Fetch data, or share the fetch already running for this vehicle.
+
+        A refresh starting while another one is still fetching waits for
+        that fetch and takes its result instead of calling the portal again.
+        While fetches stay slow the update interval backs off.
+        """
+        if self._refresh_running is not None:
+            self.account.metrics.increment('refresh_merged', self.account.username, vin=self.vin)
+            return await asyncio.shield(self._refresh_running)
+
+        started = time.monotonic()
+        self._refresh_running = self.hass.async_create_task(self._async_fetch())
+        try:
+            return await asyncio.shield(self._refresh_running)
+        finally:
+            self._refresh_running = None
+            if self.update_interval is not None:
+                self._record_duration(time.monotonic() - started)
+
+    async def _async_fetch(self) -> dict[str, Any]:
+        """Fetch data from API endpoint.
+
+        All requests of one refresh, including token checks and retries,
+        share the account's refresh deadline.
+        """
+        with refresh_deadline(self.account.refresh_deadline):
+            data = await self.update_vehicle_detail()
+        if data:
+            data.update(self.charging.update(data))
+        if self.history_store is not None:
+            self.history_store.async_record(self.vin, data)
+        if self.trip_store is not None and data:
+            self.trip_store.async_record(self.vin, data)
+            last_trip = self.trip_store.get(self.vin).last_trip
+            data["Last_Trip_Distance"] = last_trip.distance if last_trip else None
+        if self.odometer_import is not None:
+            self.odometer_import.async_schedule(self.vin, self.odometer_samples)
+        return data
+
+    async def update_vehicle_detail(self) -> dict[str, Any]:
+        """Update vehicle detail."""
+        # if not await self.async_remote_operation():
+        #     return {}
+        await self.account.async_check_token()
+        api = f'avi/v1/vehicles/{self.vin}/vehiclestate'
+        try:
+            rsp = await self.account.request(api)
+        except (TypeError, ValueError) as exc:
+            rsp = {}
+            _LOGGER.error('Got vehicle detail for %s failed: %s', self.vin, exc)
+
+        if not rsp.get('state', {}):
+            if deadline_exceeded():
+                return self._stale_data()
+            self.warnings.warning(
+                'no_state', 'Got vehicle detail for %s failed. Response keys: %s', self.vin,
+                list(rsp.keys()) if isinstance(rsp, dict) else rsp,
+            )
+            if await self.account.async_login():
+                try:
+                    rsp = await self.account.request(api)
+                except (TypeError, ValueError):
+                    rsp = {}
+
+        # Parse vehiclestate API response structure
+        state = rsp.get('state', {})
+        if not state:
+            if deadline_exceeded():
+                return self._stale_data()
+            _LOGGER.error('Invalid API response: missing state. Response keys: %s', list(rsp.keys()) if isinstance(rsp, dict) else type(rsp))
+            return {}
+
+        if state is not self._parsed_state:
+            # Loaded on the first refresh rather than at integration import
+            from .parser import parse_vehicle_state
+
+            odo_list = state.get('odo', [])
+            self.odometer_samples = odo_list if isinstance(odo_list, list) else []
+            self._parsed = parse_vehicle_state(state)
+            self._parsed_state = state
+            if self._parsed and self._parsed["Cruising_Range_Electric"] is None:
+                # Expected on every poll of some vehicles, so only said now and then
+                self.warnings.warning(
+                    'no_electric_range', 'Electric range of %s is None. cruisingRangeSecond structure: %s',
+                    self.vin, state.get('chargingControl', {}).get('cruisingRangeSecond'),
+                )
+        return dict(self._parsed)
+
+    def _stale_data(self) -> dict[str, Any]:
+        """Return the last parsed state when a refresh ran out of time."""
+        self.account.metrics.increment('refresh_deadline_exceeded', self.account.username, vin=self.vin)
+        _LOGGER.warning(
+            'Refresh of %s did not finish within %s s, keeping the last known state',
+            self.vin,
+            self.account.refresh_deadline,
+        )
+        return dict(self._parsed)
+
+    async def async_remote_operation(self) -> bool:
+        """Ask the vehicle to upload a fresh status and wait for it."""
+        return await self.remote_queue.async_submit(self)
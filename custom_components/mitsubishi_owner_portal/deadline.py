@@ -0,0 +1,42 @@
+"""Time budget shared by all requests of one refresh cycle."""
+from __future__ import annotations
+
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from .const import DOMAIN
+
+_deadline: ContextVar[float | None] = ContextVar(f'{DOMAIN}_deadline', default=None)
+
+
+@contextmanager
+def refresh_deadline(seconds: float | None) -> Iterator[None]:
+    """Limit the requests made inside the block to ``seconds`` in total.
+
+    The deadline follows the context into tasks started inside the block;
+    nested deadlines can only shorten it.
+    """
+    if not seconds:
+        yield
+        return
+    deadline = time.monotonic() + seconds
+    current = _deadline.get()
+    token = _deadline.set(deadline if current is None else min(current, deadline))
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def time_left() -> float | None:
+    """Return the seconds left in the current deadline, None without one."""
+    deadline = _deadline.get()
+    return None if deadline is None else deadline - time.monotonic()
+
+
+def deadline_exceeded() -> bool:
+    """Return whether the current deadline has passed."""
+    left = time_left()
+    return left is not None and left <= 0
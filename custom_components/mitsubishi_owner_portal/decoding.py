@@ -0,0 +1,149 @@
+"""Size-limited decoding of portal responses."""
+from __future__ import annotations
+
+import zlib
+from collections.abc import Callable
+from typing import Any, NamedTuple
+
+from aiohttp import ClientResponse
+from homeassistant.util.json import json_loads
+from yarl import URL
+
+try:
+    import brotli
+    # Older releases cannot bound the output of one call, so they could not keep a body within its limit
+    if not hasattr(brotli.Decompressor, 'can_accept_more_data'):  # pragma: no cover
+        brotli = None
+except ImportError:  # pragma: no cover
+    brotli = None
+
+DEFAULT_MAX_RESPONSE_SIZE = 2 * 1024 * 1024
+CHUNK_SIZE = 16 * 1024
+ACCEPT_ENCODING = 'gzip, deflate, br' if brotli else 'gzip, deflate'
+
+# Path segments followed by a user, vehicle or event id
+ID_SEGMENTS = ('users', 'vehicles', 'events')
+JSON_START = b'{['
+WHITESPACE = b' \t\r\n'
+
+
+class ResponseDecodeError(ValueError):
+    """A response body that cannot be used."""
+
+
+class ResponseTooLarge(ResponseDecodeError):
+    """A response body larger than allowed."""
+
+
+class ResponseNotJson(ResponseDecodeError):
+    """A response body that is not JSON."""
+
+
+class DecodedBody(NamedTuple):
+    """A decoded response body with its size on the wire and decompressed."""
+
+    data: Any
+    transferred: int
+    size: int
+
+
+def endpoint_name(url: str) -> str:
+    """Return the path of a portal URL with ids masked, for per-endpoint metrics."""
+    segments = URL(url).path.strip('/').split('/')
+    for idx in range(1, len(segments)):
+        if segments[idx - 1] in ID_SEGMENTS:
+            segments[idx] = '*'
+    return '/'.join(segments)
+
+
+def endpoint_class(endpoint: str) -> str:
+    """Return the timeout class of an endpoint name."""
+    if endpoint.startswith('auth/'):
+        return 'auth'
+    if 'remoteOperation' in endpoint:
+        return 'remote'
+    return 'data'
+
+
+def endpoint_vin(url: str) -> str | None:
+    """Return the VIN in the path of a portal URL, if any."""
+    segments = URL(url).path.strip('/').split('/')
+    for idx in range(1, len(segments)):
+        if segments[idx - 1] == 'vehicles':
+            return segments[idx]
+    return None
+
+
+def _decompressor(encoding: str) -> Callable[[bytes, int], bytes] | None:
+    """Return a function inflating chunks of a body, up to a given length."""
+    encoding = encoding.strip().lower()
+    if encoding in ('', 'identity'):
+        return None
+    if encoding in ('gzip', 'x-gzip', 'deflate'):
+        # Accept both gzip and zlib headers
+        inflater = zlib.decompressobj(wbits=zlib.MAX_WBITS | 32)
+
+        def _inflate(chunk: bytes, limit: int) -> bytes:
+            data = inflater.decompress(chunk, limit)
+            if inflater.unconsumed_tail:
+                raise ResponseTooLarge(f'Body inflates to more than {limit} bytes')
+            return data
+
+        return _inflate
+    if encoding == 'br' and brotli is not None:
+        decompressor = brotli.Decompressor()
+
+        def _unbrotli(chunk: bytes, limit: int) -> bytes:
+            data = decompressor.process(chunk, output_buffer_limit=limit)
+            if not decompressor.can_accept_more_data():
+                # Output beyond the limit is still pending
+                raise ResponseTooLarge(f'Body inflates to more than {limit} bytes')
+            return data
+
+        return _unbrotli
+    raise ResponseNotJson(f'Unsupported content encoding {encoding}')
+
+
+async def async_read_json(response: ClientResponse, max_size: int = DEFAULT_MAX_RESPONSE_SIZE) -> DecodedBody:
+    """Read and decode a JSON body.
+
+    The body is read in chunks, inflated if the session left it compressed,
+    and the connection is dropped as soon as it is known to be too large or
+    not JSON, so large error pages are never buffered. An empty body decodes
+    to None.
+    """
+    transferred = 0
+    try:
+        if response.content_length is not None and response.content_length > max_size:
+            raise ResponseTooLarge(f'{response.content_length} bytes announced, limit is {max_size}')
+        if 'html' in response.content_type or 'xml' in response.content_type:
+            raise ResponseNotJson(f'Content type is {response.content_type}')
+        inflate = _decompressor(response.headers.get('Content-Encoding', ''))
+
+        body = bytearray()
+        checked = False
+        async for chunk in response.content.iter_chunked(CHUNK_SIZE):
+            transferred += len(chunk)
+            if inflate is not None:
+                try:
+                    chunk = inflate(chunk, max_size - len(body) + 1)
+                except (zlib.error, getattr(brotli, 'error', zlib.error)) as exc:
+                    raise ResponseNotJson(f'Corrupt compressed body: {exc}') from exc
+            body += chunk
+            if len(body) > max_size:
+                raise ResponseTooLarge(f'More than {max_size} bytes received')
+            if not checked:
+                start = body.lstrip(WHITESPACE)[:1]
+                if start and start not in JSON_START:
+                    raise ResponseNotJson(f'Body starts with {bytes(start)!r}')
+                checked = bool(start)
+    except ResponseDecodeError:
+        response.close()
+        raise
+
+    if not checked:
+        return DecodedBody(None, transferred, len(body))
+    try:
+        return DecodedBody(json_loads(body), transferred, len(body))
+    except ValueError as exc:
+        raise ResponseNotJson(str(exc)) from exc
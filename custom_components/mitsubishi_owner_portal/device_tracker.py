@@ -0,0 +1,207 @@
+"""Support for device tracker."""
+from __future__ import annotations
+
+import datetime
+import logging
+import math
+from typing import Any, NamedTuple
+
+from homeassistant.components.device_tracker import SourceType, TrackerEntity
+from homeassistant.components.zone import ENTITY_ID_HOME
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import (
+    ATTR_LATITUDE,
+    ATTR_LONGITUDE,
+    STATE_HOME,
+    STATE_NOT_HOME,
+    STATE_UNAVAILABLE,
+)
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.event import TrackStates, async_track_state_change_filtered
+from homeassistant.util.location import distance
+
+from .const import DOMAIN
+from .coordinator import VehiclesCoordinator
+from .entity import MitsubishiOwnerPortalEntity, Vehicle
+
+_LOGGER = logging.getLogger(__name__)
+
+ZONE_DOMAIN = 'zone'
+
+# Metres per degree of latitude
+METERS_PER_DEGREE = 111320.0
+
+
+class ZoneBox(NamedTuple):
+    """Bounding box and circle of an active zone."""
+
+    min_lat: float
+    max_lat: float
+    min_lon: float
+    max_lon: float
+    entity_id: str
+    name: str
+    latitude: float
+    longitude: float
+    radius: float
+
+
+class ZoneIndex:
+    """Precomputed bounding boxes of the active zones.
+
+    The boxes are rebuilt only when a zone state changes, so a location
+    update tests a handful of floats per zone and computes exact distances
+    only for zones whose box contains the point.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the index."""
+        self.hass = hass
+        self.boxes: list[ZoneBox] = []
+        self._unsub = None
+
+    @callback
+    def async_start(self) -> None:
+        """Build the index and follow zone changes."""
+        self.async_rebuild()
+        self._unsub = async_track_state_change_filtered(
+            self.hass, TrackStates(False, set(), {ZONE_DOMAIN}), self._async_zone_changed
+        ).async_remove
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop following zone changes."""
+        if self._unsub:
+            self._unsub()
+            self._unsub = None
+
+    @callback
+    def _async_zone_changed(self, event: Any) -> None:
+        """Rebuild the index when a zone is added, changed or removed."""
+        self.async_rebuild()
+
+    @callback
+    def async_rebuild(self) -> None:
+        """Recompute the bounding boxes from the zone states."""
+        boxes = []
+        for zone in self.hass.states.async_all(ZONE_DOMAIN):
+            attrs = zone.attributes
+            if zone.state == STATE_UNAVAILABLE or attrs.get('passive'):
+                continue
+            try:
+                lat = float(attrs[ATTR_LATITUDE])
+                lon = float(attrs[ATTR_LONGITUDE])
+                radius = float(attrs.get('radius', 0))
+            except (KeyError, TypeError, ValueError):
+                continue
+            dlat = radius / METERS_PER_DEGREE
+            dlon = radius / (METERS_PER_DEGREE * max(math.cos(math.radians(lat)), 1e-6))
+            boxes.append(ZoneBox(
+                lat - dlat, lat + dlat, lon - dlon, lon + dlon,
+                zone.entity_id, zone.name, lat, lon, radius,
+            ))
+        self.boxes = boxes
+
+    def active_zone(self, lat: float, lon: float) -> ZoneBox | None:
+        """Return the closest zone containing a point, preferring smaller zones on ties."""
+        closest = None
+        min_dist = math.inf
+        for box in self.boxes:
+            if not (box.min_lat <= lat <= box.max_lat and box.min_lon <= lon <= box.max_lon):
+                continue
+            dist = distance(lat, lon, box.latitude, box.longitude)
+            if dist is None or dist - box.radius >= 0:
+                continue
+            if dist < min_dist or (dist == min_dist and closest and box.radius < closest.radius):
+                min_dist = dist
+                closest = box
+        return closest
+
+
+async def async_setup_entry(hass, config_entry: ConfigEntry, async_add_entities):
+    entry_data = hass.data[DOMAIN][config_entry.entry_id]
+    zones = ZoneIndex(hass)
+    zones.async_start()
+    config_entry.async_on_unload(zones.async_stop)
+    async_add_entities([
+        MitsubishiOwnerPortalTrackerEntity(
+            v["vh"], v["coordinator"], zones
+        )
+        for v in entry_data.get("vhs", [])
+    ])
+
+
+class MitsubishiOwnerPortalTrackerEntity(MitsubishiOwnerPortalEntity, TrackerEntity):
+    """ MitsubishiOwnerPortalTrackerEntity """
+
+    _attr_has_entity_name = True
+    _attr_translation_key = "location"
+
+    def __init__(
+            self,
+            vehicle: Vehicle,
+            coordinator: VehiclesCoordinator,
+            zones: ZoneIndex,
+    ) -> None:
+        """Initialize the tracker."""
+        super().__init__(vehicle, coordinator)
+        self._attr_unique_id = f"{vehicle.vin}_location"
+        self._zones = zones
+        self._latitude: float | None = None
+        self._longitude: float | None = None
+        self._location_ts: datetime.datetime | None = None
+        self._was_available = True
+        self._accept_location()
+
+    def _accept_location(self) -> bool:
+        """Take the coordinator location if it moved enough or is newer."""
+        data = self.coordinator.data or {}
+        lat = data.get("Location_Latitude")
+        lon = data.get("Location_Longitude")
+        if lat is None or lon is None:
+            return False
+        location_ts = data.get("Location_Timestamp")
+        if self._latitude is not None and self._longitude is not None:
+            advanced = location_ts is not None and (self._location_ts is None or location_ts > self._location_ts)
+            moved = distance(self._latitude, self._longitude, lat, lon)
+            if not advanced and (moved is None or moved < self.coordinator.account.tracker_min_distance):
+                return False
+        self._latitude = lat
+        self._longitude = lon
+        self._location_ts = location_ts
+        return True
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write state only when the vehicle moved or reported a newer fix."""
+        available = self.available
+        if self._accept_location() or available != self._was_available:
+            self._was_available = available
+            self.async_write_ha_state()
+
+    @property
+    def source_type(self) -> SourceType:
+        """Return the source type of the device."""
+        return SourceType.GPS
+
+    @property
+    def latitude(self) -> float | None:
+        """Return latitude value of the device."""
+        return self._latitude
+
+    @property
+    def longitude(self) -> float | None:
+        """Return longitude value of the device."""
+        return self._longitude
+
+    @property
+    def state(self) -> str | None:
+        """Return the zone of the device using the precomputed zone index."""
+        if self._latitude is None or self._longitude is None:
+            return None
+        zone = self._zones.active_zone(self._latitude, self._longitude)
+        if zone is None:
+            return STATE_NOT_HOME
+        if zone.entity_id == ENTITY_ID_HOME:
+            return STATE_HOME
+        return zone.name
@@ -0,0 +1,28 @@
+"""Diagnostics support for Mitsubishi Owner Portal."""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_PASSWORD, CONF_TOKEN, CONF_USERNAME
+from homeassistant.core import HomeAssistant
+
+from .const import CONF_REFRESH_TOKEN, CONF_USER_ID, DOMAIN
+from .tracing import mask_vin
+
+TO_REDACT = {CONF_PASSWORD, CONF_TOKEN, CONF_USERNAME, CONF_REFRESH_TOKEN, CONF_USER_ID, "vin"}
+
+
+async def async_get_config_entry_diagnostics(hass: HomeAssistant, entry: ConfigEntry) -> dict[str, Any]:
+    """Return request metrics and the payloads captured by the tracer of each account."""
+    entry_data = hass.data.get(DOMAIN, {}).get(entry.entry_id, {})
+    accounts = entry_data.get("accounts", [])
+    # Accounts of a fleet share their metrics; per account and VIN keys are personal
+    metrics = accounts[0].metrics.as_dict() if accounts else {}
+    return {
+        "entry": async_redact_data(dict(entry.data), TO_REDACT),
+        "metrics": {key: metrics.get(key, {}) for key in ("totals", "endpoints")},
+        "vehicles": [mask_vin(v["vh"].vin) for v in entry_data.get("vhs", [])],
+        "traces": [list(account.tracer.payloads) for account in accounts],
+    }
@@ -0,0 +1,85 @@
+"""Base entity for Mitsubishi Owner Portal."""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.helpers.device_registry import DeviceEntryType
+from homeassistant.helpers.entity import DeviceInfo, Entity
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+from .account import MitsubishiOwnerPortalAccount
+from .const import DOMAIN
+from .coordinator import VehiclesCoordinator
+
+
+class Vehicle:
+    """Vehicle data model."""
+
+    def __init__(self, dat: dict[str, Any]) -> None:
+        """Initialize vehicle."""
+        self.data: dict[str, Any] = dat
+
+    @property
+    def vin(self) -> str | None:
+        """Get VIN."""
+        return self.data.get('vin')
+
+    @property
+    def vehicle_model(self) -> str:
+        """Get vehicle model."""
+        return self.data.get('model', '')
+
+    @property
+    def vehicle_model_name(self) -> str:
+        """Get vehicle model name."""
+        return self.data.get('modelDescription', '')
+
+
+class MitsubishiOwnerPortalEntity(CoordinatorEntity[VehiclesCoordinator]):
+    """Base entity for Mitsubishi Owner Portal."""
+
+    def __init__(self, vehicle: Vehicle, coordinator: VehiclesCoordinator) -> None:
+        """Initialize the entity."""
+        super().__init__(coordinator)
+        self.vehicle = vehicle
+        # Don't set _attr_name in base class - let entity types handle their own naming
+        # Device name is set via device_info property
+        self._attr_unique_id = vehicle.vin
+
+    @property
+    def device_info(self) -> DeviceInfo:
+        """Return information about the device."""
+        # Generate unique device name by including last 4 digits of VIN
+        # This helps distinguish multiple vehicles of the same model
+        vin = str(self.vehicle.vin or "")
+        vin_suffix = vin[-4:] if len(vin) >= 4 else vin
+        device_name = f"{self.vehicle.vehicle_model_name} ({vin_suffix})" if vin_suffix else self.vehicle.vehicle_model_name
+
+        return DeviceInfo(
+            identifiers={(DOMAIN, str(self.vehicle.vin))},
+            manufacturer="Mitsubishi",
+            model=self.vehicle.vehicle_model,
+            name=device_name,
+        )
+
+
+class MitsubishiOwnerPortalAccountEntity(Entity):
+    """Base entity for values of a whole owner portal account."""
+
+    _attr_has_entity_name = True
+    _attr_should_poll = False
+
+    def __init__(self, account: MitsubishiOwnerPortalAccount) -> None:
+        """Initialize the entity."""
+        self.account = account
+
+    @property
+    def device_info(self) -> DeviceInfo:
+        """Return information about the account device."""
+        return DeviceInfo(
+            identifiers={(DOMAIN, f"account_{self.account.username}")},
+            manufacturer="Mitsubishi",
+            model="Owner Portal",
+            name=self.account.username,
+            entry_type=DeviceEntryType.SERVICE,
+        )
@@ -0,0 +1,246 @@
+"""Shared resources for managing many owner portal accounts in one entry."""
+from __future__ import annotations
+
+import asyncio
+import datetime
+import logging
+import time
+from collections import defaultdict
+from typing import TYPE_CHECKING, Any
+
+from aiohttp import ClientSession, DummyCookieJar
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import aiohttp_client
+from homeassistant.helpers.event import async_track_time_interval
+
+if TYPE_CHECKING:
+    from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_MAX_CONCURRENT = 4
+DEFAULT_REQUEST_INTERVAL = 0.2
+
+# A refresh taking more than this share of its interval counts as slow
+SLOW_RATIO = 0.5
+# Consecutive slow refreshes before the interval is raised
+SLOW_REFRESHES = 3
+# Consecutive fast refreshes before a raised interval is restored
+FAST_REFRESHES = 3
+# Raised interval as a multiple of the typical refresh duration
+STRETCH_FACTOR = 2
+# Upper bound of the raised interval as a multiple of the configured one
+MAX_STRETCH = 4
+
+
+class RequestMetrics:
+    """Counters kept in total, per account, per endpoint and per vehicle."""
+
+    def __init__(self) -> None:
+        """Initialize the counters."""
+        self.totals: dict[str, float] = defaultdict(float)
+        self.accounts: dict[str, dict[str, float]] = defaultdict(lambda: defaultdict(float))
+        self.endpoints: dict[str, dict[str, float]] = defaultdict(lambda: defaultdict(float))
+        self.vins: dict[str, dict[str, float]] = defaultdict(lambda: defaultdict(float))
+
+    def increment(
+        self,
+        name: str,
+        account: str | None = None,
+        amount: float = 1,
+        endpoint: str | None = None,
+        vin: str | None = None,
+    ) -> None:
+        """Add to a counter."""
+        self.totals[name] += amount
+        if account is not None:
+            self.accounts[account][name] += amount
+        if endpoint is not None:
+            self.endpoints[endpoint][name] += amount
+        if vin is not None:
+            self.vins[vin][name] += amount
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a snapshot of all counters."""
+        return {
+            "totals": dict(self.totals),
+            "accounts": {account: dict(counters) for account, counters in self.accounts.items()},
+            "endpoints": {endpoint: dict(counters) for endpoint, counters in self.endpoints.items()},
+            "vins": {vin: dict(counters) for vin, counters in self.vins.items()},
+        }
+
+
+class AdaptiveInterval:
+    """Refresh interval that backs off while refreshes are slow.
+
+    After SLOW_REFRESHES refreshes in a row that took more than SLOW_RATIO
+    of the configured interval, the interval grows to STRETCH_FACTOR times
+    the smoothed refresh duration, at most MAX_STRETCH times the configured
+    one. FAST_REFRESHES fast refreshes in a row restore the configured
+    interval, so a single quick refresh does not make it flap.
+    """
+
+    def __init__(self, base: datetime.timedelta) -> None:
+        """Initialize the interval."""
+        self.base = base
+        self.interval = base
+        self._slow = 0
+        self._fast = 0
+        self._duration: float | None = None
+
+    def record(self, seconds: float) -> bool:
+        """Fold in the duration of a refresh, returning whether the interval changed."""
+        base = self.base.total_seconds()
+        self._duration = seconds if self._duration is None else 0.7 * self._duration + 0.3 * seconds
+        slow = seconds > base * SLOW_RATIO
+        self._slow = self._slow + 1 if slow else 0
+        self._fast = 0 if slow else self._fast + 1
+        if self._slow >= SLOW_REFRESHES:
+            interval = datetime.timedelta(
+                seconds=min(max(base, self._duration * STRETCH_FACTOR), base * MAX_STRETCH)
+            )
+        elif self._fast >= FAST_REFRESHES:
+            interval = self.base
+        else:
+            return False
+        changed = interval != self.interval
+        self.interval = interval
+        return changed
+
+
+class RateLimiter:
+    """Cap concurrent requests and space out their start times."""
+
+    def __init__(
+        self,
+        max_concurrent: int = DEFAULT_MAX_CONCURRENT,
+        min_interval: float = DEFAULT_REQUEST_INTERVAL,
+        metrics: RequestMetrics | None = None,
+    ) -> None:
+        """Initialize the limiter."""
+        self._semaphore = asyncio.Semaphore(max(max_concurrent, 1))
+        self._min_interval = min_interval
+        self._next_start = 0.0
+        self._metrics = metrics
+
+    async def __aenter__(self) -> None:
+        """Wait for a free slot and the next start time."""
+        await self._semaphore.acquire()
+        now = time.monotonic()
+        wait = self._next_start - now
+        self._next_start = max(now, self._next_start) + self._min_interval
+        if wait > 0:
+            if self._metrics is not None:
+                self._metrics.increment('rate_limit_wait', amount=wait)
+            await asyncio.sleep(wait)
+
+    async def __aexit__(self, *exc: Any) -> None:
+        """Release the slot."""
+        self._semaphore.release()
+
+
+class FleetContext:
+    """Connection pool, rate limiter and metrics shared by all accounts of an entry."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        max_concurrent: int = DEFAULT_MAX_CONCURRENT,
+        min_interval: float = DEFAULT_REQUEST_INTERVAL,
+    ) -> None:
+        """Initialize the context."""
+        self.hass = hass
+        self.metrics = RequestMetrics()
+        self.limiter = RateLimiter(max_concurrent, min_interval, self.metrics)
+        self._sessions: dict[bool, ClientSession] = {}
+
+    def session(self, verify_ssl: bool = True) -> ClientSession:
+        """Return the pooled session for an SSL verification mode.
+
+        The session keeps no cookies, so nothing one account receives is sent
+        on behalf of another; each account authenticates with its own token.
+        """
+        session = self._sessions.get(verify_ssl)
+        if session is None:
+            session = self._sessions[verify_ssl] = aiohttp_client.async_create_clientsession(
+                self.hass,
+                verify_ssl=verify_ssl,
+                auto_cleanup=False,
+                auto_decompress=False,
+                cookie_jar=DummyCookieJar(),
+            )
+        return session
+
+    async def async_close(self) -> None:
+        """Close the pooled sessions."""
+        for session in self._sessions.values():
+            await session.close()
+        self._sessions.clear()
+
+
+class FleetScheduler:
+    """Single timer that refreshes every vehicle coordinator of a fleet.
+
+    Coordinators are created without their own update interval; one tick
+    refreshes them all concurrently, bounded by the shared rate limiter. A
+    tick is skipped while the previous one is still running, and the tick
+    interval backs off while ticks are slow.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        interval: datetime.timedelta,
+        coordinators: list[DataUpdateCoordinator],
+        metrics: RequestMetrics | None = None,
+    ) -> None:
+        """Initialize the scheduler."""
+        self.hass = hass
+        self.adaptive = AdaptiveInterval(interval)
+        self.coordinators = coordinators
+        self.metrics = metrics
+        self._unsub = None
+        self._task: asyncio.Task[None] | None = None
+
+    @callback
+    def async_start(self) -> None:
+        """Start ticking."""
+        self._unsub = async_track_time_interval(
+            self.hass, self._async_tick, self.adaptive.interval, name="mitsubishi_owner_portal fleet"
+        )
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop ticking and cancel a running refresh."""
+        if self._unsub:
+            self._unsub()
+            self._unsub = None
+        if self._task and not self._task.done():
+            self._task.cancel()
+
+    @callback
+    def _async_tick(self, _now: datetime.datetime) -> None:
+        """Start a refresh of all coordinators unless one is running."""
+        if self._task and not self._task.done():
+            _LOGGER.debug('Fleet refresh still running, skipping tick')
+            if self.metrics is not None:
+                self.metrics.increment('ticks_skipped')
+            return
+        self._task = self.hass.async_create_background_task(
+            self.async_refresh_all(), "mitsubishi_owner_portal fleet refresh"
+        )
+
+    async def async_refresh_all(self) -> None:
+        """Refresh all coordinators concurrently."""
+        started = time.monotonic()
+        await asyncio.gather(*(coordinator.async_refresh() for coordinator in self.coordinators))
+        duration = time.monotonic() - started
+        if self.metrics is not None:
+            self.metrics.increment('ticks')
+            self.metrics.increment('tick_seconds', amount=duration)
+        if self.adaptive.record(duration) and self._unsub:
+            _LOGGER.info('Fleet refresh took %.1f s, ticking every %s', duration, self.adaptive.interval)
+            if self.metrics is not None:
+                self.metrics.increment('interval_changes')
+            self._unsub()
+            self.async_start()
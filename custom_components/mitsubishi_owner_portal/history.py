@@ -0,0 +1,266 @@
+"""In-memory telemetry history for Mitsubishi Owner Portal vehicles."""
+from __future__ import annotations
+
+import base64
+import datetime
+import logging
+import math
+import sys
+import time
+from array import array
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+SAVE_DELAY = 300
+
+DEFAULT_HISTORY_SIZE = 1440
+
+# Snapshot keys recorded for every sample, in storage order
+HISTORY_FIELDS: tuple[str, ...] = (
+    "Battery",
+    "Cruising_Range_Combined",
+    "Cruising_Range_Electric",
+    "Odometer",
+    "Temperature",
+    "Location_Latitude",
+    "Location_Longitude",
+)
+
+_NAN = float('nan')
+
+
+def _to_float(value: Any) -> float:
+    """Convert a snapshot value to float, NaN when missing."""
+    if value is None:
+        return _NAN
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return _NAN
+
+
+def _encode(arr: array) -> str:
+    """Pack a double array into little-endian base64."""
+    if sys.byteorder != 'little':
+        arr = array('d', arr)
+        arr.byteswap()
+    return base64.b64encode(arr.tobytes()).decode('ascii')
+
+
+def _decode(raw: str) -> array:
+    """Unpack a double array written by _encode."""
+    arr = array('d')
+    arr.frombytes(base64.b64decode(raw))
+    if sys.byteorder != 'little':
+        arr.byteswap()
+    return arr
+
+
+class VehicleHistory:
+    """Bounded ring buffer of timestamped vehicle samples.
+
+    Each field lives in its own ``array('d')``. The arrays grow with the
+    samples until they reach ``capacity``, so a vehicle only pays for what it
+    has recorded; from then on appends overwrite the oldest slot in O(1)
+    without allocating. Samples are kept in timestamp order; missing values
+    are stored as NaN and skipped by the aggregate queries.
+    """
+
+    def __init__(self, capacity: int = DEFAULT_HISTORY_SIZE) -> None:
+        """Initialize the buffer."""
+        self.capacity = max(int(capacity), 1)
+        self._ts = array('d')
+        self._cols = {field: array('d') for field in HISTORY_FIELDS}
+        self._start = 0
+        self._size = 0
+
+    def __len__(self) -> int:
+        """Return the number of stored samples."""
+        return self._size
+
+    def _pos(self, idx: int) -> int:
+        """Map a logical index (0 = oldest) to a slot in the arrays."""
+        return (self._start + idx) % self.capacity
+
+    @property
+    def last_timestamp(self) -> float | None:
+        """Return the timestamp of the newest sample."""
+        if not self._size:
+            return None
+        return self._ts[self._pos(self._size - 1)]
+
+    def append(self, ts: float, values: dict[str, Any]) -> bool:
+        """Append a sample, overwriting the oldest one when full.
+
+        Samples that are not newer than the last one are ignored, so polling
+        an unchanged vehicle does not fill the buffer with duplicates.
+        """
+        last = self.last_timestamp
+        if last is not None and ts <= last:
+            return False
+        if self._size < self.capacity:
+            # Still growing: nothing has wrapped, so the next slot is at the end
+            self._size += 1
+            self._ts.append(ts)
+            for field, col in self._cols.items():
+                col.append(_to_float(values.get(field)))
+            return True
+        pos = self._start
+        self._start = (self._start + 1) % self.capacity
+        self._ts[pos] = ts
+        for field, col in self._cols.items():
+            col[pos] = _to_float(values.get(field))
+        return True
+
+    def append_snapshot(self, data: dict[str, Any]) -> bool:
+        """Append a coordinator snapshot, keyed by its event timestamp."""
+        event_ts = data.get("Event_Timestamp")
+        if isinstance(event_ts, datetime.datetime):
+            ts = event_ts.timestamp()
+        else:
+            ts = time.time()
+        return self.append(ts, data)
+
+    def _first_index(self, since: float) -> int:
+        """Return the logical index of the first sample at or after ``since``."""
+        lo, hi = 0, self._size
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._ts[self._pos(mid)] < since:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def window(self, field: str, seconds: float | None = None, now: float | None = None) -> list[tuple[float, float]]:
+        """Return ``(timestamp, value)`` pairs of a field, oldest first.
+
+        When ``seconds`` is given only samples within that window before
+        ``now`` are returned. NaN values are skipped.
+        """
+        col = self._cols[field]
+        first = 0
+        if seconds is not None:
+            first = self._first_index((time.time() if now is None else now) - seconds)
+        rows = []
+        for idx in range(first, self._size):
+            pos = self._pos(idx)
+            value = col[pos]
+            if not math.isnan(value):
+                rows.append((self._ts[pos], value))
+        return rows
+
+    def latest(self, field: str) -> tuple[float, float] | None:
+        """Return the newest non-missing ``(timestamp, value)`` of a field."""
+        col = self._cols[field]
+        for idx in range(self._size - 1, -1, -1):
+            pos = self._pos(idx)
+            if not math.isnan(col[pos]):
+                return self._ts[pos], col[pos]
+        return None
+
+    def aggregate(self, field: str, seconds: float | None = None, now: float | None = None) -> dict[str, Any]:
+        """Return count, min, max, mean, first, last and delta over a window."""
+        rows = self.window(field, seconds, now)
+        if not rows:
+            return {"count": 0}
+        values = [value for _, value in rows]
+        return {
+            "count": len(values),
+            "min": min(values),
+            "max": max(values),
+            "mean": sum(values) / len(values),
+            "first": values[0],
+            "last": values[-1],
+            "delta": values[-1] - values[0],
+            "start": rows[0][0],
+            "end": rows[-1][0],
+        }
+
+    def as_dict(self) -> dict[str, Any]:
+        """Serialize the buffer compactly, oldest sample first."""
+        return {
+            "capacity": self.capacity,
+            "ts": _encode(self._ordered(self._ts)),
+            "fields": {field: _encode(self._ordered(col)) for field, col in self._cols.items()},
+        }
+
+    def _ordered(self, col: array) -> array:
+        """Return a column rotated to oldest first, by slicing rather than per sample."""
+        # Until the buffer is full nothing has wrapped and _start stays 0
+        return col[self._start:] + col[:self._start]
+
+    @classmethod
+    def from_dict(cls, raw: dict[str, Any], capacity: int | None = None) -> VehicleHistory:
+        """Restore a buffer written by as_dict, trimming to ``capacity``."""
+        history = cls(capacity or raw.get("capacity") or DEFAULT_HISTORY_SIZE)
+        ts = _decode(raw.get("ts", ""))
+        fields = {field: _decode(data) for field, data in (raw.get("fields") or {}).items()}
+        for idx in range(max(len(ts) - history.capacity, 0), len(ts)):
+            history.append(ts[idx], {
+                field: col[idx] for field, col in fields.items()
+                if field in history._cols and idx < len(col)
+            })
+        return history
+
+
+class HistoryStore:
+    """Per-entry collection of vehicle histories persisted to a Store."""
+
+    def __init__(self, hass: HomeAssistant, entry_id: str, capacity: int = DEFAULT_HISTORY_SIZE) -> None:
+        """Initialize the store."""
+        self.hass = hass
+        self.capacity = capacity
+        self._store: Store[dict[str, Any]] = Store(hass, STORAGE_VERSION, f"{DOMAIN}.history.{entry_id}")
+        self._histories: dict[str, VehicleHistory] = {}
+
+    async def async_load(self) -> None:
+        """Load persisted histories."""
+        raw = await self._store.async_load() or {}
+        for vin, data in raw.get("vehicles", {}).items():
+            try:
+                self._histories[vin] = VehicleHistory.from_dict(data, self.capacity)
+            except (TypeError, ValueError) as exc:
+                _LOGGER.warning('Discarding stored history for %s: %s', vin, exc)
+
+    def get(self, vin: str) -> VehicleHistory:
+        """Return the history of a vehicle, creating it if needed."""
+        history = self._histories.get(vin)
+        if history is None:
+            history = self._histories[vin] = VehicleHistory(self.capacity)
+        return history
+
+    @callback
+    def async_set_capacity(self, capacity: int) -> None:
+        """Resize every history in place, keeping the newest samples."""
+        if capacity == self.capacity:
+            return
+        self.capacity = capacity
+        for vin, history in self._histories.items():
+            self._histories[vin] = VehicleHistory.from_dict(history.as_dict(), capacity)
+        self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+    @callback
+    def async_record(self, vin: str, data: dict[str, Any]) -> None:
+        """Record a coordinator snapshot and schedule a save."""
+        if data and self.get(vin).append_snapshot(data):
+            self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+    def _data_to_save(self) -> dict[str, Any]:
+        """Return the data to persist."""
+        return {"vehicles": {vin: history.as_dict() for vin, history in self._histories.items()}}
+
+    async def async_save(self) -> None:
+        """Persist histories immediately."""
+        await self._store.async_save(self._data_to_save())
+
+    async def async_remove(self) -> None:
+        """Remove persisted histories."""
+        await self._store.async_remove()
@@ -0,0 +1,128 @@
+"""Repair issue for SSL certificate failures, raised once per entry."""
+from __future__ import annotations
+
+import logging
+import time
+
+from homeassistant.core import HomeAssistant, callback
+
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_SSL_ISSUES = f'{DOMAIN}_ssl_issues'
+# Minimum seconds between updates of the notification while the error persists
+NOTIFICATION_INTERVAL = 3600
+
+
+class SslIssueTracker:
+    """Error state of the SSL certificate checks of one config entry.
+
+    The first failure creates the repair issue and a persistent notification;
+    further failures are only counted, with the notification refreshed at
+    most every NOTIFICATION_INTERVAL. The next successful request removes
+    both, after which successes cost nothing until the next failure.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        """Initialize the tracker."""
+        self.hass = hass
+        self.entry_id = entry_id
+        # None until known, an issue may survive from before a restart
+        self.active: bool | None = None
+        self.suppressed = 0
+        self._notified = 0.0
+
+    @property
+    def issue_id(self) -> str:
+        """Return the id of the repair issue."""
+        return f"ssl_certificate_error_{self.entry_id}"
+
+    @property
+    def notification_id(self) -> str:
+        """Return the id of the persistent notification."""
+        return f"mitsubishi_ssl_error_{self.entry_id}"
+
+    @callback
+    def async_failure(self, url: str, error: str) -> bool:
+        """Record a certificate failure, returning whether the issue was raised or updated."""
+        now = time.monotonic()
+        if self.active and now - self._notified < NOTIFICATION_INTERVAL:
+            self.suppressed += 1
+            return False
+
+        from homeassistant.helpers import issue_registry as ir
+
+        if not self.active:
+            ir.async_create_issue(
+                self.hass,
+                DOMAIN,
+                self.issue_id,
+                is_fixable=False,
+                severity=ir.IssueSeverity.ERROR,
+                translation_key="ssl_certificate_error",
+                translation_placeholders={
+                    "url": url,
+                    "error": error,
+                },
+            )
+        self.active = True
+        self._notified = now
+        self._notify(url, error)
+        return True
+
+    def _notify(self, url: str, error: str) -> None:
+        """Create or replace the persistent notification."""
+        from homeassistant.components.persistent_notification import async_create
+
+        repeated = f"{self.suppressed} further failures were not reported separately.\n\n" if self.suppressed else ""
+        async_create(
+            self.hass,
+            f"SSL certificate error when connecting to Mitsubishi Owner Portal.\n\n"
+            f"URL: {url}\n"
+            f"Error: {error}\n\n"
+            f"{repeated}"
+            f"This usually means:\n"
+            f"1. The server's SSL certificate has expired\n"
+            f"2. Your system's CA certificates need updating\n"
+            f"3. There's a network issue\n\n"
+            f"Please check the [repair issues](/config/repairs) for more details.",
+            title="Mitsubishi Owner Portal SSL Error",
+            notification_id=self.notification_id,
+        )
+
+    @callback
+    def async_success(self) -> None:
+        """Clear the issue after a successful request."""
+        if self.active is False:
+            return
+
+        from homeassistant.components.persistent_notification import async_dismiss
+        from homeassistant.helpers import issue_registry as ir
+
+        if self.active:
+            _LOGGER.info(
+                'SSL connections to the portal work again, %s further failures were not reported',
+                self.suppressed,
+            )
+        ir.async_delete_issue(self.hass, DOMAIN, self.issue_id)
+        async_dismiss(self.hass, self.notification_id)
+        self.active = False
+        self.suppressed = 0
+
+
+@callback
+def async_get_ssl_issues(hass: HomeAssistant, entry_id: str) -> SslIssueTracker:
+    """Return the tracker of an entry, kept across reloads."""
+    trackers: dict[str, SslIssueTracker] = hass.data.setdefault(DATA_SSL_ISSUES, {})
+    tracker = trackers.get(entry_id)
+    if tracker is None:
+        tracker = trackers[entry_id] = SslIssueTracker(hass, entry_id)
+    return tracker
+
+
+@callback
+def async_remove_ssl_issues(hass: HomeAssistant, entry_id: str) -> None:
+    """Clear the issue of a removed entry and forget its tracker."""
+    async_get_ssl_issues(hass, entry_id).async_success()
+    hass.data[DATA_SSL_ISSUES].pop(entry_id)
@@ -0,0 +1,150 @@
+"""Long-term statistics import of the portal odometer history."""
+from __future__ import annotations
+
+import asyncio
+import datetime
+import logging
+from typing import Any
+
+from homeassistant.const import UnitOfLength
+from homeassistant.core import HomeAssistant, callback
+
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+IMPORT_BATCH_SIZE = 500
+
+ODO_TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+def statistic_id(vin: str) -> str:
+    """Return the external statistic id of a vehicle odometer."""
+    return f"{DOMAIN}:odometer_{vin.lower()}"
+
+
+def parse_odometer_samples(odo_list: list[Any], after: float | None = None) -> list[tuple[float, float]]:
+    """Parse the portal ``odo`` array into sorted ``(timestamp, km)`` pairs.
+
+    Entries look like ``{"2024-01-01 12:00:00": "12345"}``. Samples at or
+    before ``after`` and malformed entries are skipped.
+    """
+    samples = []
+    for entry in odo_list:
+        if not isinstance(entry, dict):
+            continue
+        for ts_key, odo_value in entry.items():
+            try:
+                ts = datetime.datetime.strptime(ts_key, ODO_TIME_FORMAT).replace(
+                    tzinfo=datetime.timezone.utc
+                ).timestamp()
+                value = float(odo_value)
+            except (ValueError, TypeError):
+                continue
+            if after is None or ts > after:
+                samples.append((ts, value))
+    samples.sort()
+    return samples
+
+
+def hourly_rows(samples: list[tuple[float, float]]) -> list[dict[str, Any]]:
+    """Fold samples into hour-aligned statistic rows holding the last reading."""
+    hours: dict[float, float] = {}
+    for ts, value in samples:
+        hours[ts - ts % 3600] = value
+    return [
+        {
+            "start": datetime.datetime.fromtimestamp(start, datetime.timezone.utc),
+            "state": value,
+            "sum": value,
+        }
+        for start, value in sorted(hours.items())
+    ]
+
+
+class OdometerStatisticsImporter:
+    """Import odometer samples into long-term statistics in the background.
+
+    Polls only hand over the raw ``odo`` array; parsing, de-duplication against
+    the last imported sample and the recorder writes happen in a background
+    task, at most one per vehicle at a time.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the importer."""
+        self.hass = hass
+        self._last_imported: dict[str, float | None] = {}
+        self._pending: dict[str, list[Any]] = {}
+        self._tasks: dict[str, asyncio.Task[None]] = {}
+
+    @callback
+    def async_schedule(self, vin: str, odo_list: list[Any], name: str | None = None) -> None:
+        """Queue the latest odometer array of a vehicle for import."""
+        if not odo_list or 'recorder' not in self.hass.config.components:
+            return
+        self._pending[vin] = odo_list
+        if vin in self._tasks:
+            return
+        self._tasks[vin] = self.hass.async_create_background_task(
+            self._async_import(vin, name),
+            f"{DOMAIN} odometer statistics import {vin}",
+        )
+
+    async def _async_import(self, vin: str, name: str | None) -> None:
+        """Import pending samples of a vehicle."""
+        try:
+            while (odo_list := self._pending.pop(vin, None)) is not None:
+                await self._async_import_samples(vin, odo_list, name)
+        except Exception:  # pylint: disable=broad-except
+            _LOGGER.exception('Importing odometer statistics for %s failed', vin)
+        finally:
+            self._tasks.pop(vin, None)
+
+    async def _async_import_samples(self, vin: str, odo_list: list[Any], name: str | None) -> None:
+        """Parse an odometer array and add the new samples to statistics."""
+        from homeassistant.components.recorder.statistics import async_add_external_statistics
+
+        stat_id = statistic_id(vin)
+        if vin not in self._last_imported:
+            self._last_imported[vin] = await self._async_get_last_imported(stat_id)
+        samples = parse_odometer_samples(odo_list, self._last_imported[vin])
+        if not samples:
+            return
+
+        metadata = {
+            "has_mean": False,
+            "has_sum": True,
+            "name": name or f"Odometer {vin}",
+            "source": DOMAIN,
+            "statistic_id": stat_id,
+            "unit_of_measurement": UnitOfLength.KILOMETERS,
+        }
+        rows = hourly_rows(samples)
+        for idx in range(0, len(rows), IMPORT_BATCH_SIZE):
+            async_add_external_statistics(self.hass, metadata, rows[idx:idx + IMPORT_BATCH_SIZE])
+            await asyncio.sleep(0)
+        self._last_imported[vin] = samples[-1][0]
+        _LOGGER.debug('Imported %d odometer samples (%d hours) for %s', len(samples), len(rows), vin)
+
+    async def _async_get_last_imported(self, stat_id: str) -> float | None:
+        """Return the start of the last imported statistics hour."""
+        from homeassistant.components.recorder import get_instance
+        from homeassistant.components.recorder.statistics import get_last_statistics
+
+        last = await get_instance(self.hass).async_add_executor_job(
+            get_last_statistics, self.hass, 1, stat_id, False, {"state"}
+        )
+        rows = last.get(stat_id)
+        if not rows:
+            return None
+        start = rows[0]["start"]
+        if isinstance(start, datetime.datetime):
+            start = start.timestamp()
+        return start
+
+    async def async_shutdown(self) -> None:
+        """Cancel running imports."""
+        self._pending.clear()
+        for task in list(self._tasks.values()):
+            task.cancel()
+        self._tasks.clear()
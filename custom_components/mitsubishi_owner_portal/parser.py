@@ -0,0 +1,183 @@
+"""Parsing of the Mitsubishi Owner Portal vehiclestate response."""
+from __future__ import annotations
+
+import datetime
+import logging
+from typing import Any
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def parse_timestamp(ts_value: Any) -> datetime.datetime | None:
+    """Convert timestamp to datetime object with timezone for TIMESTAMP sensors."""
+    if ts_value and str(ts_value).isnumeric():
+        try:
+            timestamp = float(ts_value)
+            # Check if timestamp is in milliseconds (13 digits) and convert to seconds
+            if timestamp > 10000000000:  # Timestamps after year 2286 are likely in milliseconds
+                timestamp = timestamp / 1000
+            # Return timezone-aware datetime in UTC
+            return datetime.datetime.fromtimestamp(timestamp, tz=datetime.timezone.utc)
+        except (ValueError, OverflowError, OSError):
+            # Numeric characters float() rejects, or dates out of range
+            return None
+    return None
+
+
+def safe_number(value: Any, default: Any = None) -> Any:
+    """Convert value to number, return None if invalid."""
+    if value is None or value == 'unknown' or value == '':
+        return default
+    try:
+        # Try to convert to int first, then float
+        return int(value) if isinstance(value, str) and value.isdigit() else float(value) if value else default
+    except (ValueError, TypeError):
+        return default
+
+
+def _list_range(items: list[Any], engine: str) -> Any:
+    """Get the range from a list like [{"range": "46"}, {"engineType": "5"}]."""
+    # Extract range from first dict that has it, verify engineType if present
+    range_value = None
+    engine_type = None
+    for item in items:
+        if isinstance(item, dict):
+            if 'range' in item:
+                range_value = item.get('range')
+            if 'engineType' in item:
+                engine_type = item.get('engineType')
+    # Use range if found and engineType is correct (or not specified)
+    if range_value and (engine_type == engine or engine_type is None):
+        return safe_number(range_value)
+    return None
+
+
+def _nested_range(data: dict[str, Any], key: str) -> Any:
+    """Get the range from a dict like {"cruisingRange": [{key: {"value": ...}}]}."""
+    value = None
+    items = data.get('cruisingRange')
+    for item in items if isinstance(items, list) else ():
+        if isinstance(item, dict):
+            range_data = item.get(key, item.get('range', {}))
+            if isinstance(range_data, dict):
+                value = safe_number(range_data.get('value'))
+                if value:
+                    break
+    return value
+
+
+def parse_vehicle_state(state: dict[str, Any]) -> dict[str, Any]:
+    """Flatten the ``state`` of a vehiclestate response into coordinator data."""
+    charging_control = state.get('chargingControl', {})
+    if not charging_control or not isinstance(charging_control, dict):
+        _LOGGER.error('Invalid API response: missing chargingControl in state')
+        return {}
+
+    if _LOGGER.isEnabledFor(logging.DEBUG):
+        _LOGGER.debug('chargingControl keys: %s', list(charging_control.keys()))
+
+    # Extract location data
+    ext_loc_map = state.get('extLocMap')
+    if not isinstance(ext_loc_map, dict):
+        ext_loc_map = {}
+    location_lat = safe_number(ext_loc_map.get('lat'))
+    location_lon = safe_number(ext_loc_map.get('lon'))
+    location_ts = parse_timestamp(ext_loc_map.get('ts'))
+
+    # Extract odometer data (get the most recent reading from odo array)
+    odo_list = state.get('odo', [])
+    latest_odo = None
+    latest_odo_ts = None
+    if odo_list and isinstance(odo_list, list):
+        latest_odo_entry = odo_list[-1] if odo_list else {}
+        if isinstance(latest_odo_entry, dict) and latest_odo_entry:
+            # Get the first (and only) key-value pair
+            for ts_key, odo_value in latest_odo_entry.items():
+                latest_odo = safe_number(odo_value)
+                # Odometer timestamp is a string date, parse it and add timezone
+                try:
+                    latest_odo_ts = datetime.datetime.strptime(ts_key, "%Y-%m-%d %H:%M:%S").replace(tzinfo=datetime.timezone.utc)
+                except (ValueError, TypeError):
+                    latest_odo_ts = None
+                break
+
+    # Extract cruising range data
+    # Try cruisingRangeCombined first, fallback to availRange
+    cruising_range_combined = safe_number(charging_control.get('cruisingRangeCombined'))
+    if cruising_range_combined is None:
+        # Fallback: try to get availRange from diagnostic data
+        avail_range = safe_number(charging_control.get('availRange'))
+        if avail_range is None and isinstance(charging_control.get('availRange'), dict):
+            avail_range = safe_number(charging_control.get('availRange', {}).get('value'))
+        cruising_range_combined = avail_range
+        _LOGGER.debug('Using availRange as combined range: %s', cruising_range_combined)
+
+    # Extract first cruising range (gasoline), engineType 4
+    range_first = charging_control.get('cruisingRangeFirst', [])
+    cruising_range_gasoline = None
+    if range_first and isinstance(range_first, list):
+        cruising_range_gasoline = _list_range(range_first, '4')
+    # Try alternative structure for gasoline range
+    if cruising_range_gasoline is None and isinstance(range_first, dict):
+        cruising_range_gasoline = _nested_range(range_first, 'range_2')
+
+    # Extract second cruising range (electric), engineType 5
+    range_second = charging_control.get('cruisingRangeSecond', [])
+    cruising_range_electric = None
+    if range_second and isinstance(range_second, list):
+        cruising_range_electric = _list_range(range_second, '5')
+    # Try alternative structure for electric range
+    if cruising_range_electric is None and isinstance(range_second, dict):
+        cruising_range_electric = _nested_range(range_second, 'range_3')
+
+    # Debug logging for range values
+    _LOGGER.debug('Cruising range values: combined=%s, gasoline=%s, electric=%s',
+                  cruising_range_combined, cruising_range_gasoline, cruising_range_electric)
+
+    # Calculate gasoline range from combined if available and gasoline range seems unrealistic
+    # (PHEV gasoline range shouldn't exceed combined range significantly)
+    if cruising_range_combined and cruising_range_electric:
+        calculated_gasoline = cruising_range_combined - cruising_range_electric
+        # If parsed gasoline range is much larger than combined (unrealistic), use calculated
+        if cruising_range_gasoline is None or cruising_range_gasoline > cruising_range_combined * 2:
+            _LOGGER.debug('Gasoline range (%s) seems unrealistic, calculating from combined (%s) - electric (%s) = %s',
+                          cruising_range_gasoline, cruising_range_combined, cruising_range_electric, calculated_gasoline)
+            cruising_range_gasoline = calculated_gasoline if calculated_gasoline > 0 else None
+
+    return {
+        # Charging information
+        "Battery": safe_number(charging_control.get('hvBatteryLife')),
+        "Charging_Status": charging_control.get('hvChargingStatus') or 'unknown',
+        "Charging_Mode": charging_control.get('hvChargingMode') or 'unknown',
+        "Charging_Plug_Status": charging_control.get('hvChargingPlugStatus') or 'unknown',
+        "Charging_Ready": charging_control.get('hvChargingReady') or 'unknown',
+        "Time_To_Full_Charge": safe_number(charging_control.get('hvTimeToFullCharge')),
+        "Event_Timestamp": parse_timestamp(charging_control.get('eventTimestamp')),
+
+        # Range information
+        "Cruising_Range_Combined": cruising_range_combined,
+        "Cruising_Range_Gasoline": cruising_range_gasoline,
+        "Cruising_Range_Electric": cruising_range_electric,
+
+        # Vehicle state
+        "Ignition_State": state.get('ignitionState') or 'unknown',
+        "Ignition_State_Timestamp": parse_timestamp(state.get('ignitionStateTs')),
+        "Odometer": latest_odo,
+        "Odometer_Timestamp": latest_odo_ts,
+
+        # Location information
+        "Location_Latitude": location_lat,
+        "Location_Longitude": location_lon,
+        "Location_Timestamp": location_ts,
+
+        # Security and status
+        "Theft_Alarm": state.get('theftAlarm') or 'unknown',
+        "Theft_Alarm_Type": state.get('theftAlarmType') or 'unknown',
+        "Privacy_Mode": state.get('privacy') or 'unknown',
+        "Temperature": safe_number(state.get('temp')),
+        "Accessible": state.get('accessible') or 'unknown',
+
+        # Other states
+        "Door_Status": state.get('ods') or 'unknown',
+        "Diagnostic": state.get('diagnostic') or 'unknown',
+    }
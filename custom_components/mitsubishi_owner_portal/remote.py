@@ -0,0 +1,215 @@
+"""Persistent queue of remote operations on Mitsubishi Owner Portal vehicles."""
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import defaultdict
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN
+
+if TYPE_CHECKING:
+    from .coordinator import VehiclesCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+SAVE_DELAY = 10
+
+EVENT_REMOTE_OPERATION = f'{DOMAIN}_remote_operation'
+
+# Shared by the queues of all entries, so the portal sees a bounded number of jobs
+DATA_REMOTE_SLOTS = f'{DOMAIN}_remote_slots'
+MAX_CONCURRENT_OPERATIONS = 2
+
+START_ATTEMPTS = 3
+POLL_ATTEMPTS = 5
+RETRY_DELAY = 5
+FIRST_POLL_DELAY = 3
+# Jobs older than this are not resumed after a restart
+JOB_TIMEOUT = 600
+
+
+class RemoteJob:
+    """A remote operation on one vehicle, from request until its result."""
+
+    def __init__(self, vin: str, operation: str, event_id: str | None = None, created: float | None = None) -> None:
+        """Initialize the job."""
+        self.vin = vin
+        self.operation = operation
+        self.event_id = event_id
+        self.created = time.time() if created is None else created
+
+    @property
+    def key(self) -> tuple[str, str]:
+        """Return the key identical jobs share."""
+        return self.vin, self.operation
+
+    def as_dict(self) -> dict[str, Any]:
+        """Serialize the job."""
+        return {
+            "vin": self.vin,
+            "operation": self.operation,
+            "event_id": self.event_id,
+            "created": self.created,
+        }
+
+    @classmethod
+    def from_dict(cls, raw: dict[str, Any]) -> RemoteJob:
+        """Restore a job written by as_dict."""
+        return cls(str(raw["vin"]), str(raw["operation"]), raw.get("event_id"), float(raw["created"]))
+
+
+class RemoteOperationQueue:
+    """Per-entry queue of remote operations persisted to a Store.
+
+    Jobs on the same vehicle run one after the other, and no more than
+    MAX_CONCURRENT_OPERATIONS jobs run at once across all entries. Pending
+    jobs are saved, and a job is saved again as soon as the portal returns
+    its event id, so after a restart polling resumes where it stopped rather
+    than waking the vehicle twice. Every result is fired as an event.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        """Initialize the queue."""
+        self.hass = hass
+        self._store: Store[dict[str, Any]] = Store(hass, STORAGE_VERSION, f"{DOMAIN}.remote.{entry_id}")
+        self._slots: asyncio.Semaphore = hass.data.setdefault(
+            DATA_REMOTE_SLOTS, asyncio.Semaphore(MAX_CONCURRENT_OPERATIONS)
+        )
+        self._vin_locks: defaultdict[str, asyncio.Lock] = defaultdict(asyncio.Lock)
+        self._jobs: dict[tuple[str, str], RemoteJob] = {}
+        self._tasks: dict[tuple[str, str], asyncio.Task[bool]] = {}
+        self._restored: list[RemoteJob] = []
+
+    async def async_load(self) -> None:
+        """Load the jobs pending when Home Assistant stopped."""
+        raw = await self._store.async_load() or {}
+        for data in raw.get("jobs", []):
+            try:
+                job = RemoteJob.from_dict(data)
+            except (KeyError, TypeError, ValueError) as exc:
+                _LOGGER.warning('Discarding stored remote operation %s: %s', data, exc)
+                continue
+            if time.time() - job.created < JOB_TIMEOUT:
+                self._restored.append(job)
+
+    @callback
+    def async_resume(self, coordinators: dict[str, VehiclesCoordinator]) -> None:
+        """Resume the loaded jobs of the given vehicles, keyed by VIN."""
+        restored, self._restored = self._restored, []
+        for job in restored:
+            coordinator = coordinators.get(job.vin)
+            if coordinator is None or job.key in self._tasks:
+                continue
+            _LOGGER.debug('Resuming %s of %s, event %s', job.operation, job.vin, job.event_id)
+            self._start(job, coordinator, resumed=True)
+        if restored:
+            # Forget the jobs of vehicles that are gone
+            self._async_schedule_save()
+
+    async def async_submit(self, coordinator: VehiclesCoordinator, operation: str = 'vehicleStatus') -> bool:
+        """Run an operation on the vehicle of a coordinator and return whether it succeeded.
+
+        Submitting an operation that is already queued for the vehicle waits
+        for the queued one.
+        """
+        task = self._tasks.get((coordinator.vin, operation))
+        if task is None:
+            task = self._start(RemoteJob(coordinator.vin, operation), coordinator)
+        else:
+            coordinator.account.metrics.increment('remote_coalesced', coordinator.account.username, vin=coordinator.vin)
+        return await asyncio.shield(task)
+
+    @callback
+    def _start(self, job: RemoteJob, coordinator: VehiclesCoordinator, resumed: bool = False) -> asyncio.Task[bool]:
+        """Queue a job."""
+        self._jobs[job.key] = job
+        self._async_schedule_save()
+        task = self._tasks[job.key] = self.hass.async_create_task(self._async_run(job, coordinator, resumed))
+        return task
+
+    async def _async_run(self, job: RemoteJob, coordinator: VehiclesCoordinator, resumed: bool) -> bool:
+        """Wait for the vehicle and a free slot, then run a job to its result.
+
+        A cancelled job stays saved, to be resumed on the next start.
+        """
+        account = coordinator.account
+        async with self._vin_locks[job.vin], self._slots:
+            started = time.monotonic()
+            try:
+                success = await self._async_execute(job, coordinator)
+            except Exception:  # pylint: disable=broad-except
+                _LOGGER.exception('Remote operation %s on %s failed', job.operation, job.vin)
+                success = False
+        self._jobs.pop(job.key, None)
+        self._tasks.pop(job.key, None)
+        self._async_schedule_save()
+        account.metrics.increment(
+            'remote_succeeded' if success else 'remote_failed', account.username, vin=job.vin
+        )
+        account.metrics.increment('remote_seconds', account.username, time.monotonic() - started, vin=job.vin)
+        self.hass.bus.async_fire(EVENT_REMOTE_OPERATION, {**job.as_dict(), "success": success})
+        if resumed and success:
+            # Nobody is waiting to refresh after a job from before the restart
+            await coordinator.async_request_refresh()
+        return success
+
+    async def _async_execute(self, job: RemoteJob, coordinator: VehiclesCoordinator) -> bool:
+        """Start the operation unless it already has an event id, then poll for its result."""
+        account = coordinator.account
+        if not job.event_id:
+            pms = {
+                'forced': 'true',
+                'operation': job.operation,
+                'userAgent': 'owner-portal',
+                'vin': job.vin
+            }
+            for _ in range(START_ATTEMPTS):
+                rsp = await account.request('avi/v3/remoteOperation', pms, 'POST')
+                if rsp.get('message', '') == 'Unauthorized':
+                    await account.async_login()
+                    rsp = await account.request('avi/v3/remoteOperation', pms, 'POST')
+                job.event_id = rsp.get('eventId')
+                if rsp.get('status') == 'Started':
+                    break
+                await asyncio.sleep(RETRY_DELAY)
+            if not job.event_id:
+                _LOGGER.error('Request remote api failed')
+                return False
+            await self._store.async_save(self._data_to_save())
+            await asyncio.sleep(FIRST_POLL_DELAY)
+
+        for _ in range(POLL_ATTEMPTS):
+            rsp = await account.request(f'avi/v1/remoteOperation/vehicles/{job.vin}/events/{job.event_id}')
+            if rsp.get('status') == 'Successful':
+                return True
+            await asyncio.sleep(RETRY_DELAY)
+        _LOGGER.error('Get remote api response failed')
+        return False
+
+    @callback
+    def _async_schedule_save(self) -> None:
+        """Save the pending jobs shortly."""
+        self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+    def _data_to_save(self) -> dict[str, Any]:
+        """Return the data to persist."""
+        return {"jobs": [job.as_dict() for job in [*self._jobs.values(), *self._restored]]}
+
+    async def async_shutdown(self) -> None:
+        """Stop running jobs and save the ones that can be resumed."""
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._tasks.clear()
+        await self._store.async_save(self._data_to_save())
+
+    async def async_remove(self) -> None:
+        """Remove persisted jobs."""
+        await self._store.async_remove()
@@ -6,12 +6,16 @@ from homeassistant.components.sensor import (
     DOMAIN as ENTITY_DOMAIN, SensorEntityDescription, SensorDeviceClass, SensorStateClass,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import PERCENTAGE, UnitOfTime, UnitOfLength, UnitOfTemperature
-
-from . import (
-    DOMAIN,
-    MitsubishiOwnerPortalEntity, VehiclesCoordinator, Vehicle,
+from homeassistant.const import (
+    PERCENTAGE, UnitOfEnergy, UnitOfInformation, UnitOfTime, UnitOfLength, UnitOfTemperature,
 )
+from homeassistant.core import callback
+
+from .const import DOMAIN
+from .aggregate import FleetAggregate
+from .coordinator import VehiclesCoordinator
+from .account import MitsubishiOwnerPortalAccount
+from .entity import MitsubishiOwnerPortalAccountEntity, MitsubishiOwnerPortalEntity, Vehicle
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -52,6 +56,27 @@ VEHICLE_SENSORS: tuple[SensorEntityDescription, ...] = (
         device_class=SensorDeviceClass.DURATION,
         native_unit_of_measurement=UnitOfTime.MINUTES,
     ),
+    SensorEntityDescription(
+        key="Charging_Rate",
+        translation_key="charging_rate",
+        native_unit_of_measurement=f"{PERCENTAGE}/{UnitOfTime.HOURS}",
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:battery-charging-high",
+    ),
+    SensorEntityDescription(
+        key="Charging_Energy_Added",
+        translation_key="charging_energy_added",
+        native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+        device_class=SensorDeviceClass.ENERGY,
+        # Drops back to 0 at each new session, which TOTAL_INCREASING treats as a meter reset
+        state_class=SensorStateClass.TOTAL_INCREASING,
+    ),
+    SensorEntityDescription(
+        key="Charging_Time_To_Target",
+        translation_key="charging_time_to_target",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MINUTES,
+    ),
     SensorEntityDescription(
         key="Event_Timestamp",
         translation_key="last_update_time",
@@ -104,6 +129,13 @@ VEHICLE_SENSORS: tuple[SensorEntityDescription, ...] = (
         state_class=SensorStateClass.TOTAL_INCREASING,
         icon="mdi:counter",
     ),
+    SensorEntityDescription(
+        key="Last_Trip_Distance",
+        translation_key="last_trip_distance",
+        native_unit_of_measurement=UnitOfLength.KILOMETERS,
+        device_class=SensorDeviceClass.DISTANCE,
+        icon="mdi:map-marker-distance",
+    ),
     SensorEntityDescription(
         key="Odometer_Timestamp",
         translation_key="odometer_update_time",
@@ -176,11 +208,64 @@ VEHICLE_SENSORS: tuple[SensorEntityDescription, ...] = (
 )
 
 
+# Keys are attributes of FleetAggregate
+AGGREGATE_SENSORS: tuple[SensorEntityDescription, ...] = (
+    SensorEntityDescription(
+        key="average_battery",
+        translation_key="fleet_average_battery",
+        native_unit_of_measurement=PERCENTAGE,
+        device_class=SensorDeviceClass.BATTERY,
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
+    SensorEntityDescription(
+        key="charging",
+        translation_key="fleet_vehicles_charging",
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:ev-station",
+    ),
+    SensorEntityDescription(
+        key="plugged_in",
+        translation_key="fleet_vehicles_plugged_in",
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:power-plug",
+    ),
+    SensorEntityDescription(
+        key="min_electric_range",
+        translation_key="fleet_min_electric_range",
+        native_unit_of_measurement=UnitOfLength.KILOMETERS,
+        device_class=SensorDeviceClass.DISTANCE,
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:ev-station",
+    ),
+    SensorEntityDescription(
+        key="total_odometer",
+        translation_key="fleet_total_odometer",
+        native_unit_of_measurement=UnitOfLength.KILOMETERS,
+        device_class=SensorDeviceClass.DISTANCE,
+        # Drops when a vehicle leaves the fleet or reports no odometer, which is not a meter reset
+        state_class=SensorStateClass.TOTAL,
+        icon="mdi:counter",
+    ),
+)
+
+
 async def async_setup_entry(hass, config_entry: ConfigEntry, async_add_entities):
-    vhs = hass.data[DOMAIN][config_entry.entry_id].get("vhs", [])
+    entry_data = hass.data[DOMAIN][config_entry.entry_id]
+    vhs = entry_data.get("vhs", [])
     for v in vhs:
         async_add_entities(
             [MitsubishiOwnerPortalSensorEntity(v["vh"], v["coordinator"], desc) for desc in VEHICLE_SENSORS])
+    async_add_entities([
+        MitsubishiOwnerPortalTransferSensorEntity(account) for account in entry_data.get("accounts", [])
+    ])
+    for account in entry_data.get("accounts", []):
+        aggregate = FleetAggregate()
+        for v in vhs:
+            if v["coordinator"].account is account:
+                config_entry.async_on_unload(aggregate.async_track(v["coordinator"]))
+        async_add_entities([
+            MitsubishiOwnerPortalAggregateSensorEntity(account, aggregate, desc) for desc in AGGREGATE_SENSORS
+        ])
 
 
 class MitsubishiOwnerPortalSensorEntity(MitsubishiOwnerPortalEntity, SensorEntity):
@@ -206,3 +291,82 @@ class MitsubishiOwnerPortalSensorEntity(MitsubishiOwnerPortalEntity, SensorEntit
     def native_value(self):
         """Return the sensors state."""
         return self.coordinator.data[self.entity_description.key]
+
+
+class MitsubishiOwnerPortalTransferSensorEntity(MitsubishiOwnerPortalAccountEntity, SensorEntity):
+    """Data exchanged with the portal by an account in the current month."""
+
+    _attr_translation_key = "monthly_data_transfer"
+    _attr_device_class = SensorDeviceClass.DATA_SIZE
+    _attr_state_class = SensorStateClass.TOTAL
+    _attr_native_unit_of_measurement = UnitOfInformation.BYTES
+    _attr_suggested_unit_of_measurement = UnitOfInformation.MEBIBYTES
+    _attr_icon = "mdi:swap-vertical"
+
+    def __init__(self, account: MitsubishiOwnerPortalAccount) -> None:
+        """Initialize the sensor."""
+        super().__init__(account)
+        self._attr_unique_id = f"{account.username}_monthly_data_transfer"
+
+    async def async_added_to_hass(self) -> None:
+        """Update whenever the account receives a response."""
+        self.async_on_remove(self.account.transfer.async_add_listener(self._async_transfer_updated))
+
+    @callback
+    def _async_transfer_updated(self) -> None:
+        """Write the new totals."""
+        self.async_write_ha_state()
+
+    @property
+    def native_value(self) -> int:
+        """Return the bytes transferred on the wire this month."""
+        return self.account.transfer.transferred
+
+    @property
+    def last_reset(self):
+        """Return the start of the month."""
+        return self.account.transfer.month_start
+
+    @property
+    def extra_state_attributes(self) -> dict[str, int]:
+        """Return the decompressed size and number of responses."""
+        return {
+            "decompressed_bytes": self.account.transfer.received,
+            "requests": self.account.transfer.requests,
+        }
+
+
+class MitsubishiOwnerPortalAggregateSensorEntity(MitsubishiOwnerPortalAccountEntity, SensorEntity):
+    """A total over the vehicles of an account."""
+
+    entity_description: SensorEntityDescription
+
+    def __init__(
+            self,
+            account: MitsubishiOwnerPortalAccount,
+            aggregate: FleetAggregate,
+            description: SensorEntityDescription,
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(account)
+        self.aggregate = aggregate
+        self.entity_description = description
+        self._attr_unique_id = f"{account.username}_{description.translation_key}"
+        self._written = None
+
+    async def async_added_to_hass(self) -> None:
+        """Update whenever the totals change."""
+        self._written = self.native_value
+        self.async_on_remove(self.aggregate.async_add_listener(self._async_aggregate_updated))
+
+    @callback
+    def _async_aggregate_updated(self) -> None:
+        """Write the new total, unless only other totals changed."""
+        if self.native_value != self._written:
+            self._written = self.native_value
+            self.async_write_ha_state()
+
+    @property
+    def native_value(self):
+        """Return the total."""
+        return getattr(self.aggregate, self.entity_description.key)
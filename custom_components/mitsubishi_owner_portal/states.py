@@ -0,0 +1,66 @@
+"""On/off meaning of the enum values reported by the owner portal."""
+from __future__ import annotations
+
+from collections.abc import Iterable
+from typing import Any
+
+# Raw values remembered per map; junk beyond this is normalized on every lookup
+MAX_ALIASES = 64
+
+
+def normalize(value: Any) -> str:
+    """Normalize a portal enum value, e.g. ``'Not Charging'`` to ``'NOT_CHARGING'``."""
+    return str(value).strip().upper().replace(' ', '_') if value is not None else ''
+
+
+class StateMap(dict):
+    """Portal enum values mapped to True, False or None when unknown.
+
+    The normalized values are compiled into one table up front. A raw value
+    is normalized the first time it is seen and remembered, so looking up a
+    value the portal keeps reporting is a single dict access.
+    """
+
+    def __init__(self, on: Iterable[str], off: Iterable[str]) -> None:
+        """Compile the table from the values meaning on and off."""
+        super().__init__()
+        self.on = frozenset(on)
+        self.off = frozenset(off)
+        self._table = dict.fromkeys(self.off, False) | dict.fromkeys(self.on, True)
+
+    def __missing__(self, value: Any) -> bool | None:
+        """Normalize a raw value seen for the first time."""
+        result = self._table.get(normalize(value))
+        if len(self) < MAX_ALIASES:
+            self[value] = result
+        return result
+
+    def __call__(self, value: Any) -> bool | None:
+        """Return the meaning of a raw portal value."""
+        try:
+            return self[value]
+        except TypeError:
+            # Unhashable junk
+            return None
+
+
+CHARGING = StateMap(
+    on=('CHARGING', 'CHARGE', 'IN_PROGRESS', 'STARTED'),
+    off=('NOTCHARGING', 'NOT_CHARGING', 'STOPPED', 'STOP', 'COMPLETE', 'COMPLETED', 'FINISHED', 'IDLE', 'OFF'),
+)
+PLUGGED_IN = StateMap(
+    on=('PLUGGED', 'PLUGGED_IN', 'PLUGIN', 'CONNECTED', 'CONNECT', 'ON'),
+    off=('UNPLUGGED', 'NOT_PLUGGED', 'NOTPLUGGED', 'DISCONNECTED', 'DISCONNECT', 'OFF'),
+)
+IGNITION_ON = StateMap(
+    on=('ON', 'IG_ON', 'IGNITION_ON', 'RUN', 'RUNNING', 'START'),
+    off=('OFF', 'IG_OFF', 'IGNITION_OFF', 'STOP'),
+)
+DOOR_OPEN = StateMap(
+    on=('OPEN', 'OPENED', 'AJAR', 'DOOR_OPEN'),
+    off=('CLOSED', 'CLOSE', 'LOCKED', 'DOOR_CLOSED'),
+)
+THEFT_ALARM = StateMap(
+    on=('ON', 'ACTIVE', 'ALARM', 'TRIGGERED', 'TRIGGER'),
+    off=('OFF', 'INACTIVE', 'NONE', 'NORMAL', 'ARMED', 'DISARMED'),
+)
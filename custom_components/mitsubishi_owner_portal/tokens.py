@@ -0,0 +1,67 @@
+"""Login state shared by every account object of the same portal user."""
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+
+from .const import CONF_REFRESH_TOKEN_TIME, CONF_TOKEN_TIME, DOMAIN
+
+DATA_TOKENS = f'{DOMAIN}_tokens'
+
+# Seconds after which the portal no longer accepts a refresh token (~30 days)
+REFRESH_TOKEN_LIFETIME = 2590000
+
+
+class SharedTokens:
+    """Tokens of one user at one API base, shared across entries and flows.
+
+    The running entry, a reconfigure flow and an options flow can each hold
+    an account object for the same user. Their logins and token refreshes
+    run one at a time under ``lock``, and an account that waited takes over
+    the tokens the previous holder got instead of calling the portal again,
+    which would rotate the refresh token under the other accounts. Tokens
+    are only handed to accounts using the password they were obtained with.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty cache."""
+        self.lock = asyncio.Lock()
+        self.password: str | None = None
+        self.tokens: dict[str, Any] = {}
+
+    @property
+    def token_time(self) -> float:
+        """Return when the shared access token was issued."""
+        return self.tokens.get(CONF_TOKEN_TIME) or 0
+
+    def usable(self, password: str | None) -> bool:
+        """Return whether an account with ``password`` may take over the tokens."""
+        if not self.tokens or password != self.password:
+            return False
+        return time.time() - (self.tokens.get(CONF_REFRESH_TOKEN_TIME) or 0) < REFRESH_TOKEN_LIFETIME
+
+    def publish(self, password: str | None, tokens: dict[str, Any]) -> None:
+        """Replace the shared tokens with those an account just obtained."""
+        self.password = password
+        self.tokens = dict(tokens)
+
+
+@callback
+def async_get_shared_tokens(hass: HomeAssistant, username: str | None, api_base: str) -> SharedTokens:
+    """Return the token cache of a user at an API base."""
+    cache: dict[tuple[str | None, str], SharedTokens] = hass.data.setdefault(DATA_TOKENS, {})
+    key = (username, api_base)
+    if key not in cache:
+        cache[key] = SharedTokens()
+    return cache[key]
+
+
+@callback
+def async_remove_shared_tokens(hass: HomeAssistant, username: str | None) -> None:
+    """Forget the cached tokens of a user whose entry was removed."""
+    cache = hass.data.get(DATA_TOKENS, {})
+    for key in [key for key in cache if key[0] == username]:
+        del cache[key]
@@ -0,0 +1,117 @@
+"""Sampled debug tracing of portal requests and rate-limited warnings."""
+from __future__ import annotations
+
+import logging
+import time
+from collections import Counter, deque
+from typing import Any
+
+from .const import CONF_CAPTURE, CONF_ENDPOINTS, CONF_SAMPLE, CONF_VINS
+
+# Values of these keys never reach logs or captured payloads
+REDACTED_KEYS = frozenset({
+    'access_token', 'accountDN', 'email', 'id_token', 'lat', 'lon', 'password', 'refresh_token', 'token', 'uid',
+    'userId', 'username', 'vin',
+})
+REDACTED = '**REDACTED**'
+
+# Seconds between repeats of the same rate-limited warning
+WARNING_INTERVAL = 3600
+
+
+def redact(data: Any) -> Any:
+    """Return a copy of a payload with sensitive values masked."""
+    if isinstance(data, dict):
+        return {key: REDACTED if key in REDACTED_KEYS else redact(value) for key, value in data.items()}
+    if isinstance(data, list):
+        return [redact(value) for value in data]
+    return data
+
+
+def mask_vin(vin: str | None) -> str | None:
+    """Return the last digits of a VIN, enough to tell vehicles apart."""
+    return f'...{vin[-4:]}' if vin else vin
+
+
+class Tracer:
+    """Debug trace of portal responses, off unless debug logging is enabled.
+
+    Checking whether a response is traced costs a cached log level lookup
+    while debug logging is off. When it is on, every ``sample``-th response
+    per endpoint and VIN is traced, optionally limited to some VINs or
+    endpoints, and the last ``capture`` redacted payloads are kept.
+    """
+
+    def __init__(self, logger: logging.Logger, config: dict[str, Any] | None = None) -> None:
+        """Initialize the tracer."""
+        self.logger = logger
+        self._seen: Counter[tuple[str, str | None]] = Counter()
+        self.payloads: deque[dict[str, Any]] = deque(maxlen=0)
+        self.configure(config or {})
+
+    def configure(self, config: dict[str, Any]) -> None:
+        """Apply trace options, keeping payloads captured so far."""
+        self.sample = max(int(config.get(CONF_SAMPLE, 1)), 1)
+        self.vins = frozenset(config.get(CONF_VINS) or ())
+        self.endpoints = tuple(config.get(CONF_ENDPOINTS) or ())
+        capture = int(config.get(CONF_CAPTURE, 0))
+        if capture != self.payloads.maxlen:
+            self.payloads = deque(self.payloads, maxlen=capture)
+
+    def sampled(self, endpoint: str, vin: str | None) -> bool:
+        """Return whether to trace a response of an endpoint for a VIN."""
+        if not self.logger.isEnabledFor(logging.DEBUG):
+            return False
+        if self.vins and vin not in self.vins:
+            return False
+        if self.endpoints and not endpoint.startswith(self.endpoints):
+            return False
+        key = (endpoint, vin)
+        self._seen[key] += 1
+        return (self._seen[key] - 1) % self.sample == 0
+
+    def trace(self, method: str, endpoint: str, vin: str | None, status: int | None, payload: Any) -> None:
+        """Log the shape of a sampled response and capture it redacted."""
+        self.logger.debug(
+            'Traced %s %s for %s: status=%s, keys=%s',
+            method,
+            endpoint,
+            mask_vin(vin),
+            status,
+            list(payload) if isinstance(payload, dict) else type(payload).__name__,
+        )
+        if self.payloads.maxlen:
+            self.payloads.append({
+                'time': time.time(),
+                'method': method,
+                'endpoint': endpoint,
+                'vin': mask_vin(vin),
+                'status': status,
+                'payload': redact(payload),
+            })
+
+
+class WarningLimiter:
+    """Log each kind of warning at most once per interval, counting the rest."""
+
+    def __init__(self, logger: logging.Logger, interval: float = WARNING_INTERVAL) -> None:
+        """Initialize the limiter."""
+        self.logger = logger
+        self.interval = interval
+        self._last: dict[str, float] = {}
+        self.suppressed: Counter[str] = Counter()
+
+    def warning(self, key: str, msg: str, *args: Any) -> bool:
+        """Log a warning unless one with the same key was logged recently."""
+        now = time.monotonic()
+        last = self._last.get(key)
+        if last is not None and now - last < self.interval:
+            self.suppressed[key] += 1
+            return False
+        self._last[key] = now
+        suppressed = self.suppressed.pop(key, 0)
+        if suppressed:
+            msg += ' (%s similar warnings suppressed)'
+            args = (*args, suppressed)
+        self.logger.warning(msg, *args)
+        return True
@@ -0,0 +1,122 @@
+"""Monthly data transfer accounting per owner portal account."""
+from __future__ import annotations
+
+import datetime
+import logging
+from collections.abc import Callable
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+SAVE_DELAY = 300
+
+
+def _month_start(now: datetime.datetime | None = None) -> datetime.datetime:
+    """Return the start of the local calendar month."""
+    now = now or dt_util.now()
+    return now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+class MonthlyTransfer:
+    """Bytes an account exchanged with the portal in the current month.
+
+    ``transferred`` counts bytes on the wire, ``received`` the same bodies
+    after decompression. The counters restart with each calendar month.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the counters."""
+        self.month_start = _month_start()
+        self.transferred = 0
+        self.received = 0
+        self.requests = 0
+        self._listeners: list[Callable[[], None]] = []
+
+    @callback
+    def async_add(self, transferred: int, received: int) -> None:
+        """Count a response and notify listeners."""
+        month_start = _month_start()
+        if month_start != self.month_start:
+            self.month_start = month_start
+            self.transferred = self.received = self.requests = 0
+        self.transferred += transferred
+        self.received += received
+        self.requests += 1
+        for listener in self._listeners:
+            listener()
+
+    @callback
+    def async_add_listener(self, listener: Callable[[], None]) -> Callable[[], None]:
+        """Call ``listener`` after every counted response."""
+        self._listeners.append(listener)
+        return lambda: self._listeners.remove(listener)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Serialize the counters."""
+        return {
+            "month_start": self.month_start.isoformat(),
+            "transferred": self.transferred,
+            "received": self.received,
+            "requests": self.requests,
+        }
+
+    def restore(self, raw: dict[str, Any]) -> None:
+        """Restore counters written by as_dict, unless they are from an earlier month."""
+        month_start = dt_util.parse_datetime(raw.get("month_start") or "")
+        if month_start is None or month_start < self.month_start:
+            return
+        self.transferred = int(raw.get("transferred", 0))
+        self.received = int(raw.get("received", 0))
+        self.requests = int(raw.get("requests", 0))
+
+
+class TransferStore:
+    """Per-entry persistence of the monthly transfer of its accounts."""
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        """Initialize the store."""
+        self.hass = hass
+        self._store: Store[dict[str, Any]] = Store(hass, STORAGE_VERSION, f"{DOMAIN}.transfer.{entry_id}")
+        self._transfers: dict[str | None, MonthlyTransfer] = {}
+        self._unsubs: list[Callable[[], None]] = []
+
+    async def async_load(self, transfers: dict[str | None, MonthlyTransfer]) -> None:
+        """Restore persisted counters into ``transfers``, keyed by username."""
+        raw = await self._store.async_load() or {}
+        for username, transfer in transfers.items():
+            try:
+                transfer.restore(raw.get("accounts", {}).get(username) or {})
+            except (TypeError, ValueError) as exc:
+                _LOGGER.warning('Discarding stored transfer totals for %s: %s', username, exc)
+            self._unsubs.append(transfer.async_add_listener(self._async_schedule_save))
+        self._transfers = transfers
+
+    @callback
+    def _async_schedule_save(self) -> None:
+        """Save the counters some time after they changed."""
+        self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+    def _data_to_save(self) -> dict[str, Any]:
+        """Return the data to persist."""
+        return {"accounts": {username: transfer.as_dict() for username, transfer in self._transfers.items()}}
+
+    async def async_save(self) -> None:
+        """Persist the counters immediately."""
+        await self._store.async_save(self._data_to_save())
+
+    async def async_shutdown(self) -> None:
+        """Persist the counters and stop following them, which may outlive the entry."""
+        while self._unsubs:
+            self._unsubs.pop()()
+        await self.async_save()
+
+    async def async_remove(self) -> None:
+        """Remove persisted counters."""
+        await self._store.async_remove()
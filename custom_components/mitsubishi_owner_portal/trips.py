@@ -0,0 +1,183 @@
+"""Streaming trip detection for Mitsubishi Owner Portal vehicles."""
+from __future__ import annotations
+
+import datetime
+import logging
+import time
+from collections import deque
+from typing import Any, NamedTuple
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN
+from .states import IGNITION_ON
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+SAVE_DELAY = 60
+
+DEFAULT_TRIP_HISTORY = 20
+
+EVENT_TRIP = f'{DOMAIN}_trip'
+
+
+class Trip(NamedTuple):
+    """A finished trip."""
+
+    start_time: float
+    end_time: float
+    distance: float | None
+    start_latitude: float | None
+    start_longitude: float | None
+    end_latitude: float | None
+    end_longitude: float | None
+
+    @property
+    def duration(self) -> float:
+        """Return the trip duration in seconds."""
+        return self.end_time - self.start_time
+
+    def as_event(self, vin: str) -> dict[str, Any]:
+        """Return the trip as event data."""
+        return {
+            "vin": vin,
+            "start_time": datetime.datetime.fromtimestamp(self.start_time, datetime.timezone.utc).isoformat(),
+            "end_time": datetime.datetime.fromtimestamp(self.end_time, datetime.timezone.utc).isoformat(),
+            "duration": round(self.duration),
+            "distance": self.distance,
+            "start_latitude": self.start_latitude,
+            "start_longitude": self.start_longitude,
+            "end_latitude": self.end_latitude,
+            "end_longitude": self.end_longitude,
+        }
+
+
+def _timestamp(data: dict[str, Any]) -> float:
+    """Return the best timestamp of an ignition transition."""
+    for key in ("Ignition_State_Timestamp", "Event_Timestamp"):
+        value = data.get(key)
+        if isinstance(value, datetime.datetime):
+            return value.timestamp()
+    return time.time()
+
+
+class TripDetector:
+    """Per-vehicle ignition state machine that turns polls into trips.
+
+    Only the start point of the trip in progress is kept, so each poll is
+    O(1) and the recorder never has to be re-scanned.
+    """
+
+    def __init__(self, max_trips: int = DEFAULT_TRIP_HISTORY) -> None:
+        """Initialize the detector."""
+        self.trips: deque[Trip] = deque(maxlen=max(max_trips, 1))
+        # (time, odometer, latitude, longitude) of the trip in progress
+        self.active: tuple[float, float | None, float | None, float | None] | None = None
+
+    @property
+    def last_trip(self) -> Trip | None:
+        """Return the most recent finished trip."""
+        return self.trips[-1] if self.trips else None
+
+    def update(self, data: dict[str, Any]) -> Trip | None:
+        """Fold a coordinator snapshot in, returning a trip when one ends."""
+        ignition = IGNITION_ON(data.get("Ignition_State"))
+        if ignition is None:
+            return None
+        odometer = data.get("Odometer")
+        lat = data.get("Location_Latitude")
+        lon = data.get("Location_Longitude")
+
+        if ignition:
+            if self.active is None:
+                self.active = (_timestamp(data), odometer, lat, lon)
+            return None
+        if self.active is None:
+            return None
+
+        start_time, start_odo, start_lat, start_lon = self.active
+        self.active = None
+        distance = None
+        if odometer is not None and start_odo is not None:
+            distance = round(max(odometer - start_odo, 0), 1)
+        trip = Trip(start_time, max(_timestamp(data), start_time), distance, start_lat, start_lon, lat, lon)
+        self.trips.append(trip)
+        return trip
+
+    def as_dict(self) -> dict[str, Any]:
+        """Serialize the detector."""
+        return {
+            "active": list(self.active) if self.active else None,
+            "trips": [list(trip) for trip in self.trips],
+        }
+
+    def restore(self, raw: dict[str, Any]) -> None:
+        """Restore state written by as_dict."""
+        active = raw.get("active")
+        self.active = tuple(active) if active else None
+        self.trips.extend(Trip(*trip) for trip in raw.get("trips", []))
+
+
+class TripStore:
+    """Per-entry collection of trip detectors persisted to a Store."""
+
+    def __init__(self, hass: HomeAssistant, entry_id: str, max_trips: int = DEFAULT_TRIP_HISTORY) -> None:
+        """Initialize the store."""
+        self.hass = hass
+        self.max_trips = max_trips
+        self._store: Store[dict[str, Any]] = Store(hass, STORAGE_VERSION, f"{DOMAIN}.trips.{entry_id}")
+        self._detectors: dict[str, TripDetector] = {}
+
+    async def async_load(self) -> None:
+        """Load persisted trips."""
+        raw = await self._store.async_load() or {}
+        for vin, data in raw.get("vehicles", {}).items():
+            try:
+                self.get(vin).restore(data)
+            except (TypeError, ValueError) as exc:
+                _LOGGER.warning('Discarding stored trips for %s: %s', vin, exc)
+
+    def get(self, vin: str) -> TripDetector:
+        """Return the trip detector of a vehicle, creating it if needed."""
+        detector = self._detectors.get(vin)
+        if detector is None:
+            detector = self._detectors[vin] = TripDetector(self.max_trips)
+        return detector
+
+    @callback
+    def async_set_capacity(self, max_trips: int) -> None:
+        """Change how many trips are kept per vehicle, keeping the newest."""
+        if max_trips == self.max_trips:
+            return
+        self.max_trips = max_trips
+        for detector in self._detectors.values():
+            detector.trips = deque(detector.trips, maxlen=max(max_trips, 1))
+        self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+    @callback
+    def async_record(self, vin: str, data: dict[str, Any]) -> Trip | None:
+        """Feed a coordinator snapshot and fire an event for a finished trip."""
+        if not data:
+            return None
+        detector = self.get(vin)
+        active = detector.active
+        trip = detector.update(data)
+        if trip is not None:
+            self.hass.bus.async_fire(EVENT_TRIP, trip.as_event(vin))
+        if trip is not None or detector.active != active:
+            self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+        return trip
+
+    def _data_to_save(self) -> dict[str, Any]:
+        """Return the data to persist."""
+        return {"vehicles": {vin: detector.as_dict() for vin, detector in self._detectors.items()}}
+
+    async def async_save(self) -> None:
+        """Persist trips immediately."""
+        await self._store.async_save(self._data_to_save())
+
+    async def async_remove(self) -> None:
+        """Remove persisted trips."""
+        await self._store.async_remove()
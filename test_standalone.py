@@ -1,106 +1,306 @@
 """
-Standalone test script example.
-Can run without a full Home Assistant environment.
+Standalone profiling CLI.
+Runs the parser, token management and a coordinator loop of the integration
+against synthetic or replayed portal responses, without setting up Home
+Assistant. Only the homeassistant package has to be installed.
 
 Usage:
     python test_standalone.py
+    python test_standalone.py --vehicles 500 --cycles 20 --profile
+    python test_standalone.py --replay responses/ --flamegraph stacks.txt
+    python test_standalone.py --pstats run.prof --top 40
+
+Replayed responses are vehiclestate JSON files, served round-robin. The
+--flamegraph output holds one collapsed stack per line, for flamegraph.pl,
+speedscope or inferno.
 """
+import argparse
 import asyncio
+import cProfile
+import json
+import pstats
 import sys
+import tempfile
+import threading
+import time
+from collections import Counter, defaultdict
 from pathlib import Path
+from unittest.mock import patch
 
 # Add project path to Python path
 project_root = Path(__file__).parent
 sys.path.insert(0, str(project_root))
 
+TOKEN_RESPONSE = {
+    "access_token": "test_token_123",
+    "refresh_token": "refresh_token_456",
+    "accountDN": "test_user_id",
+}
 
-async def test_vehicle_class():
-    """Test Vehicle class."""
-    from custom_components.mitsubishi_owner_portal import Vehicle
 
-    vehicle_data = {
-        "vin": "TEST123456789",
-        "model": "OUTLANDER PHEV",
-        "modelDescription": "Outlander PHEV 2024",
+def synthetic_state(vin, cycle):
+    """Return a vehiclestate response that changes every cycle."""
+    ts = 1_700_000_000_000 + cycle * 60_000
+    return {
+        "vin": vin,
+        "state": {
+            "chargingControl": {
+                "hvBatteryLife": str(20 + cycle % 80),
+                "hvChargingStatus": "charging" if cycle % 3 else "notCharging",
+                "hvChargingPlugStatus": "plugged",
+                "hvChargingMode": "normal",
+                "hvChargingReady": "ready",
+                "hvTimeToFullCharge": str(max(0, 300 - cycle)),
+                "eventTimestamp": str(ts),
+                "cruisingRangeCombined": "520",
+                "cruisingRangeFirst": [{"range": "470"}, {"engineType": "4"}],
+                "cruisingRangeSecond": [{"range": str(10 + cycle % 50)}, {"engineType": "5"}],
+            },
+            "extLocMap": {"lat": 35.68 + cycle / 10000, "lon": 139.76, "ts": str(ts)},
+            "odo": [{"2024-01-01 00:00:00": str(10_000 + cycle)}],
+            "ignitionState": "ON" if cycle % 5 == 0 else "OFF",
+            "ignitionStateTs": str(ts),
+            "theftAlarm": "OFF",
+            "theftAlarmType": "none",
+            "privacy": "OFF",
+            "temp": "21",
+            "accessible": "true",
+            "ods": "closed",
+            "diagnostic": "ok",
+        },
     }
 
-    vehicle = Vehicle(vehicle_data)
 
-    print("=== Testing Vehicle Class ===")
-    print(f"VIN: {vehicle.vin}")
-    print(f"Model: {vehicle.vehicle_model}")
-    print(f"Model Name: {vehicle.vehicle_model_name}")
-    print("✅ Vehicle class test passed\n")
+class Responses:
+    """Portal responses, synthetic or replayed from JSON files."""
+
+    def __init__(self, replay=None):
+        self.cycle = 0
+        self.replayed = []
+        if replay:
+            path = Path(replay)
+            files = sorted(path.glob("*.json")) if path.is_dir() else [path]
+            self.replayed = [json.loads(file.read_text()) for file in files]
+            if not self.replayed:
+                raise SystemExit(f"No JSON responses found in {replay}")
+        self._served = 0
+
+    def state(self, vin):
+        """Return the next vehiclestate response for a vehicle."""
+        if not self.replayed:
+            return synthetic_state(vin, self.cycle)
+        self._served += 1
+        return self.replayed[self._served % len(self.replayed)]
+
+    def body(self, method, url):
+        """Return the JSON body the portal would send."""
+        if "auth/v1/token" in url:
+            return TOKEN_RESPONSE
+        if url.endswith("/vehiclestate"):
+            return self.state(url.split("/")[-2])
+        return {}
+
+
+class FakeContent:
+    """Response body stream."""
+
+    def __init__(self, body):
+        self._body = body
+
+    async def iter_chunked(self, size):
+        for start in range(0, len(self._body), size):
+            yield self._body[start:start + size]
+
+
+class FakeResponse:
+    """Just enough of aiohttp.ClientResponse for the integration."""
+
+    status = 200
+    content_type = "application/json"
+
+    def __init__(self, body):
+        self.content_length = len(body)
+        self.content = FakeContent(body)
+        self.headers = {}
+
+    def release(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class FakeSession:
+    """Portal transport answering from Responses."""
+
+    def __init__(self, responses):
+        self.responses = responses
+        self.requests = 0
+
+    async def request(self, method, url, **kwargs):
+        self.requests += 1
+        await asyncio.sleep(0)
+        return FakeResponse(json.dumps(self.responses.body(method, str(url))).encode())
 
+    async def close(self):
+        pass
 
-async def test_account_mock():
-    """Test account functionality (using mock)."""
-    from unittest.mock import AsyncMock, MagicMock, patch
 
-    print("=== Testing MitsubishiOwnerPortalAccount (Mock) ===")
+class StackSampler(threading.Thread):
+    """Sample the stack of the main thread into collapsed flamegraph stacks."""
 
-    # Create mock hass object
-    mock_hass = MagicMock()
+    def __init__(self, interval):
+        super().__init__(daemon=True)
+        self.interval = interval
+        self.stacks = Counter()
+        self._target = threading.main_thread().ident
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            frame = sys._current_frames().get(self._target)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({Path(code.co_filename).name}:{code.co_firstlineno})")
+                frame = frame.f_back
+            if stack:
+                self.stacks[";".join(reversed(stack))] += 1
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+    def write(self, path):
+        with open(path, "w", encoding="utf-8") as file:
+            for stack, count in self.stacks.most_common():
+                file.write(f"{stack} {count}\n")
+
+
+def percentile(samples, pct):
+    """Return a percentile of samples by nearest rank."""
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))]
+
+
+def print_latencies(latencies):
+    """Print p50/p95/p99 of every measured phase in milliseconds."""
+    print(f"{'phase':<16}{'count':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    for phase, samples in latencies.items():
+        row = [percentile(samples, pct) * 1000 for pct in (50, 95, 99)] + [max(samples) * 1000]
+        print(f"{phase:<16}{len(samples):>8}" + "".join(f"{value:>10.3f}" for value in row))
+
+
+async def run(args, latencies):
+    """Run the parser, token management and coordinator loop."""
+    from homeassistant.core import HomeAssistant
+
+    from custom_components.mitsubishi_owner_portal.account import MitsubishiOwnerPortalAccount
+    from custom_components.mitsubishi_owner_portal.coordinator import VehiclesCoordinator
+    from custom_components.mitsubishi_owner_portal.parser import parse_vehicle_state
+    from custom_components.mitsubishi_owner_portal.remote import RemoteOperationQueue
+
+    responses = Responses(args.replay)
+    session = FakeSession(responses)
+    hass = HomeAssistant(tempfile.mkdtemp())
+    vins = [f"VIN{idx:014d}" for idx in range(args.vehicles)]
 
-    # Mock aiohttp_client
     with patch(
-        "custom_components.mitsubishi_owner_portal.aiohttp_client.async_create_clientsession"
-    ) as mock_session:
-        mock_http = AsyncMock()
-        mock_session.return_value = mock_http
-
-        # Mock API response
-        mock_response = AsyncMock()
-        mock_response.json = AsyncMock(
-            return_value={
-                "access_token": "test_token_123",
-                "refresh_token": "refresh_token_456",
-                "accountDN": "test_user_id",
-            }
+        "custom_components.mitsubishi_owner_portal.account.aiohttp_client.async_create_clientsession",
+        return_value=session,
+    ):
+        account = MitsubishiOwnerPortalAccount(
+            hass, {"username": "profile@example.com", "password": "secret", "refresh_deadline": 0}
         )
-        mock_http.request = AsyncMock(return_value=mock_response)
+    remote = RemoteOperationQueue(hass, "profile")
+    coordinators = [VehiclesCoordinator(vin, account, scheduled=False, remote=remote) for vin in vins]
 
-        from custom_components.mitsubishi_owner_portal import (
-            MitsubishiOwnerPortalAccount,
-        )
+    started = time.perf_counter()
+    for cycle in range(args.cycles):
+        responses.cycle = cycle
 
-        config = {
-            "username": "test@example.com",
-            "password": "test_password",
-        }
+        for vin in vins[:args.parse_samples]:
+            state = responses.state(vin)["state"]
+            begin = time.perf_counter()
+            parse_vehicle_state(state)
+            latencies["parse"].append(time.perf_counter() - begin)
 
-        account = MitsubishiOwnerPortalAccount(mock_hass, config)
+        if cycle % args.token_every == 0:
+            # Age the token, including its shared copy, so the check refreshes it
+            for tokens in (account._config, account.shared_tokens.tokens):
+                if tokens:
+                    tokens["token_time"] = time.time() - 3600
+            begin = time.perf_counter()
+            await account.async_check_token()
+            latencies["token"].append(time.perf_counter() - begin)
 
-        # Test login
-        login_result = await account.async_login()
-        print(f"Login result: {login_result}")
-        print(f"User ID: {account.uid}")
-        print(f"Token: {account.token[:20]}..." if account.token else "None")
-        print("✅ Account mock test passed\n")
+        async def _refresh(coordinator):
+            begin = time.perf_counter()
+            await coordinator.async_refresh()
+            latencies["refresh"].append(time.perf_counter() - begin)
 
+        begin = time.perf_counter()
+        await asyncio.gather(*(_refresh(coordinator) for coordinator in coordinators))
+        latencies["cycle"].append(time.perf_counter() - begin)
 
-async def main():
-    """Run all tests."""
-    print("=" * 60)
-    print("Mitsubishi Owner Portal - Standalone Tests")
-    print("=" * 60)
-    print()
+    elapsed = time.perf_counter() - started
+    await hass.async_stop(force=True)
+    print(f"{args.vehicles} vehicles x {args.cycles} cycles in {elapsed:.2f} s, "
+          f"{session.requests} portal requests")
+    print(f"Metrics: {json.dumps(account.metrics.as_dict()['totals'], sort_keys=True)}")
+    failed = [coordinator.vin for coordinator in coordinators if not coordinator.last_update_success]
+    if failed:
+        raise SystemExit(f"{len(failed)} vehicles failed to refresh")
 
-    try:
-        await test_vehicle_class()
-        await test_account_mock()
 
-        print("=" * 60)
-        print("✅ All tests passed!")
-        print("=" * 60)
+def main():
+    """Parse arguments and run the profile."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip(),
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--vehicles", type=int, default=10, help="simulated vehicles (default 10)")
+    parser.add_argument("--cycles", type=int, default=5, help="refresh cycles (default 5)")
+    parser.add_argument("--replay", help="vehiclestate JSON file or directory of them to replay")
+    parser.add_argument("--parse-samples", type=int, default=100,
+                        help="responses parsed on their own per cycle (default 100)")
+    parser.add_argument("--token-every", type=int, default=1,
+                        help="refresh the access token every N cycles (default 1)")
+    parser.add_argument("--profile", action="store_true", help="print the cProfile top functions")
+    parser.add_argument("--top", type=int, default=25, help="functions to print with --profile (default 25)")
+    parser.add_argument("--pstats", help="write cProfile statistics to this file")
+    parser.add_argument("--flamegraph", help="write collapsed stacks for a flamegraph to this file")
+    parser.add_argument("--sample-interval", type=float, default=0.001,
+                        help="seconds between stack samples (default 0.001)")
+    args = parser.parse_args()
+    args.token_every = max(1, args.token_every)
+
+    latencies = defaultdict(list)
+    profiler = cProfile.Profile() if args.profile or args.pstats else None
+    sampler = StackSampler(args.sample_interval) if args.flamegraph else None
 
-    except Exception as e:
-        print(f"\n❌ Test failed: {e}")
-        import traceback
+    if sampler:
+        sampler.start()
+    if profiler:
+        profiler.enable()
+    try:
+        asyncio.run(run(args, latencies))
+    finally:
+        if profiler:
+            profiler.disable()
+        if sampler:
+            sampler.stop()
 
-        traceback.print_exc()
-        sys.exit(1)
+    print()
+    print_latencies(latencies)
+    if profiler and args.pstats:
+        profiler.dump_stats(args.pstats)
+        print(f"\ncProfile statistics written to {args.pstats}")
+    if profiler and args.profile:
+        print()
+        pstats.Stats(profiler).sort_stats("cumulative").print_stats(args.top)
+    if sampler:
+        sampler.write(args.flamegraph)
+        print(f"\n{sum(sampler.stacks.values())} stack samples written to {args.flamegraph}")
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    main()
@@ -1,7 +1,8 @@
 """Fixtures for Mitsubishi Owner Portal integration tests."""
 from __future__ import annotations
 
-from unittest.mock import AsyncMock, patch
+from collections.abc import AsyncIterator, Callable
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 from homeassistant.core import HomeAssistant
@@ -21,7 +22,7 @@ def mock_setup_entry() -> None:
 def mock_mitsubishi_account():
     """Mock Mitsubishi Owner Portal account."""
     with patch(
-        "custom_components.mitsubishi_owner_portal.MitsubishiOwnerPortalAccount"
+        "custom_components.mitsubishi_owner_portal.config_flow.MitsubishiOwnerPortalAccount"
     ) as mock_account:
         account = mock_account.return_value
         account.async_login = AsyncMock(return_value=True)
@@ -36,3 +37,28 @@ def mock_mitsubishi_account():
         )
         account.uid = "test_user_id"
         yield account
+
+
+def _mock_response(
+    chunks: list[bytes],
+    content_type: str = "application/json",
+    content_length: int | None = None,
+    headers: dict[str, str] | None = None,
+) -> MagicMock:
+    """Return a mocked response streaming ``chunks``."""
+    response = MagicMock(content_type=content_type, content_length=content_length, headers=headers or {})
+    response.read_chunks = 0
+
+    async def _iter_chunked(size: int) -> AsyncIterator[bytes]:
+        for chunk in chunks:
+            response.read_chunks += 1
+            yield chunk
+
+    response.content.iter_chunked = _iter_chunked
+    return response
+
+
+@pytest.fixture
+def mock_response() -> Callable[..., MagicMock]:
+    """Return a factory of mocked responses streaming chunks of a body."""
+    return _mock_response
@@ -0,0 +1,139 @@
+"""Test the Mitsubishi Owner Portal account client."""
+from __future__ import annotations
+
+import asyncio
+import datetime
+from collections.abc import Callable
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from custom_components.mitsubishi_owner_portal import MitsubishiOwnerPortalAccount
+from custom_components.mitsubishi_owner_portal.const import SESSION_CLOSE_DELAY
+from custom_components.mitsubishi_owner_portal.deadline import refresh_deadline
+
+
+@pytest.fixture
+def http(mock_response: Callable[..., MagicMock]) -> MagicMock:
+    """Return a mocked HTTP session answering with a JSON body."""
+    session = MagicMock()
+    response = mock_response([b'{"vehicles": [{"vin": "TEST123"}]}'])
+    response.status = 200
+
+    async def _request(*args, **kwargs):
+        await asyncio.sleep(0.01)
+        return response
+
+    session.request = AsyncMock(side_effect=_request)
+    with patch(
+        "custom_components.mitsubishi_owner_portal.account.aiohttp_client.async_create_clientsession",
+        return_value=session,
+    ):
+        yield session
+
+
+async def test_concurrent_gets_share_one_request(hass: HomeAssistant, http: MagicMock) -> None:
+    """Test identical concurrent GETs are sent once."""
+    account = MitsubishiOwnerPortalAccount(hass, {"username": "test@example.com", "token": "abc"})
+
+    results = await asyncio.gather(
+        account.request("user/v1/users/1/vehicles"),
+        account.request("user/v1/users/1/vehicles"),
+        account.request("user/v1/users/1/vehicles", {"page": 1}),
+    )
+
+    assert results[0] is results[1]
+    assert http.request.await_count == 2
+    assert account.metrics.totals["requests_deduplicated"] == 1
+    assert account.metrics.endpoints["user/v1/users/*/vehicles"]["bytes_received"] == 68
+
+    await account.request("user/v1/users/1/vehicles")
+    assert http.request.await_count == 3
+
+
+async def test_posts_are_not_shared(hass: HomeAssistant, http: MagicMock) -> None:
+    """Test non-idempotent requests are always sent."""
+    account = MitsubishiOwnerPortalAccount(hass, {"username": "test@example.com"})
+
+    await asyncio.gather(
+        account.request("auth/v1/token", {"grant_type": "password"}, "POST"),
+        account.request("auth/v1/token", {"grant_type": "password"}, "POST"),
+    )
+
+    assert http.request.await_count == 2
+    assert "requests_deduplicated" not in account.metrics.totals
+
+
+async def test_update_config_keeps_tokens_and_swaps_session(hass: HomeAssistant, http: MagicMock) -> None:
+    """Test option changes keep the login and only replace the session for SSL changes."""
+    account = MitsubishiOwnerPortalAccount(
+        hass, {"username": "test@example.com", "password": "secret", "token": "abc", "verify_ssl": True}
+    )
+    session = account.http
+
+    account.async_update_config({"username": "test@example.com", "password": "secret", "scan_interval": 300})
+    assert account.token == "abc"
+    assert account.update_interval.total_seconds() == 300
+    assert account.http is session
+
+    with patch(
+        "custom_components.mitsubishi_owner_portal.account.aiohttp_client.async_create_clientsession",
+        return_value=MagicMock(),
+    ) as create:
+        account.async_update_config({"username": "test@example.com", "password": "secret", "verify_ssl": False})
+    create.assert_called_once()
+    assert account.http is not session
+    assert account.token == "abc"
+
+    session.close = AsyncMock()
+    async_fire_time_changed(hass, dt_util.utcnow() + datetime.timedelta(seconds=SESSION_CLOSE_DELAY))
+    await hass.async_block_till_done()
+    session.close.assert_awaited_once()
+
+
+async def test_not_modified_reuses_last_response(
+    hass: HomeAssistant, http: MagicMock, mock_response: Callable[..., MagicMock]
+) -> None:
+    """Test vehicle state is requested conditionally and a 304 reuses the last response."""
+    account = MitsubishiOwnerPortalAccount(hass, {"username": "test@example.com", "token": "abc"})
+    changed = mock_response([b'{"state": {"ignitionState": "OFF"}}'], headers={"ETag": '"v1"'})
+    changed.status = 200
+    unchanged = mock_response([], headers={"ETag": '"v1"'})
+    unchanged.status = 304
+    http.request = AsyncMock(side_effect=[changed, unchanged])
+
+    first = await account.request("avi/v1/vehicles/TEST123/vehiclestate")
+    second = await account.request("avi/v1/vehicles/TEST123/vehiclestate")
+
+    assert second is first
+    assert "If-None-Match" not in http.request.call_args_list[0].kwargs["headers"]
+    assert http.request.call_args_list[1].kwargs["headers"]["If-None-Match"] == '"v1"'
+    assert account.metrics.vins["TEST123"]["not_modified"] == 1
+    assert account.metrics.vins["TEST123"]["bytes_transferred"] == 35
+    assert account.transfer.requests == 2
+    assert account.transfer.transferred == 35
+
+
+async def test_requests_share_refresh_deadline(hass: HomeAssistant, http: MagicMock) -> None:
+    """Test requests are bounded by the refresh deadline and skipped once it passed."""
+    account = MitsubishiOwnerPortalAccount(
+        hass, {"username": "test@example.com", "timeouts": {"auth": {"connect": 3}}}
+    )
+    with refresh_deadline(5):
+        await account.request("user/v1/users/1/vehicles")
+    timeout = http.request.call_args.kwargs["timeout"]
+    assert 4 < timeout.total <= 5
+    assert (timeout.sock_connect, timeout.sock_read) == (10, 30)
+
+    await account.request("auth/v1/token", {}, "POST")
+    timeout = http.request.call_args.kwargs["timeout"]
+    assert (timeout.total, timeout.sock_connect, timeout.sock_read) == (30, 3, 20)
+
+    with refresh_deadline(0.01):
+        await asyncio.sleep(0.02)
+        assert await account.request("user/v1/users/1/vehicles") == {}
+    assert http.request.await_count == 2
+    assert account.metrics.totals["deadline_exceeded"] == 1
@@ -0,0 +1,71 @@
+"""Test the Mitsubishi Owner Portal fleet aggregates."""
+from __future__ import annotations
+
+import random
+from unittest.mock import MagicMock
+
+from custom_components.mitsubishi_owner_portal.aggregate import FleetAggregate
+
+
+def _data(battery, charging="notCharging", plug="unplugged", electric=None, odometer=None) -> dict:
+    """Return a coordinator snapshot."""
+    return {
+        "Battery": battery,
+        "Charging_Status": charging,
+        "Charging_Plug_Status": plug,
+        "Cruising_Range_Electric": electric,
+        "Odometer": odometer,
+    }
+
+
+def test_updates_replace_previous_contribution() -> None:
+    """Test an update subtracts the vehicle's old values before adding the new ones."""
+    aggregate = FleetAggregate()
+    aggregate.async_update("A", _data(80, "charging", "plugged", 40, 1000))
+    aggregate.async_update("B", _data(40, electric=20, odometer=500))
+    assert aggregate.average_battery == 60
+    assert aggregate.charging == 1
+    assert aggregate.plugged_in == 1
+    assert aggregate.min_electric_range == 20
+    assert aggregate.total_odometer == 1500
+
+    aggregate.async_update("B", _data(60, "charging", "plugged", 30, 510))
+    assert aggregate.average_battery == 70
+    assert aggregate.charging == 2
+    assert aggregate.plugged_in == 2
+    assert aggregate.min_electric_range == 30
+    assert aggregate.total_odometer == 1510
+
+    aggregate.async_update("A", {})
+    assert aggregate.vehicles == 1
+    assert aggregate.average_battery == 60
+    assert aggregate.min_electric_range == 30
+
+
+def test_listeners_only_hear_changes() -> None:
+    """Test repeated identical snapshots do not notify listeners."""
+    aggregate = FleetAggregate()
+    listener = MagicMock()
+    aggregate.async_add_listener(listener)
+    coordinator = MagicMock(vin="A", data=_data(50))
+    aggregate.async_track(coordinator)
+    aggregate.async_update("A", _data(50))
+    assert listener.call_count == 1
+
+
+def test_matches_full_recomputation() -> None:
+    """Test incremental totals agree with totals computed from scratch."""
+    rng = random.Random(42)
+    aggregate = FleetAggregate()
+    latest = {}
+    for _ in range(2000):
+        vin = f"VIN{rng.randrange(50)}"
+        latest[vin] = _data(rng.randrange(101), electric=rng.choice([None, rng.randrange(80)]))
+        aggregate.async_update(vin, latest[vin])
+
+    ranges = [
+        data["Cruising_Range_Electric"] for data in latest.values() if data["Cruising_Range_Electric"] is not None
+    ]
+    assert aggregate.average_battery == round(sum(data["Battery"] for data in latest.values()) / len(latest), 1)
+    assert aggregate.min_electric_range == min(ranges)
+    assert len(aggregate._ranges) <= 2 * len(set(ranges)) + 9
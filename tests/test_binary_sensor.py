@@ -0,0 +1,55 @@
+"""Test the Mitsubishi Owner Portal binary sensors."""
+from __future__ import annotations
+
+from unittest.mock import MagicMock, patch
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.mitsubishi_owner_portal.binary_sensor import (
+    VEHICLE_BINARY_SENSORS,
+    MitsubishiOwnerPortalBinarySensorEntity,
+)
+from custom_components.mitsubishi_owner_portal.entity import Vehicle
+from custom_components.mitsubishi_owner_portal.states import CHARGING, DOOR_OPEN, MAX_ALIASES, StateMap
+
+
+def test_state_maps() -> None:
+    """Test raw portal values are normalized and unknown values map to None."""
+    assert CHARGING("charging") is True
+    assert CHARGING("Not Charging") is False
+    assert CHARGING("notCharging") is False
+    assert CHARGING("unknown") is None
+    assert CHARGING(None) is None
+    assert CHARGING(["junk"]) is None
+    assert DOOR_OPEN(" open ") is True
+    assert DOOR_OPEN("closed") is False
+
+
+def test_state_map_remembers_bounded_aliases() -> None:
+    """Test raw values are cached after the first lookup, up to a limit."""
+    states = StateMap(on=("ON",), off=("OFF",))
+    assert states("on") is True
+    assert dict(states) == {"on": True}
+    for idx in range(2 * MAX_ALIASES):
+        assert states(f"junk{idx}") is None
+    assert len(states) == MAX_ALIASES
+
+
+async def test_written_only_on_transitions(hass: HomeAssistant) -> None:
+    """Test coordinator updates write state only when the mapped value flips."""
+    description = next(desc for desc in VEHICLE_BINARY_SENSORS if desc.key == "Charging_Status")
+    coordinator = MagicMock(data={"Charging_Status": "charging"}, last_update_success=True)
+    entity = MitsubishiOwnerPortalBinarySensorEntity(Vehicle({"vin": "VIN1"}), coordinator, description)
+    assert entity.unique_id == "VIN1_charging"
+    assert entity.is_on is True
+
+    with patch.object(entity, "async_write_ha_state") as write:
+        for status in ("charging", "CHARGING", "notCharging", "stopped", "charging"):
+            coordinator.data = {"Charging_Status": status}
+            entity._handle_coordinator_update()
+        assert write.call_count == 2
+        assert entity.is_on is True
+
+        coordinator.last_update_success = False
+        entity._handle_coordinator_update()
+        assert write.call_count == 3
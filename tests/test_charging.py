@@ -0,0 +1,60 @@
+"""Test the Mitsubishi Owner Portal charging estimates."""
+from __future__ import annotations
+
+import datetime
+
+from custom_components.mitsubishi_owner_portal.charging import ChargingSessionTracker
+
+START = datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc)
+
+
+def _snapshot(minutes: int, battery: float, status: str = "charging", **extra) -> dict:
+    """Build a coordinator snapshot."""
+    return {
+        "Battery": battery,
+        "Event_Timestamp": START + datetime.timedelta(minutes=minutes),
+        "Charging_Status": status,
+        "Charging_Plug_Status": "plugged",
+        **extra,
+    }
+
+
+def test_rate_energy_and_eta() -> None:
+    """Test the estimates follow successive battery samples."""
+    tracker = ChargingSessionTracker(capacity_kwh=20, target=80)
+    assert tracker.update(_snapshot(0, 40)) == {
+        "Charging_Rate": None,
+        "Charging_Energy_Added": 0.0,
+        "Charging_Time_To_Target": None,
+    }
+
+    result = tracker.update(_snapshot(30, 50))
+    assert result["Charging_Rate"] == 20.0
+    assert result["Charging_Energy_Added"] == 2.0
+    assert result["Charging_Time_To_Target"] == 90
+
+    # Repeated polls without a new event timestamp change nothing
+    assert tracker.update(_snapshot(30, 50)) == result
+
+
+def test_reset_on_status_change() -> None:
+    """Test a status change starts a new session."""
+    tracker = ChargingSessionTracker()
+    tracker.update(_snapshot(0, 40))
+    tracker.update(_snapshot(30, 50))
+
+    result = tracker.update(_snapshot(60, 55, status="complete"))
+    assert result == {
+        "Charging_Rate": None,
+        "Charging_Energy_Added": 0.0,
+        "Charging_Time_To_Target": None,
+    }
+
+
+def test_eta_cross_checked_against_portal() -> None:
+    """Test the portal estimate wins when ours is far off."""
+    tracker = ChargingSessionTracker(target=100)
+    tracker.update(_snapshot(0, 40))
+
+    result = tracker.update(_snapshot(60, 41, Time_To_Full_Charge=240))
+    assert result["Charging_Time_To_Target"] == 240
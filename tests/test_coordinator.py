@@ -0,0 +1,131 @@
+"""Test the Mitsubishi Owner Portal vehicle coordinator."""
+from __future__ import annotations
+
+import asyncio
+import datetime
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from homeassistant.core import HomeAssistant
+
+from custom_components.mitsubishi_owner_portal import VehiclesCoordinator
+from custom_components.mitsubishi_owner_portal.fleet import RequestMetrics
+
+
+@pytest.fixture
+def account(hass: HomeAssistant) -> MagicMock:
+    """Return a mocked account."""
+    account = MagicMock()
+    account.hass = hass
+    account.uid = "test_uid"
+    account.username = "test@example.com"
+    account.update_interval = datetime.timedelta(minutes=1)
+    account.refresh_cooldown = 60
+    account.refresh_deadline = 45
+    account.battery_capacity = 20
+    account.charge_target = 100
+    account.metrics = RequestMetrics()
+    return account
+
+
+async def test_forced_refresh_coalesces_and_cools_down(hass: HomeAssistant, account: MagicMock) -> None:
+    """Test a burst of refresh requests costs one fetch."""
+    coordinator = VehiclesCoordinator("TEST123", account, remote=MagicMock())
+    release = asyncio.Event()
+
+    async def _fetch() -> dict:
+        await release.wait()
+        return {"Battery": 50}
+
+    with patch.object(coordinator, "update_vehicle_detail", AsyncMock(side_effect=_fetch)) as fetch:
+        calls = [asyncio.ensure_future(coordinator.async_forced_refresh()) for _ in range(5)]
+        await asyncio.sleep(0)
+        release.set()
+        assert sorted(await asyncio.gather(*calls)) == [False, False, False, False, True]
+        assert fetch.await_count == 1
+
+        assert not await coordinator.async_forced_refresh()
+        assert fetch.await_count == 1
+
+    assert account.metrics.totals["refresh_coalesced"] == 4
+    assert account.metrics.totals["refresh_cooldown"] == 1
+    assert coordinator.data["Battery"] == 50
+
+
+async def test_apply_options_reschedules_without_fetching(hass: HomeAssistant, account: MagicMock) -> None:
+    """Test a new update interval takes effect in place."""
+    coordinator = VehiclesCoordinator("TEST123", account, remote=MagicMock())
+    unsub = coordinator.async_add_listener(lambda: None)
+    account.update_interval = datetime.timedelta(minutes=10)
+    account.battery_capacity = 40
+
+    with patch.object(coordinator, "update_vehicle_detail", AsyncMock()) as fetch:
+        coordinator.async_apply_options()
+
+    assert coordinator.update_interval == datetime.timedelta(minutes=10)
+    assert coordinator.charging.capacity_kwh == 40
+    fetch.assert_not_awaited()
+    unsub()
+
+
+async def test_refresh_past_deadline_keeps_last_state(hass: HomeAssistant, account: MagicMock) -> None:
+    """Test a refresh that runs out of time returns the last state instead of retrying."""
+    coordinator = VehiclesCoordinator("TEST123", account, remote=MagicMock())
+    coordinator._parsed = {"Battery": 50}
+    account.refresh_deadline = 0.01
+    account.async_check_token = AsyncMock()
+    account.async_login = AsyncMock(return_value=True)
+
+    async def _slow_request(api: str) -> dict:
+        await asyncio.sleep(0.02)
+        return {}
+
+    account.request = AsyncMock(side_effect=_slow_request)
+    assert (await coordinator._async_update_data())["Battery"] == 50
+    account.async_login.assert_not_awaited()
+    assert account.metrics.vins["TEST123"]["refresh_deadline_exceeded"] == 1
+
+
+async def test_overlapping_refreshes_merge(hass: HomeAssistant, account: MagicMock) -> None:
+    """Test a refresh starting during a running one shares its fetch."""
+    coordinator = VehiclesCoordinator("TEST123", account, remote=MagicMock())
+    release = asyncio.Event()
+
+    async def _fetch() -> dict:
+        await release.wait()
+        return {"Battery": 50}
+
+    with patch.object(coordinator, "update_vehicle_detail", AsyncMock(side_effect=_fetch)) as fetch:
+        running = asyncio.ensure_future(coordinator.async_refresh())
+        await asyncio.sleep(0)
+        merged = asyncio.ensure_future(coordinator.async_refresh())
+        await asyncio.sleep(0)
+        release.set()
+        await asyncio.gather(running, merged)
+        assert fetch.await_count == 1
+        assert account.metrics.vins["TEST123"]["refresh_merged"] == 1
+
+        # Once the shared fetch is done the next refresh fetches again
+        await coordinator.async_refresh()
+        assert fetch.await_count == 2
+
+    assert coordinator.data["Battery"] == 50
+
+
+async def test_slow_refreshes_raise_interval(hass: HomeAssistant, account: MagicMock) -> None:
+    """Test sustained slow refreshes back the interval off until refreshes are fast again."""
+    coordinator = VehiclesCoordinator("TEST123", account, remote=MagicMock())
+    unsub = coordinator.async_add_listener(lambda: None)
+
+    for _ in range(3):
+        coordinator._record_duration(45)
+    assert coordinator.update_interval == datetime.timedelta(seconds=90)
+    assert account.metrics.vins["TEST123"]["interval_raised"] == 1
+
+    coordinator._record_duration(1)
+    coordinator._record_duration(1)
+    assert coordinator.update_interval == datetime.timedelta(seconds=90)
+    coordinator._record_duration(1)
+    assert coordinator.update_interval == datetime.timedelta(minutes=1)
+    assert account.metrics.vins["TEST123"]["interval_restored"] == 1
+    unsub()
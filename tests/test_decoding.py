@@ -0,0 +1,109 @@
+"""Test the Mitsubishi Owner Portal response decoding."""
+from __future__ import annotations
+
+import gzip
+import json
+from collections.abc import Callable
+from unittest.mock import MagicMock
+
+import pytest
+
+from custom_components.mitsubishi_owner_portal import decoding
+from custom_components.mitsubishi_owner_portal.decoding import (
+    ResponseNotJson,
+    ResponseTooLarge,
+    async_read_json,
+    endpoint_name,
+)
+
+
+async def test_read_json(mock_response: Callable[..., MagicMock]) -> None:
+    """Test a chunked body is decoded and measured."""
+    response = mock_response([b'  {"state": {"chargingControl": ', b'{"hvBatteryLife": "80"}}}'])
+    data, transferred, size = await async_read_json(response)
+    assert data == {"state": {"chargingControl": {"hvBatteryLife": "80"}}}
+    assert transferred == size == 57
+    assert await async_read_json(mock_response([])) == (None, 0, 0)
+
+
+async def test_read_compressed_json(mock_response: Callable[..., MagicMock]) -> None:
+    """Test gzip bodies are inflated and both sizes reported."""
+    raw = json.dumps({"vehicles": [{"vin": f"VIN{idx}"} for idx in range(100)]}).encode()
+    compressed = gzip.compress(raw)
+    chunks = [compressed[idx:idx + 100] for idx in range(0, len(compressed), 100)]
+    response = mock_response(chunks, headers={"Content-Encoding": "gzip"})
+
+    data, transferred, size = await async_read_json(response)
+    assert len(data["vehicles"]) == 100
+    assert transferred == len(compressed)
+    assert size == len(raw)
+
+    # A small compressed body must not inflate past the limit
+    response = mock_response([gzip.compress(b"[" + b" " * 100000 + b"]")], headers={"Content-Encoding": "gzip"})
+    with pytest.raises(ResponseTooLarge):
+        await async_read_json(response, max_size=1000)
+
+
+class _ExpandingDecompressor:
+    """Stand-in for brotli.Decompressor turning every input byte into 1000."""
+
+    def __init__(self) -> None:
+        self.pending = b""
+
+    def process(self, data: bytes, output_buffer_limit: int) -> bytes:
+        self.pending += b"".join(bytes([byte]) * 1000 for byte in data)
+        out, self.pending = self.pending[:output_buffer_limit], self.pending[output_buffer_limit:]
+        return out
+
+    def can_accept_more_data(self) -> bool:
+        return not self.pending
+
+
+async def test_brotli_output_is_bounded(
+    mock_response: Callable[..., MagicMock], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test a small brotli chunk cannot inflate past the limit in one call."""
+    monkeypatch.setattr(decoding, "brotli", MagicMock(Decompressor=_ExpandingDecompressor, error=RuntimeError))
+    response = mock_response([b"[ ]"], headers={"Content-Encoding": "br"})
+    with pytest.raises(ResponseTooLarge):
+        await async_read_json(response, max_size=1000)
+
+
+async def test_oversized_body_aborts_early(mock_response: Callable[..., MagicMock]) -> None:
+    """Test oversized bodies are dropped without reading them all."""
+    response = mock_response([b"{}"], content_length=100)
+    with pytest.raises(ResponseTooLarge):
+        await async_read_json(response, max_size=10)
+    assert response.read_chunks == 0
+    response.close.assert_called_once()
+
+    response = mock_response([b'{"a": "', b"x" * 8, b"x" * 8, b'"}'])
+    with pytest.raises(ResponseTooLarge):
+        await async_read_json(response, max_size=10)
+    assert response.read_chunks == 2
+
+
+async def test_non_json_body_aborts_early(mock_response: Callable[..., MagicMock]) -> None:
+    """Test error pages are rejected on their first bytes."""
+    response = mock_response([b"<html>", b"<body>error</body></html>"], content_type="application/octet-stream")
+    with pytest.raises(ResponseNotJson):
+        await async_read_json(response)
+    assert response.read_chunks == 1
+
+    response = mock_response([b"<html></html>"], content_type="text/html")
+    with pytest.raises(ResponseNotJson):
+        await async_read_json(response)
+    assert response.read_chunks == 0
+
+    with pytest.raises(ResponseNotJson):
+        await async_read_json(mock_response([b'{"broken": ']))
+
+
+def test_endpoint_name() -> None:
+    """Test ids are masked in endpoint names."""
+    assert endpoint_name("https://example.com/avi/v1/vehicles/VIN123/vehiclestate") == "avi/v1/vehicles/*/vehiclestate"
+    assert endpoint_name("https://example.com/user/v1/users/uid1/vehicles") == "user/v1/users/*/vehicles"
+    assert (
+        endpoint_name("https://example.com/avi/v1/remoteOperation/vehicles/VIN123/events/42")
+        == "avi/v1/remoteOperation/vehicles/*/events/*"
+    )
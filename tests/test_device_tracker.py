@@ -0,0 +1,30 @@
+"""Test the Mitsubishi Owner Portal device tracker."""
+from __future__ import annotations
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.mitsubishi_owner_portal.device_tracker import ZoneIndex
+
+
+async def test_zone_index_follows_zone_changes(hass: HomeAssistant) -> None:
+    """Test zone lookups use the boxes rebuilt on zone changes."""
+    hass.states.async_set("zone.home", "0", {"latitude": 35.0, "longitude": 139.0, "radius": 100})
+    hass.states.async_set("zone.work", "0", {"latitude": 35.1, "longitude": 139.1, "radius": 500})
+    hass.states.async_set("zone.hidden", "0", {"latitude": 35.0, "longitude": 139.0, "radius": 1000, "passive": True})
+
+    zones = ZoneIndex(hass)
+    zones.async_start()
+    assert len(zones.boxes) == 2
+
+    assert zones.active_zone(35.0005, 139.0005).entity_id == "zone.home"
+    assert zones.active_zone(35.1, 139.103).entity_id == "zone.work"
+    assert zones.active_zone(35.05, 139.05) is None
+
+    hass.states.async_set("zone.park", "0", {"latitude": 35.05, "longitude": 139.05, "radius": 200})
+    await hass.async_block_till_done()
+    assert zones.active_zone(35.05, 139.05).entity_id == "zone.park"
+
+    zones.async_stop()
+    hass.states.async_remove("zone.park")
+    await hass.async_block_till_done()
+    assert len(zones.boxes) == 3
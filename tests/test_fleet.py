@@ -0,0 +1,88 @@
+"""Test the Mitsubishi Owner Portal multi-account helpers."""
+from __future__ import annotations
+
+import asyncio
+import datetime
+from unittest.mock import AsyncMock, MagicMock
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.mitsubishi_owner_portal.fleet import (
+    AdaptiveInterval,
+    FleetScheduler,
+    RateLimiter,
+    RequestMetrics,
+)
+
+
+async def test_rate_limiter_caps_concurrency() -> None:
+    """Test no more than the configured number of requests run at once."""
+    limiter = RateLimiter(max_concurrent=2, min_interval=0)
+    running = 0
+    peak = 0
+
+    async def _request() -> None:
+        nonlocal running, peak
+        async with limiter:
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+
+    await asyncio.gather(*(_request() for _ in range(6)))
+    assert peak == 2
+
+
+async def test_scheduler_refreshes_all_and_skips_overlap(hass: HomeAssistant) -> None:
+    """Test one tick refreshes every coordinator and overlapping ticks are skipped."""
+    release = asyncio.Event()
+    coordinators = [MagicMock(async_refresh=AsyncMock(side_effect=release.wait)) for _ in range(3)]
+    metrics = RequestMetrics()
+    scheduler = FleetScheduler(hass, datetime.timedelta(minutes=1), coordinators, metrics)
+
+    scheduler._async_tick(None)
+    scheduler._async_tick(None)
+    release.set()
+    await scheduler._task
+
+    for coordinator in coordinators:
+        coordinator.async_refresh.assert_awaited_once()
+    assert metrics.totals["ticks"] == 1
+    assert metrics.totals["ticks_skipped"] == 1
+
+
+def test_adaptive_interval_backs_off() -> None:
+    """Test the interval grows after sustained slow refreshes, within bounds."""
+    adaptive = AdaptiveInterval(datetime.timedelta(minutes=1))
+    assert not adaptive.record(40)
+    assert not adaptive.record(40)
+    assert adaptive.record(40)
+    assert adaptive.interval == datetime.timedelta(seconds=80)
+
+    for _ in range(10):
+        adaptive.record(600)
+    assert adaptive.interval == datetime.timedelta(minutes=4)
+
+    # A lone fast refresh between slow ones keeps the raised interval
+    assert not adaptive.record(5)
+    adaptive.record(600)
+    assert adaptive.interval == datetime.timedelta(minutes=4)
+
+    assert not adaptive.record(5)
+    assert not adaptive.record(5)
+    assert adaptive.record(5)
+    assert adaptive.interval == datetime.timedelta(minutes=1)
+    assert not adaptive.record(5)
+
+
+def test_metrics_per_account() -> None:
+    """Test counters are kept in total, per account and per endpoint."""
+    metrics = RequestMetrics()
+    metrics.increment("requests", "a@example.com")
+    metrics.increment("requests", "b@example.com", 2, endpoint="auth/v1/token")
+    assert metrics.as_dict() == {
+        "totals": {"requests": 3},
+        "accounts": {"a@example.com": {"requests": 1}, "b@example.com": {"requests": 2}},
+        "endpoints": {"auth/v1/token": {"requests": 2}},
+        "vins": {},
+    }
@@ -0,0 +1,136 @@
+"""Test the Mitsubishi Owner Portal telemetry history."""
+from __future__ import annotations
+
+import datetime
+import math
+import time
+from unittest.mock import AsyncMock, patch
+
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.mitsubishi_owner_portal.const import DOMAIN
+from custom_components.mitsubishi_owner_portal.history import VehicleHistory
+
+
+def test_append_wraps_and_keeps_order() -> None:
+    """Test the buffer overwrites the oldest samples when full."""
+    history = VehicleHistory(capacity=3)
+    for ts in range(5):
+        assert history.append(float(ts), {"Battery": ts * 10})
+
+    assert len(history) == 3
+    assert history.window("Battery") == [(2.0, 20.0), (3.0, 30.0), (4.0, 40.0)]
+    assert history.latest("Battery") == (4.0, 40.0)
+
+
+def test_append_ignores_stale_samples() -> None:
+    """Test samples that are not newer than the last one are dropped."""
+    history = VehicleHistory(capacity=4)
+    assert history.append(10.0, {"Battery": 50})
+    assert not history.append(10.0, {"Battery": 51})
+    assert not history.append(5.0, {"Battery": 52})
+    assert len(history) == 1
+
+
+def test_append_snapshot_uses_event_timestamp() -> None:
+    """Test snapshots are keyed by their event timestamp."""
+    history = VehicleHistory(capacity=4)
+    event = datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc)
+    assert history.append_snapshot({"Event_Timestamp": event, "Odometer": 1234, "Temperature": None})
+    assert not history.append_snapshot({"Event_Timestamp": event, "Odometer": 1235})
+
+    assert history.latest("Odometer") == (event.timestamp(), 1234.0)
+    assert history.latest("Temperature") is None
+
+
+def test_window_aggregate() -> None:
+    """Test windowed aggregate queries skip missing values."""
+    history = VehicleHistory(capacity=10)
+    for ts, battery in enumerate([20, None, 40, 60, 80]):
+        history.append(float(ts * 60), {"Battery": battery})
+
+    assert history.aggregate("Battery", seconds=60, now=240) == {
+        "count": 2,
+        "min": 60.0,
+        "max": 80.0,
+        "mean": 70.0,
+        "first": 60.0,
+        "last": 80.0,
+        "delta": 20.0,
+        "start": 180.0,
+        "end": 240.0,
+    }
+    assert history.aggregate("Battery")["count"] == 4
+    assert history.aggregate("Temperature") == {"count": 0}
+
+
+def test_round_trip_trims_to_capacity() -> None:
+    """Test serialized buffers restore in order and respect a smaller capacity."""
+    history = VehicleHistory(capacity=4)
+    for ts in range(6):
+        history.append(float(ts), {"Battery": ts, "Location_Latitude": 35.0 + ts})
+
+    restored = VehicleHistory.from_dict(history.as_dict())
+    assert restored.window("Location_Latitude") == history.window("Location_Latitude")
+
+    trimmed = VehicleHistory.from_dict(history.as_dict(), capacity=2)
+    assert trimmed.window("Battery") == [(4.0, 4.0), (5.0, 5.0)]
+    assert math.isnan(trimmed._cols["Odometer"][0])
+
+
+def test_buffer_grows_lazily() -> None:
+    """Test a new buffer allocates only for the samples it holds."""
+    history = VehicleHistory(capacity=1440)
+    assert len(history._ts) == 0
+    for ts in range(3):
+        history.append(float(ts), {"Battery": ts})
+    assert len(history._ts) == len(history._cols["Battery"]) == 3
+    assert history.window("Battery") == [(0.0, 0.0), (1.0, 1.0), (2.0, 2.0)]
+
+
+async def test_get_history_service(hass: HomeAssistant, enable_custom_integrations) -> None:
+    """Test the service answers windowed aggregates from the history of each vehicle."""
+    vehicles = [{"vin": vin, "model": "GN0W", "modelDescription": "Outlander PHEV"} for vin in ("VIN1", "VIN2")]
+    account = {"username": "test@example.com", "password": "secret", "uid": "uid", "token": "access"}
+    entry = MockConfigEntry(domain=DOMAIN, data={"account": account})
+    entry.add_to_hass(hass)
+    with patch(
+        "custom_components.mitsubishi_owner_portal.account.aiohttp_client.async_create_clientsession"
+    ) as create_session, patch(
+        "custom_components.mitsubishi_owner_portal.MitsubishiOwnerPortalAccount.async_get_vehicles",
+        AsyncMock(return_value=vehicles),
+    ), patch(
+        "custom_components.mitsubishi_owner_portal.VehiclesCoordinator.update_vehicle_detail",
+        AsyncMock(return_value={"Battery": 50, "Event_Timestamp": dt_util.utcnow() - datetime.timedelta(days=3)}),
+    ):
+        create_session.return_value.close = AsyncMock()
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+
+        history = next(
+            v["coordinator"].history for v in hass.data[DOMAIN][entry.entry_id]["vhs"] if v["vh"].vin == "VIN1"
+        )
+        now = time.time()
+        for hours_ago, battery in ((30, 90), (2, 80), (1, 60)):
+            history.append(now - hours_ago * 3600, {"Battery": battery})
+
+        response = await hass.services.async_call(
+            DOMAIN,
+            "get_history",
+            {"vin": "VIN1", "field": "Battery", "hours": 24},
+            blocking=True,
+            return_response=True,
+        )
+        assert response["vehicles"]["VIN1"]["count"] == 2
+        assert response["vehicles"]["VIN1"]["delta"] == -20
+
+        response = await hass.services.async_call(
+            DOMAIN, "get_history", {"field": "Battery"}, blocking=True, return_response=True
+        )
+        assert response["vehicles"]["VIN1"]["count"] == 4
+        assert response["vehicles"]["VIN1"]["max"] == 90
+        assert response["vehicles"]["VIN2"]["count"] == 1
+
+        await hass.config_entries.async_remove(entry.entry_id)
@@ -0,0 +1,75 @@
+"""Import-time regression gate for the Mitsubishi Owner Portal integration."""
+from __future__ import annotations
+
+import json
+import pathlib
+import subprocess
+import sys
+
+PACKAGE = "custom_components.mitsubishi_owner_portal"
+
+# Modules a running Home Assistant has loaded before it imports the integration
+PRELOADED = (
+    "homeassistant.core",
+    "homeassistant.config_entries",
+    "homeassistant.helpers.config_validation",
+    "homeassistant.helpers.entity",
+    "homeassistant.helpers.event",
+    "homeassistant.helpers.storage",
+    "homeassistant.helpers.aiohttp_client",
+    "homeassistant.helpers.update_coordinator",
+)
+
+# Modules only needed by flows, error paths or the first refresh
+LAZY = (
+    f"{PACKAGE}.config_flow",
+    f"{PACKAGE}.parser",
+    "homeassistant.components.persistent_notification",
+    "homeassistant.helpers.issue_registry",
+    "homeassistant.components.recorder",
+)
+
+# Cumulative microseconds the integration may add on top of PRELOADED
+IMPORT_BUDGET_US = 100_000
+
+SCRIPT = f"""
+import json, sys
+import {", ".join(PRELOADED)}
+before = set(sys.modules)
+print("{PACKAGE}", file=sys.stderr, flush=True)
+import {PACKAGE}
+print(json.dumps(sorted(set(sys.modules) - before)))
+"""
+
+
+def _import_integration() -> tuple[list[str], dict[str, int]]:
+    """Import the integration in a fresh interpreter with ``-X importtime``.
+
+    Returns the modules the import added and the cumulative import time in
+    microseconds of each top-level module it imported.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", SCRIPT],
+        cwd=pathlib.Path(__file__).parent.parent,
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+    # Lines after the marker look like "import time:  <self> | <cumulative> | <name>"
+    lines = result.stderr.splitlines()
+    cumulative = {}
+    for line in lines[lines.index(PACKAGE) + 1:]:
+        _, cumulative_us, name = line.removeprefix("import time:").split("|")
+        if not name.startswith("  "):
+            cumulative[name.strip()] = int(cumulative_us)
+    return json.loads(result.stdout), cumulative
+
+
+def test_import_time() -> None:
+    """Test the integration imports quickly and leaves rarely used code unloaded."""
+    added, cumulative = _import_integration()
+
+    assert PACKAGE in added
+    assert not [module for module in LAZY if module in added]
+    total = sum(cumulative.values())
+    assert total < IMPORT_BUDGET_US, f"Import took {total} us: {cumulative}"
@@ -1,12 +1,21 @@
 """Test Mitsubishi Owner Portal setup process."""
 from __future__ import annotations
 
+from typing import Any
 from unittest.mock import AsyncMock, patch
 
 import pytest
+from aiohttp import DummyCookieJar
 from homeassistant.core import HomeAssistant
-from homeassistant.config_entries import ConfigEntry
+from homeassistant.config_entries import SOURCE_IMPORT, ConfigEntry
+from homeassistant.setup import async_setup_component
+from pytest_homeassistant_custom_component.common import MockConfigEntry
 
+from custom_components.mitsubishi_owner_portal import (
+    MitsubishiOwnerPortalAccount,
+    _async_pop_handoff,
+    async_handoff_account,
+)
 from custom_components.mitsubishi_owner_portal.const import DOMAIN
 
 
@@ -61,3 +70,93 @@ async def test_setup_entry(
             await hass.async_block_till_done()
 
     assert mock_config_entry.entry_id in hass.data[DOMAIN]
+
+
+async def test_setup_reuses_account_from_config_flow(hass: HomeAssistant) -> None:
+    """Test the entry setup takes over the logged-in account of the config flow."""
+    account_data = {
+        "username": "test@example.com",
+        "password": "test_password",
+        "uid": "test_uid",
+        "token": "access",
+        "refresh_token": "refresh",
+    }
+    with patch("custom_components.mitsubishi_owner_portal.account.aiohttp_client.async_create_clientsession"):
+        account = MitsubishiOwnerPortalAccount(hass, dict(account_data))
+    async_handoff_account(hass, account)
+
+    other = MockConfigEntry(domain=DOMAIN, data={"account": {**account_data, "username": "other@example.com"}})
+    assert _async_pop_handoff(hass, other) is None
+
+    entry = MockConfigEntry(domain=DOMAIN, data={"account": account_data})
+    assert _async_pop_handoff(hass, entry) is account
+    assert account.entry is entry
+    assert account.token == "access"
+    assert _async_pop_handoff(hass, entry) is None
+
+
+async def test_fleet_from_yaml(hass: HomeAssistant, enable_custom_integrations) -> None:
+    """Test a YAML fleet sets up each account on its own and saves tokens per account."""
+    accounts = [
+        {"username": "broken@example.com", "password": "secret"},
+        {"username": "fleet@example.com", "password": "secret"},
+    ]
+
+    listed = []
+
+    async def _get_vehicles(self) -> list[dict[str, Any]]:
+        listed.append(self.username)
+        if self.username == "broken@example.com":
+            if self.password == "secret":
+                raise RuntimeError("wrong password")
+            return [{"vin": "BROKEN1", "model": "GN0W", "modelDescription": "Outlander PHEV"}]
+        return [{"vin": "FLEET1", "model": "GN0W", "modelDescription": "Outlander PHEV"}]
+
+    async def _request(self, api: str, pms=None, method: str = "GET") -> dict[str, Any]:
+        return {"access_token": f"access-{self.username}", "refresh_token": "refresh", "accountDN": "uid"}
+
+    with patch(
+        "custom_components.mitsubishi_owner_portal.fleet.aiohttp_client.async_create_clientsession"
+    ) as create_session, patch(
+        "custom_components.mitsubishi_owner_portal.MitsubishiOwnerPortalAccount.async_get_vehicles", _get_vehicles
+    ), patch(
+        "custom_components.mitsubishi_owner_portal.MitsubishiOwnerPortalAccount.request", _request
+    ), patch(
+        "custom_components.mitsubishi_owner_portal.VehiclesCoordinator.update_vehicle_detail",
+        AsyncMock(return_value={"Battery": 50}),
+    ):
+        create_session.return_value.close = AsyncMock()
+        assert await async_setup_component(hass, DOMAIN, {DOMAIN: {"accounts": accounts}})
+        await hass.async_block_till_done()
+
+        entry = hass.config_entries.async_entries(DOMAIN)[0]
+        entry_data = hass.data[DOMAIN][entry.entry_id]
+        # The failing account must not take the other one down
+        assert [v["vh"].vin for v in entry_data["vhs"]] == ["FLEET1"]
+        assert entry_data["vhs"][0]["coordinator"].data["Battery"] == 50
+        # One cookie-less session pooled by both accounts
+        assert create_session.call_count == 1
+        assert isinstance(create_session.call_args.kwargs["cookie_jar"], DummyCookieJar)
+
+        fleet_account = entry_data["accounts"][1]
+        assert await fleet_account.async_login()
+        assert entry.data["accounts"][1]["token"] == "access-fleet@example.com"
+        assert "token" not in entry.data["accounts"][0]
+
+        # Importing again keeps the tokens of accounts whose password did not change
+        changed = [{**accounts[0], "password": "new"}, accounts[1]]
+        result = await hass.config_entries.flow.async_init(
+            DOMAIN, context={"source": SOURCE_IMPORT}, data={**entry.data, "accounts": changed}
+        )
+        await hass.async_block_till_done()
+        assert result["reason"] == "already_configured"
+        assert entry.data["accounts"][0]["password"] == "new"
+        assert entry.data["accounts"][1]["token"] == "access-fleet@example.com"
+        # The reload that applied the import kept the pooled session
+        assert create_session.call_count == 1
+        # and listed only the account that had failed, now with its fixed password
+        assert sorted(listed) == ["broken@example.com", "broken@example.com", "fleet@example.com"]
+        assert sorted(v["vh"].vin for v in hass.data[DOMAIN][entry.entry_id]["vhs"]) == ["BROKEN1", "FLEET1"]
+
+        await hass.config_entries.async_remove(entry.entry_id)
+        create_session.return_value.close.assert_awaited_once()
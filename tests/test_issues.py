@@ -0,0 +1,50 @@
+"""Test the Mitsubishi Owner Portal SSL repair issue."""
+from __future__ import annotations
+
+from unittest.mock import patch
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import issue_registry as ir
+
+from custom_components.mitsubishi_owner_portal.const import DOMAIN
+from custom_components.mitsubishi_owner_portal.issues import NOTIFICATION_INTERVAL, async_get_ssl_issues
+
+
+async def test_issue_raised_once_and_cleared(hass: HomeAssistant) -> None:
+    """Test an outage creates one issue, counts the rest and clears on success."""
+    tracker = async_get_ssl_issues(hass, "entry")
+    registry = ir.async_get(hass)
+
+    with patch("homeassistant.components.persistent_notification.async_create") as notify, patch.object(
+        ir, "async_create_issue", wraps=ir.async_create_issue
+    ) as create_issue:
+        results = [tracker.async_failure("https://example.com", "certificate expired") for _ in range(100)]
+
+    assert results.count(True) == 1
+    assert create_issue.call_count == 1
+    assert notify.call_count == 1
+    assert tracker.suppressed == 99
+    assert registry.async_get_issue(DOMAIN, "ssl_certificate_error_entry")
+
+    with patch("homeassistant.components.persistent_notification.async_dismiss") as dismiss:
+        tracker.async_success()
+        tracker.async_success()
+
+    assert dismiss.call_count == 1
+    assert tracker.suppressed == 0
+    assert registry.async_get_issue(DOMAIN, "ssl_certificate_error_entry") is None
+    assert async_get_ssl_issues(hass, "entry") is tracker
+
+
+async def test_notification_refreshed_after_interval(hass: HomeAssistant) -> None:
+    """Test a lasting outage updates the notification at the configured rate."""
+    tracker = async_get_ssl_issues(hass, "entry")
+
+    with patch("homeassistant.components.persistent_notification.async_create") as notify:
+        assert tracker.async_failure("https://example.com", "certificate expired")
+        assert not tracker.async_failure("https://example.com", "certificate expired")
+        tracker._notified -= NOTIFICATION_INTERVAL
+        assert tracker.async_failure("https://example.com", "certificate expired")
+
+    assert notify.call_count == 2
+    assert "1 further failures" in notify.call_args.args[1]
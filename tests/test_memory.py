@@ -0,0 +1,171 @@
+"""Memory footprint regression gate for large Mitsubishi Owner Portal fleets.
+
+The default run measures a small fleet. Set MITSUBISHI_MEMORY_VEHICLES and
+MITSUBISHI_MEMORY_CYCLES to measure a large one, e.g.
+
+    MITSUBISHI_MEMORY_VEHICLES=1000 MITSUBISHI_MEMORY_CYCLES=5 pytest tests/test_memory.py
+"""
+from __future__ import annotations
+
+import gc
+import logging
+import os
+import tracemalloc
+from typing import Any
+from unittest.mock import AsyncMock, patch
+
+from homeassistant.const import EVENT_HOMEASSISTANT_FINAL_WRITE
+from homeassistant.core import HomeAssistant
+from homeassistant.data_entry_flow import FlowResultType
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.mitsubishi_owner_portal.const import DOMAIN
+from custom_components.mitsubishi_owner_portal.history import DEFAULT_HISTORY_SIZE, HISTORY_FIELDS
+
+VEHICLES = int(os.environ.get("MITSUBISHI_MEMORY_VEHICLES", 100))
+# At least 4: the first cycle warms caches up, then cycles two apart are compared
+CYCLES = max(int(os.environ.get("MITSUBISHI_MEMORY_CYCLES", 4)), 4)
+# A full history at the default size: a timestamp and every field as doubles
+HISTORY_BYTES_PER_VEHICLE = DEFAULT_HISTORY_SIZE * 8 * (len(HISTORY_FIELDS) + 1)
+# Retained bytes per vehicle, including Home Assistant's share for its entities
+BYTES_PER_VEHICLE = 500_000 + HISTORY_BYTES_PER_VEHICLE
+# Retained bytes per vehicle allocated by the integration itself
+OWN_BYTES_PER_VEHICLE = 24_000 + HISTORY_BYTES_PER_VEHICLE
+# Bytes per vehicle the fleet may grow by between later refresh cycles
+GROWTH_PER_VEHICLE = 512
+
+ACCOUNT = {
+    "username": "fleet@example.com",
+    "password": "secret",
+    "uid": "uid",
+    "token": "access",
+}
+
+
+def _vehicle(idx: int) -> dict[str, Any]:
+    """Return a vehicle as listed by the portal."""
+    return {"vin": f"VIN{idx:014d}", "model": "GN0W", "modelDescription": "Outlander PHEV"}
+
+
+def _vehiclestate(vin: str, cycle: int) -> dict[str, Any]:
+    """Return a fresh vehiclestate response, as the portal would."""
+    ts = 1_700_000_000_000 + cycle * 60_000
+    return {
+        "vin": vin,
+        "state": {
+            "chargingControl": {
+                "hvBatteryLife": str(50 + cycle % 40),
+                "hvChargingStatus": "charging" if cycle % 2 else "notCharging",
+                "hvChargingPlugStatus": "plugged",
+                "hvTimeToFullCharge": "120",
+                "eventTimestamp": str(ts),
+                "cruisingRangeCombined": "500",
+                "cruisingRangeFirst": [{"range": "450"}, {"engineType": "4"}],
+                "cruisingRangeSecond": [{"range": "50"}, {"engineType": "5"}],
+            },
+            "extLocMap": {"lat": 35.0 + cycle / 1000, "lon": 139.0, "ts": str(ts)},
+            "odo": [{"2024-01-01 00:00:00": str(10_000 + cycle)}],
+            "ignitionState": "OFF",
+            "ignitionStateTs": str(ts),
+            "theftAlarm": "OFF",
+            "privacy": "OFF",
+            "temp": "20",
+            "accessible": "true",
+            "ods": "closed",
+            "diagnostic": "ok",
+        },
+    }
+
+
+async def test_memory_per_vehicle(hass: HomeAssistant, enable_custom_integrations, caplog) -> None:
+    """Test a large fleet stays within its memory budget and stops growing."""
+    # Captured log records of a fleet's entities would dominate the measurement
+    caplog.set_level(logging.WARNING)
+    # Debug mode keeps a creation traceback of every task and handle, unlike production
+    hass.loop.set_debug(False)
+    cycle = 0
+    sessions = []
+
+    # Plain functions rather than mocks, which would record every call
+    async def _request(self, api: str, pms=None, method: str = "GET") -> dict[str, Any]:
+        return _vehiclestate(api.split("/")[3], cycle)
+
+    async def _check_token(self) -> None:
+        return None
+
+    def _create_session(*args, **kwargs):
+        session = AsyncMock()
+        sessions.append(session)
+        return session
+
+    entry = MockConfigEntry(domain=DOMAIN, data={"account": ACCOUNT, "vehicles": [_vehicle(0)]})
+    entry.add_to_hass(hass)
+    with patch(
+        "custom_components.mitsubishi_owner_portal.account.aiohttp_client.async_create_clientsession",
+        side_effect=_create_session,
+    ), patch(
+        "custom_components.mitsubishi_owner_portal.MitsubishiOwnerPortalAccount.async_get_vehicles",
+        AsyncMock(return_value=[_vehicle(idx) for idx in range(VEHICLES)]),
+    ), patch(
+        "custom_components.mitsubishi_owner_portal.MitsubishiOwnerPortalAccount.async_check_token", _check_token
+    ), patch(
+        "custom_components.mitsubishi_owner_portal.MitsubishiOwnerPortalAccount.request", _request
+    ), patch(
+        "custom_components.mitsubishi_owner_portal.MitsubishiOwnerPortalAccount.async_login",
+        AsyncMock(return_value=True),
+    ):
+        gc.collect()
+        tracemalloc.start()
+        baseline = tracemalloc.get_traced_memory()[0]
+
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+        coordinators = [v["coordinator"] for v in hass.data[DOMAIN][entry.entry_id]["vhs"]]
+        assert len(coordinators) == VEHICLES
+        # Write the registries now rather than whenever their save delay runs out mid-measurement
+        hass.bus.async_fire(EVENT_HOMEASSISTANT_FINAL_WRITE)
+        await hass.async_block_till_done()
+
+        # Measure with full histories, so they are priced in and do not show up as growth
+        histories = hass.data[DOMAIN][entry.entry_id]["history"]
+        for coordinator in coordinators:
+            history = histories.get(coordinator.vin)
+            last = history.last_timestamp
+            for idx in range(1, DEFAULT_HISTORY_SIZE + 1):
+                history.append(last + idx / 1000, coordinator.data)
+            assert len(history) == DEFAULT_HISTORY_SIZE
+
+        retained = []
+        for cycle in range(1, CYCLES + 1):
+            for coordinator in coordinators:
+                await coordinator.async_refresh()
+            await hass.async_block_till_done()
+            gc.collect()
+            retained.append(tracemalloc.get_traced_memory()[0] - baseline)
+        own = sum(
+            stat.size
+            for stat in tracemalloc.take_snapshot()
+            .filter_traces([tracemalloc.Filter(True, f"*/custom_components/{DOMAIN}/*")])
+            .statistics("filename")
+        )
+        tracemalloc.stop()
+
+        per_vehicle = retained[-1] / VEHICLES
+        assert per_vehicle < BYTES_PER_VEHICLE, f"{per_vehicle:.0f} bytes per vehicle"
+        assert own / VEHICLES < OWN_BYTES_PER_VEHICLE, f"{own / VEHICLES:.0f} bytes per vehicle in the integration"
+        # The first cycles fill history and caches; compare cycles returning the same states
+        growth = (retained[-1] - retained[-3]) / VEHICLES
+        assert growth < GROWTH_PER_VEHICLE, f"Grew {growth:.0f} bytes per vehicle: {retained}"
+
+        # Accounts created by the options flow must not leave sessions behind
+        for _ in range(3):
+            result = await hass.config_entries.options.async_init(entry.entry_id)
+            result = await hass.config_entries.options.async_configure(
+                result["flow_id"], user_input={"password": "secret", "verify_ssl": True, "history_size": 10}
+            )
+            assert result["type"] == FlowResultType.CREATE_ENTRY
+        assert len(sessions) == 4
+        assert [session for session in sessions if not session.close.await_count] == sessions[:1]
+
+        await hass.config_entries.async_remove(entry.entry_id)
+    sessions[0].close.assert_awaited_once()
@@ -0,0 +1,40 @@
+"""Test the Mitsubishi Owner Portal odometer statistics import."""
+from __future__ import annotations
+
+import datetime
+
+from custom_components.mitsubishi_owner_portal.odometer import (
+    hourly_rows,
+    parse_odometer_samples,
+    statistic_id,
+)
+
+ODO = [
+    {"2024-01-01 10:15:00": "1000"},
+    {"2024-01-01 10:45:00": "1010"},
+    {"bad": "1"},
+    "junk",
+    {"2024-01-01 12:05:00": "1050"},
+    {"2024-01-01 09:00:00": "990"},
+]
+
+
+def test_parse_and_fold_into_hours() -> None:
+    """Test samples are sorted, filtered and folded into hourly rows."""
+    samples = parse_odometer_samples(ODO)
+    assert [value for _, value in samples] == [990, 1000, 1010, 1050]
+
+    rows = hourly_rows(samples)
+    assert [(row["start"].hour, row["state"]) for row in rows] == [(9, 990), (10, 1010), (12, 1050)]
+    assert rows[0]["start"].tzinfo is datetime.timezone.utc
+
+
+def test_parse_skips_already_imported() -> None:
+    """Test only samples newer than the last import are returned."""
+    after = datetime.datetime(2024, 1, 1, 10, tzinfo=datetime.timezone.utc).timestamp()
+    assert [value for _, value in parse_odometer_samples(ODO, after)] == [1000, 1010, 1050]
+
+
+def test_statistic_id() -> None:
+    """Test statistic ids are valid external ids."""
+    assert statistic_id("JA4J24A58NZ000000") == "mitsubishi_owner_portal:odometer_ja4j24a58nz000000"
@@ -0,0 +1,152 @@
+"""Robustness and throughput gate for the Mitsubishi Owner Portal vehiclestate parser."""
+from __future__ import annotations
+
+import copy
+import datetime
+import random
+import time
+from collections.abc import Iterator
+from typing import Any
+
+import pytest
+
+from custom_components.mitsubishi_owner_portal.parser import parse_timestamp, parse_vehicle_state, safe_number
+
+SEED = 20240101
+VARIANTS = 2000
+# Parses per second over all variants, far below what a slow CI runner manages
+MIN_PARSES_PER_SECOND = 5_000
+
+JUNK = (
+    None, "", "unknown", "x", "1.5", "-3", "NaN", "inf", "1e400", "½", "9" * 30, 0, -1, 2.5,
+    True, [], {}, [None], {"value": None}, "2024-13-45 99:99:99",
+)
+
+BASE: dict[str, Any] = {
+    "chargingControl": {
+        "hvBatteryLife": "80",
+        "hvChargingStatus": "charging",
+        "hvChargingMode": "normal",
+        "hvChargingPlugStatus": "plugged",
+        "hvChargingReady": "ready",
+        "hvTimeToFullCharge": "120",
+        "eventTimestamp": "1700000000000",
+        "cruisingRangeCombined": "500",
+        "cruisingRangeFirst": [{"range": "450"}, {"engineType": "4"}],
+        "cruisingRangeSecond": [{"range": "50"}, {"engineType": "5"}],
+    },
+    "extLocMap": {"lat": "35.1", "lon": "139.2", "ts": "1700000000"},
+    "odo": [{"2024-01-01 00:00:00": "12345"}],
+    "ignitionState": "OFF",
+    "ignitionStateTs": "1700000000000",
+    "theftAlarm": "OFF",
+    "theftAlarmType": "none",
+    "privacy": "OFF",
+    "temp": "20",
+    "accessible": "true",
+    "ods": "closed",
+    "diagnostic": "ok",
+}
+
+
+def _nested_layout(rng: random.Random, key: str) -> dict[str, Any]:
+    """Return a range in the ``cruisingRange`` layout."""
+    items: list[Any] = [{key: {"value": rng.choice(["0", "35", 12, "x", None])}}]
+    if rng.random() < 0.5:
+        items.insert(0, {"range": {"value": rng.choice(["7", None])}})
+    if rng.random() < 0.2:
+        items.append(rng.choice(JUNK))
+    return {"cruisingRange": rng.choice([items, rng.choice(JUNK)])}
+
+
+def _list_layout(rng: random.Random, engine: str) -> list[Any]:
+    """Return a range in the list-of-dicts layout, possibly for the wrong engine."""
+    items: list[Any] = [{"range": rng.choice(["46", "0", "5000", str(rng.randrange(900)), rng.choice(JUNK)])}]
+    if rng.random() < 0.7:
+        items.append({"engineType": rng.choice([engine, "4", "5", None])})
+    rng.shuffle(items)
+    return items
+
+
+def _variants(rng: random.Random, count: int) -> Iterator[dict[str, Any]]:
+    """Yield vehiclestate ``state`` payloads with other layouts, missing keys and junk values."""
+    yield copy.deepcopy(BASE)
+    for _ in range(count - 1):
+        state = copy.deepcopy(BASE)
+        charging = state["chargingControl"]
+        if rng.random() < 0.4:
+            charging["cruisingRangeFirst"] = _nested_layout(rng, "range_2")
+        elif rng.random() < 0.3:
+            charging["cruisingRangeFirst"] = _list_layout(rng, "4")
+        if rng.random() < 0.4:
+            charging["cruisingRangeSecond"] = _nested_layout(rng, "range_3")
+        elif rng.random() < 0.3:
+            charging["cruisingRangeSecond"] = _list_layout(rng, "5")
+        if rng.random() < 0.3:
+            charging.pop("cruisingRangeCombined")
+            charging["availRange"] = rng.choice([{"value": "12"}, "33", *JUNK])
+        for _ in range(rng.randrange(4)):
+            charging.pop(rng.choice(list(charging)), None)
+        for _ in range(rng.randrange(4)):
+            state.pop(rng.choice(list(state)), None)
+        # Junk anywhere, containers included
+        for _ in range(rng.randrange(4)):
+            target = rng.choice([state, charging])
+            target[rng.choice(list(target) or ["temp"])] = rng.choice(JUNK)
+        if rng.random() < 0.1:
+            state["odo"] = rng.choice([[], [{}], [{"bad": "1"}], [{1: "2"}], "x", [[1]]])
+        yield state
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [
+        ("1700000000000", datetime.datetime(2023, 11, 14, 22, 13, 20, tzinfo=datetime.timezone.utc)),
+        ("1700000000", datetime.datetime(2023, 11, 14, 22, 13, 20, tzinfo=datetime.timezone.utc)),
+        (1700000000, datetime.datetime(2023, 11, 14, 22, 13, 20, tzinfo=datetime.timezone.utc)),
+        ("9" * 30, None),
+        ("½", None),
+        ("x", None),
+        (None, None),
+    ],
+)
+def test_parse_timestamp(value: Any, expected: datetime.datetime | None) -> None:
+    """Test seconds and milliseconds are converted and malformed values ignored."""
+    assert parse_timestamp(value) == expected
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [("42", 42), ("1.5", 1.5), (7, 7.0), ("", None), ("unknown", None), ("x", None), ({}, None), (None, None)],
+)
+def test_safe_number(value: Any, expected: Any) -> None:
+    """Test numbers are converted and malformed values fall back to the default."""
+    assert safe_number(value) == expected
+
+
+def test_parse_range_layouts() -> None:
+    """Test both known layouts of the gasoline and electric range."""
+    state = copy.deepcopy(BASE)
+    assert parse_vehicle_state(state)["Cruising_Range_Electric"] == 50
+
+    state["chargingControl"]["cruisingRangeFirst"] = {"cruisingRange": [{"range_2": {"value": "430"}}]}
+    state["chargingControl"]["cruisingRangeSecond"] = {"cruisingRange": [{"range_3": {"value": "40"}}]}
+    data = parse_vehicle_state(state)
+    assert data["Cruising_Range_Gasoline"] == 430
+    assert data["Cruising_Range_Electric"] == 40
+
+
+def test_parse_generated_variants() -> None:
+    """Test the parser never raises on generated variants and stays fast."""
+    variants = list(_variants(random.Random(SEED), VARIANTS))
+
+    begin = time.perf_counter()
+    for state in variants:
+        try:
+            data = parse_vehicle_state(state)
+        except Exception as err:  # noqa: BLE001
+            pytest.fail(f"{err!r} parsing {state}")
+        assert isinstance(data, dict)
+    rate = VARIANTS / (time.perf_counter() - begin)
+
+    assert rate > MIN_PARSES_PER_SECOND, f"{rate:.0f} parses per second"
@@ -0,0 +1,150 @@
+"""Test the Mitsubishi Owner Portal entry reload."""
+from __future__ import annotations
+
+import datetime
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.core import HomeAssistant
+from homeassistant.data_entry_flow import FlowResultType
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import MockConfigEntry, async_fire_time_changed
+
+from custom_components.mitsubishi_owner_portal.const import DATA_RELOAD, DOMAIN, RELOAD_TIMEOUT
+
+VEHICLE = {"vin": "TEST123", "model": "Test Model", "modelDescription": "Test Vehicle"}
+
+
+@pytest.fixture
+def entry(hass: HomeAssistant) -> MockConfigEntry:
+    """Return a single-account entry added to hass."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={
+            "account": {"username": "test@example.com", "password": "secret", "uid": "uid", "token": "access"},
+            "vehicles": [VEHICLE],
+        },
+    )
+    entry.add_to_hass(hass)
+    return entry
+
+
+@pytest.fixture
+def portal():
+    """Patch the session and the portal calls of the integration."""
+    with patch(
+        "custom_components.mitsubishi_owner_portal.account.aiohttp_client.async_create_clientsession"
+    ) as create_session, patch(
+        "custom_components.mitsubishi_owner_portal.MitsubishiOwnerPortalAccount.async_get_vehicles",
+        AsyncMock(return_value=[VEHICLE]),
+    ) as get_vehicles, patch(
+        "custom_components.mitsubishi_owner_portal.VehiclesCoordinator.update_vehicle_detail",
+        AsyncMock(return_value={"Battery": 50}),
+    ) as fetch:
+        create_session.side_effect = lambda *args, **kwargs: MagicMock(close=AsyncMock())
+        yield create_session, get_vehicles, fetch
+
+
+async def test_reload_keeps_tokens_session_and_state(
+    hass: HomeAssistant, enable_custom_integrations, entry: MockConfigEntry, portal
+) -> None:
+    """Test a reload hands the live account and snapshots to the new instance."""
+    create_session, get_vehicles, fetch = portal
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    account = hass.data[DOMAIN][entry.entry_id]["account"]
+    http = account.http
+    assert fetch.await_count == 1
+
+    assert await hass.config_entries.async_reload(entry.entry_id)
+    await hass.async_block_till_done()
+
+    entry_data = hass.data[DOMAIN][entry.entry_id]
+    assert entry_data["account"] is account
+    assert account.http is http
+    http.close.assert_not_called()
+    assert fetch.await_count == 1
+    assert get_vehicles.await_count == 1
+    assert create_session.call_count == 1
+    assert entry_data["vhs"][0]["coordinator"].data["Battery"] == 50
+    assert not hass.data[DATA_RELOAD]
+
+    # Without a setup following the unload, the state is closed after a while
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    http.close.assert_not_called()
+    async_fire_time_changed(hass, dt_util.utcnow() + datetime.timedelta(seconds=RELOAD_TIMEOUT))
+    await hass.async_block_till_done()
+    http.close.assert_awaited_once()
+    assert not hass.data[DATA_RELOAD]
+
+
+async def test_failed_setup_closes_previous_state(
+    hass: HomeAssistant, enable_custom_integrations, entry: MockConfigEntry, portal
+) -> None:
+    """Test the state taken over from a reload is closed when the new setup fails."""
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    http = hass.data[DOMAIN][entry.entry_id]["account"].http
+
+    with patch(
+        "custom_components.mitsubishi_owner_portal.TripStore.async_load", AsyncMock(side_effect=OSError)
+    ):
+        assert not await hass.config_entries.async_reload(entry.entry_id)
+        await hass.async_block_till_done()
+
+    assert entry.state is ConfigEntryState.SETUP_ERROR
+    http.close.assert_awaited_once()
+    assert not hass.data[DATA_RELOAD]
+
+
+async def test_removal_closes_stashed_state(
+    hass: HomeAssistant, enable_custom_integrations, entry: MockConfigEntry, portal
+) -> None:
+    """Test removing an entry closes its sessions right away."""
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    http = hass.data[DOMAIN][entry.entry_id]["account"].http
+
+    await hass.config_entries.async_remove(entry.entry_id)
+    await hass.async_block_till_done()
+    http.close.assert_awaited_once()
+    assert not hass.data[DATA_RELOAD]
+
+
+async def test_reconfigure_hands_flow_account_to_reload(
+    hass: HomeAssistant, enable_custom_integrations, entry: MockConfigEntry, portal
+) -> None:
+    """Test the reload after a reconfigure takes over the flow's logged-in account."""
+    _, get_vehicles, fetch = portal
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    old_http = hass.data[DOMAIN][entry.entry_id]["account"].http
+
+    with patch(
+        "custom_components.mitsubishi_owner_portal.MitsubishiOwnerPortalAccount.async_login",
+        AsyncMock(return_value=True),
+    ) as login:
+        result = await hass.config_entries.flow.async_init(
+            DOMAIN, context={"source": "reconfigure", "entry_id": entry.entry_id}
+        )
+        result = await hass.config_entries.flow.async_configure(
+            result["flow_id"], {"username": "test@example.com", "password": "new", "verify_ssl": True}
+        )
+        await hass.async_block_till_done()
+
+    assert result["type"] == FlowResultType.ABORT
+    assert login.await_count == 1
+    account = hass.data[DOMAIN][entry.entry_id]["account"]
+    assert account.password == "new"
+    assert account.http is not old_http
+    old_http.close.assert_awaited_once()
+    account.http.close.assert_not_called()
+    assert not hass.data["mitsubishi_owner_portal_handoff"]
+    # Vehicles come from the flow and the state from the previous instance
+    assert get_vehicles.await_count == 2
+    assert fetch.await_count == 1
+    assert hass.data[DOMAIN][entry.entry_id]["vhs"][0]["coordinator"].data["Battery"] == 50
+
+    await hass.config_entries.async_remove(entry.entry_id)
+    account.http.close.assert_awaited_once()
@@ -0,0 +1,130 @@
+"""Test the Mitsubishi Owner Portal remote operation queue."""
+from __future__ import annotations
+
+import asyncio
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import async_capture_events
+
+from custom_components.mitsubishi_owner_portal.fleet import RequestMetrics
+from custom_components.mitsubishi_owner_portal.remote import (
+    EVENT_REMOTE_OPERATION,
+    RemoteOperationQueue,
+)
+
+
+@pytest.fixture(autouse=True)
+def no_delays():
+    """Do not wait between portal requests."""
+    with patch("custom_components.mitsubishi_owner_portal.remote.RETRY_DELAY", 0), patch(
+        "custom_components.mitsubishi_owner_portal.remote.FIRST_POLL_DELAY", 0
+    ):
+        yield
+
+
+def _coordinator(hass: HomeAssistant, vin: str, request: AsyncMock) -> MagicMock:
+    """Return a mocked coordinator whose account answers with ``request``."""
+    coordinator = MagicMock(vin=vin)
+    coordinator.hass = hass
+    coordinator.account.username = "test@example.com"
+    coordinator.account.metrics = RequestMetrics()
+    coordinator.account.request = request
+    coordinator.async_request_refresh = AsyncMock()
+    return coordinator
+
+
+def _portal(running: list[int], peak: list[int]) -> AsyncMock:
+    """Return a portal mock that starts operations and reports them successful."""
+
+    async def _request(api: str, pms: dict | None = None, method: str = "GET") -> dict:
+        if method == "POST":
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+            return {"eventId": f"event-{pms['vin']}", "status": "Started"}
+        await asyncio.sleep(0.01)
+        running[0] -= 1
+        return {"status": "Successful"}
+
+    return AsyncMock(side_effect=_request)
+
+
+async def test_submit_shares_jobs_and_fires_events(hass: HomeAssistant) -> None:
+    """Test identical submissions run once and the result goes out as an event."""
+    events = async_capture_events(hass, EVENT_REMOTE_OPERATION)
+    request = _portal([0], [0])
+    coordinator = _coordinator(hass, "VIN1", request)
+    queue = RemoteOperationQueue(hass, "entry")
+
+    results = await asyncio.gather(queue.async_submit(coordinator), queue.async_submit(coordinator))
+    await hass.async_block_till_done()
+
+    assert results == [True, True]
+    assert request.await_count == 2
+    assert len(events) == 1
+    assert events[0].data["vin"] == "VIN1"
+    assert events[0].data["event_id"] == "event-VIN1"
+    assert events[0].data["success"] is True
+    assert coordinator.account.metrics.totals["remote_coalesced"] == 1
+    await queue.async_shutdown()
+
+
+async def test_concurrency_is_capped(hass: HomeAssistant) -> None:
+    """Test a bulk wake-up runs a bounded number of operations at once."""
+    running, peak = [0], [0]
+    request = _portal(running, peak)
+    queue = RemoteOperationQueue(hass, "entry")
+
+    results = await asyncio.gather(*(
+        queue.async_submit(_coordinator(hass, f"VIN{idx}", request)) for idx in range(6)
+    ))
+
+    assert all(results)
+    assert peak[0] == 2
+    await queue.async_shutdown()
+
+
+async def test_jobs_resume_after_restart(hass: HomeAssistant, hass_storage: dict) -> None:
+    """Test a job with an event id is polled after a restart instead of started again."""
+    hass_storage["mitsubishi_owner_portal.remote.entry"] = {
+        "version": 1,
+        "key": "mitsubishi_owner_portal.remote.entry",
+        "data": {"jobs": [
+            {"vin": "VIN1", "operation": "vehicleStatus", "event_id": "42", "created": time.time()},
+            {"vin": "GONE", "operation": "vehicleStatus", "event_id": "43", "created": time.time()},
+        ]},
+    }
+    request = AsyncMock(return_value={"status": "Successful"})
+    coordinator = _coordinator(hass, "VIN1", request)
+    queue = RemoteOperationQueue(hass, "entry")
+    await queue.async_load()
+
+    queue.async_resume({"VIN1": coordinator})
+    await hass.async_block_till_done()
+
+    request.assert_awaited_once_with("avi/v1/remoteOperation/vehicles/VIN1/events/42")
+    coordinator.async_request_refresh.assert_awaited_once()
+    await queue.async_shutdown()
+    assert hass_storage["mitsubishi_owner_portal.remote.entry"]["data"] == {"jobs": []}
+
+
+async def test_shutdown_keeps_pending_jobs(hass: HomeAssistant, hass_storage: dict) -> None:
+    """Test unloading during polling saves the job with its event id."""
+
+    async def _request(api: str, pms: dict | None = None, method: str = "GET") -> dict:
+        if method == "POST":
+            return {"eventId": "42", "status": "Started"}
+        await asyncio.Event().wait()
+
+    queue = RemoteOperationQueue(hass, "entry")
+    submitted = asyncio.ensure_future(queue.async_submit(_coordinator(hass, "VIN1", AsyncMock(side_effect=_request))))
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+    await queue.async_shutdown()
+    submitted.cancel()
+
+    jobs = hass_storage["mitsubishi_owner_portal.remote.entry"]["data"]["jobs"]
+    assert [(job["vin"], job["event_id"]) for job in jobs] == [("VIN1", "42")]
@@ -0,0 +1,88 @@
+"""Test the Mitsubishi Owner Portal token cache shared across accounts."""
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Any
+from unittest.mock import MagicMock, patch
+
+import pytest
+from homeassistant.core import HomeAssistant
+
+from custom_components.mitsubishi_owner_portal import MitsubishiOwnerPortalAccount
+
+USER = {"username": "test@example.com", "password": "secret"}
+
+
+@pytest.fixture
+def auth_calls() -> list[dict[str, Any]]:
+    """Answer token requests with fresh tokens and record them."""
+    calls: list[dict[str, Any]] = []
+
+    async def _request(self, api: str, pms=None, method: str = "GET") -> dict[str, Any]:
+        calls.append(pms)
+        await asyncio.sleep(0.01)
+        if pms.get("password", USER["password"]) != USER["password"]:
+            return {"error": "invalid_grant"}
+        return {"access_token": f"access{len(calls)}", "refresh_token": f"refresh{len(calls)}", "accountDN": "uid"}
+
+    with patch(
+        "custom_components.mitsubishi_owner_portal.account.aiohttp_client.async_create_clientsession",
+        return_value=MagicMock(),
+    ), patch("custom_components.mitsubishi_owner_portal.MitsubishiOwnerPortalAccount.request", _request):
+        yield calls
+
+
+async def test_concurrent_logins_share_one_call(hass: HomeAssistant, auth_calls: list) -> None:
+    """Test accounts of one user logging in together make a single auth call."""
+    entry_account = MitsubishiOwnerPortalAccount(hass, dict(USER))
+    flow_account = MitsubishiOwnerPortalAccount(hass, dict(USER))
+
+    assert all(await asyncio.gather(entry_account.async_login(), flow_account.async_login()))
+    assert len(auth_calls) == 1
+    assert entry_account.token == flow_account.token == "access1"
+    assert flow_account.metrics.totals["tokens_adopted"] == 1
+
+    # A later flow with the same password validates against the shared tokens
+    options_account = MitsubishiOwnerPortalAccount(hass, dict(USER))
+    assert await options_account.async_login()
+    assert len(auth_calls) == 1
+
+
+async def test_refresh_is_adopted_by_other_accounts(hass: HomeAssistant, auth_calls: list) -> None:
+    """Test a token refreshed by one account is taken over by the others."""
+    first = MitsubishiOwnerPortalAccount(hass, dict(USER))
+    second = MitsubishiOwnerPortalAccount(hass, dict(USER))
+    await first.async_login()
+    await second.async_check_token()
+    assert len(auth_calls) == 1
+
+    stale = time.time() - 3600
+    for account in (first, second):
+        account._config["token_time"] = stale
+    first.shared_tokens.tokens["token_time"] = stale
+    await asyncio.gather(first.async_check_token(), second.async_check_token())
+
+    assert [call["grant_type"] for call in auth_calls] == ["password", "refresh_token"]
+    assert first.refresh_token == second.refresh_token == "refresh2"
+
+    # A token rejected by the portal is replaced by a real login
+    await second.async_login()
+    assert len(auth_calls) == 3
+    assert first.token != second.token
+    await first.async_check_token()
+    assert first.token == second.token
+
+
+async def test_tokens_keyed_by_user_api_base_and_password(hass: HomeAssistant, auth_calls: list) -> None:
+    """Test tokens are not shared across API bases or with a different password."""
+    await MitsubishiOwnerPortalAccount(hass, dict(USER)).async_login()
+
+    other_base = MitsubishiOwnerPortalAccount(hass, {**USER, "api_base": "https://example.com/"})
+    assert await other_base.async_login()
+    assert len(auth_calls) == 2
+
+    wrong_password = MitsubishiOwnerPortalAccount(hass, {**USER, "password": "wrong"})
+    assert not await wrong_password.async_login()
+    assert len(auth_calls) == 3
+    assert not wrong_password.token
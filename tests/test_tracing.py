@@ -0,0 +1,88 @@
+"""Test the Mitsubishi Owner Portal tracing helpers."""
+from __future__ import annotations
+
+import logging
+from unittest.mock import MagicMock
+
+import pytest
+
+from custom_components.mitsubishi_owner_portal.tracing import REDACTED, Tracer, WarningLimiter
+
+ENDPOINT = "avi/v1/vehicles/*/vehiclestate"
+
+
+@pytest.fixture
+def logger() -> logging.Logger:
+    """Return a logger with debug output enabled."""
+    logger = logging.getLogger("test_tracing")
+    logger.setLevel(logging.DEBUG)
+    return logger
+
+
+def test_tracer_off_without_debug_logging() -> None:
+    """Test nothing is sampled while debug logging is disabled."""
+    logger = logging.getLogger("test_tracing_off")
+    logger.setLevel(logging.INFO)
+    tracer = Tracer(logger, {"capture": 5})
+    assert not any(tracer.sampled(ENDPOINT, "VIN1") for _ in range(10))
+
+
+def test_tracer_samples_per_vin_and_endpoint(logger: logging.Logger) -> None:
+    """Test every n-th response per VIN and endpoint is traced, within the filters."""
+    tracer = Tracer(logger, {"sample": 3, "vins": ["VIN1", "VIN2"], "endpoints": ["avi/"]})
+    assert [tracer.sampled(ENDPOINT, "VIN1") for _ in range(6)] == [True, False, False, True, False, False]
+    assert tracer.sampled(ENDPOINT, "VIN2")
+    assert not tracer.sampled(ENDPOINT, "VIN3")
+    assert not tracer.sampled("auth/v1/token", "VIN1")
+
+
+def test_tracer_captures_redacted_payloads(logger: logging.Logger) -> None:
+    """Test captured payloads are redacted and bounded."""
+    tracer = Tracer(logger, {"capture": 2})
+    for idx in range(3):
+        payload = {"state": {"extLocMap": {"lat": 35.6, "lon": 139.7}}, "n": idx}
+        tracer.trace("GET", ENDPOINT, "VIN0000001234", 200, payload)
+
+    assert [item["payload"]["n"] for item in tracer.payloads] == [1, 2]
+    assert tracer.payloads[0]["vin"] == "...1234"
+    assert tracer.payloads[0]["payload"]["state"]["extLocMap"] == {"lat": REDACTED, "lon": REDACTED}
+
+    tracer.configure({"capture": 0})
+    tracer.trace("GET", ENDPOINT, "VIN0000001234", 200, {})
+    assert not tracer.payloads
+
+
+def test_warning_limiter() -> None:
+    """Test a repeated warning is logged once per interval with the suppressed count."""
+    logger = MagicMock()
+    limiter = WarningLimiter(logger, interval=3600)
+    assert limiter.warning("no_range", "Electric range of %s is None", "VIN1")
+    assert not limiter.warning("no_range", "Electric range of %s is None", "VIN1")
+    assert limiter.warning("other", "Something else")
+    assert logger.warning.call_count == 2
+
+    limiter.interval = 0
+    assert limiter.warning("no_range", "Electric range of %s is None", "VIN1")
+    assert logger.warning.call_args.args == (
+        "Electric range of %s is None (%s similar warnings suppressed)", "VIN1", 1
+    )
+
+
+def test_tracer_redacts_token_response(logger: logging.Logger) -> None:
+    """Test a captured auth response keeps no tokens or user identifiers."""
+    tracer = Tracer(logger, {"capture": 1})
+    response = {
+        "access_token": "access",
+        "refresh_token": "refresh",
+        "id_token": "id",
+        "accountDN": "portal-user-id",
+        "token_type": "Bearer",
+        "expires_in": 3600,
+    }
+    tracer.trace("POST", "auth/v1/token", None, 200, response)
+
+    payload = tracer.payloads[0]["payload"]
+    for key in ("access_token", "refresh_token", "id_token", "accountDN"):
+        assert payload[key] == REDACTED
+    assert payload["token_type"] == "Bearer"
+    assert "portal-user-id" not in repr(tracer.payloads)
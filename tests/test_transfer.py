@@ -0,0 +1,43 @@
+"""Test the Mitsubishi Owner Portal monthly transfer accounting."""
+from __future__ import annotations
+
+import datetime
+from unittest.mock import MagicMock, patch
+
+from custom_components.mitsubishi_owner_portal.transfer import MonthlyTransfer
+
+
+def test_transfer_counts_and_notifies() -> None:
+    """Test responses are added up and listeners called."""
+    transfer = MonthlyTransfer()
+    listener = MagicMock()
+    unsub = transfer.async_add_listener(listener)
+
+    transfer.async_add(100, 400)
+    transfer.async_add(50, 200)
+    assert (transfer.transferred, transfer.received, transfer.requests) == (150, 600, 2)
+    assert listener.call_count == 2
+
+    unsub()
+    transfer.async_add(1, 1)
+    assert listener.call_count == 2
+
+
+def test_transfer_restarts_each_month() -> None:
+    """Test counters restart in a new month and stale totals are not restored."""
+    transfer = MonthlyTransfer()
+    transfer.async_add(100, 400)
+    saved = transfer.as_dict()
+
+    next_month = transfer.month_start + datetime.timedelta(days=40)
+    with patch("custom_components.mitsubishi_owner_portal.transfer.dt_util.now", return_value=next_month):
+        transfer.async_add(10, 20)
+        assert (transfer.transferred, transfer.requests) == (10, 1)
+
+        restored = MonthlyTransfer()
+        restored.restore(saved)
+        assert restored.transferred == 0
+
+    restored = MonthlyTransfer()
+    restored.restore(saved)
+    assert (restored.transferred, restored.received, restored.requests) == (100, 400, 1)
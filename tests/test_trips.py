@@ -0,0 +1,72 @@
+"""Test the Mitsubishi Owner Portal trip detection."""
+from __future__ import annotations
+
+import datetime
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.mitsubishi_owner_portal.trips import Trip, TripDetector, TripStore
+
+START = datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc)
+
+
+def _snapshot(minutes: int, ignition: str, odometer: float | None, lat: float, lon: float) -> dict:
+    """Build a coordinator snapshot."""
+    return {
+        "Ignition_State": ignition,
+        "Ignition_State_Timestamp": START + datetime.timedelta(minutes=minutes),
+        "Odometer": odometer,
+        "Location_Latitude": lat,
+        "Location_Longitude": lon,
+    }
+
+
+def test_trip_emitted_when_ignition_turns_off() -> None:
+    """Test a trip is produced on the on-to-off transition."""
+    detector = TripDetector()
+    assert detector.update(_snapshot(0, "off", 1000, 35.0, 139.0)) is None
+    assert detector.update(_snapshot(5, "on", 1000, 35.0, 139.0)) is None
+    assert detector.update(_snapshot(20, "on", 1008, 35.05, 139.02)) is None
+    assert detector.update(_snapshot(30, "unknown", None, 0, 0)) is None
+
+    trip = detector.update(_snapshot(35, "OFF", 1012.4, 35.1, 139.05))
+    assert trip == Trip(
+        (START + datetime.timedelta(minutes=5)).timestamp(),
+        (START + datetime.timedelta(minutes=35)).timestamp(),
+        12.4,
+        35.0,
+        139.0,
+        35.1,
+        139.05,
+    )
+    assert trip.duration == 1800
+    assert trip.as_event("VIN1")["distance"] == 12.4
+    assert detector.active is None
+    assert detector.update(_snapshot(40, "off", 1012.4, 35.1, 139.05)) is None
+
+
+def test_trips_are_bounded_and_restored() -> None:
+    """Test only the last trips are kept and survive a round trip."""
+    detector = TripDetector(max_trips=2)
+    for idx in range(3):
+        detector.update(_snapshot(idx * 10, "on", idx * 10, 35.0, 139.0))
+        detector.update(_snapshot(idx * 10 + 5, "off", idx * 10 + 4, 35.0, 139.0))
+    detector.update(_snapshot(40, "on", 40, 35.0, 139.0))
+
+    restored = TripDetector(max_trips=2)
+    restored.restore(detector.as_dict())
+    assert list(restored.trips) == list(detector.trips)
+    assert [trip.distance for trip in restored.trips] == [4, 4]
+    assert restored.active == detector.active
+
+
+async def test_store_capacity_follows_options(hass: HomeAssistant) -> None:
+    """Test changing the trip history resizes every detector, keeping the newest trips."""
+    store = TripStore(hass, "entry", max_trips=3)
+    for idx in range(3):
+        store.async_record("VIN1", _snapshot(idx * 10, "on", idx * 10, 35.0, 139.0))
+        store.async_record("VIN1", _snapshot(idx * 10 + 5, "off", idx * 10 + idx, 35.0, 139.0))
+
+    store.async_set_capacity(2)
+    assert [trip.distance for trip in store.get("VIN1").trips] == [1, 2]
+    assert store.get("VIN2").trips.maxlen == 2